@@ -1,17 +1,114 @@
-from flask import Flask, render_template, request, redirect, session, url_for, jsonify
-from queries import get_player_win_rates, get_player_win_rates_filtered, get_commander_stats, get_commander_stats_filtered, get_player_detail_stats, get_player_commanders, get_player_color_stats, get_overall_color_stats, get_longest_win_streak, get_top_win_rate, get_recent_commanders, to_kebab_case, get_group_by_passkey, insert_game_with_group, insert_player_with_game, update_game_winner, get_commander_suggestions
+from flask import Flask, render_template, request, redirect, session, url_for, jsonify, g, Response, make_response, before_render_template, template_rendered, stream_with_context
+from flask.cli import AppGroup
+from queries import DB_PATH, GAMES_PAGE_DEFAULT_LIMIT, ShardedDatabase, db, get_player_win_rates_filtered, get_commander_stats_filtered, get_player_profile, get_player_opponents, get_head_to_head_matrix, get_overall_color_stats, get_color_identity_breakdown, get_dashboard_data, get_group_by_passkey, get_group_data_version, get_games_page, record_game, record_games, get_commander_suggestions, explain_query_plans, find_full_scans, hot_queries, query_cache, rebuild_summary_tables, rebuild_streak_runs, rebuild_ratings, get_player_ratings, get_player_rating_history, get_win_rate_over_time, rename_player, merge_players, player_key, normalize_date, date_range, TIME_BUCKETS, iter_game_export
 from functools import wraps
 import sqlite3
 import os
+import atexit
+import hashlib
 import html
 import re
 import csv
 import io
+import json
 from werkzeug.utils import secure_filename
+import click
+import schema
+import shards
+from catalog import CATALOG_PATH, ingest_bulk_json
+from metrics import registry as metrics, DEFAULT_SLOW_QUERY_MS
+from write_queue import WriteQueue
+from images import IMMUTABLE_MAX_AGE, WEBP_QUALITY, build_image_variants, commander_image, image_manifest_version, is_hashed_asset
+import time
 
 app = Flask(__name__)
 app.secret_key = os.environ.get('SECRET_KEY', 'your-secret-key') # This signs the sessions but really doesn't matter atm
 
+# Pooled SQLite connections live for the life of the worker process
+atexit.register(db.close)
+
+# Request/SQL timings for /metrics: MTG_METRICS=1 turns collection on, and
+# statements slower than MTG_SLOW_QUERY_MS are logged to mtg.slow_query
+metrics.configure(
+    os.environ.get('MTG_METRICS', '').lower() in ('1', 'true', 'yes'),
+    float(os.environ.get('MTG_SLOW_QUERY_MS', DEFAULT_SLOW_QUERY_MS))
+)
+
+def write_queued_games(group_id, games):
+    """Writer used by the write-behind queue: one transaction in the group's database"""
+    with db.routed(group_id):
+        return record_games(games, group_id)
+
+# Write-behind submissions: with MTG_WRITE_QUEUE=1, /add-game and /upload-csv
+# validate in the request and hand the games to a single writer thread, which
+# commits whatever has queued up in one transaction per group
+write_queue = None
+if os.environ.get('MTG_WRITE_QUEUE', '').lower() in ('1', 'true', 'yes'):
+    write_queue = WriteQueue(write_queued_games)
+    atexit.register(write_queue.close)
+
+@app.before_request
+def route_to_group():
+    """Send this request's queries to the logged-in group's shard (no-op unsharded)"""
+    db.route(session.get('group_id'))
+
+@app.before_request
+def start_request_metrics():
+    if metrics.enabled:
+        metrics.start_request()
+
+@app.after_request
+def finish_request_metrics(response):
+    if metrics.enabled:
+        route = request.url_rule.rule if request.url_rule else '<unmatched>'
+        timings = metrics.finish_request(route, request.method, response.status_code)
+        if timings:
+            # Visible in the browser's network panel next to each request
+            response.headers['Server-Timing'] = (
+                f'sql;desc="{timings["queries"]} queries";dur={timings["sql_seconds"] * 1000:.1f}, '
+                f'tpl;dur={timings["template_seconds"] * 1000:.1f}, '
+                f'total;dur={timings["seconds"] * 1000:.1f}'
+            )
+    return response
+
+def _template_started(sender, template, context, **extra):
+    if metrics.enabled:
+        g.template_started = time.perf_counter()
+
+def _template_finished(sender, template, context, **extra):
+    started = g.pop('template_started', None)
+    if started is not None:
+        metrics.record_template(template.name or '<string>', time.perf_counter() - started)
+
+before_render_template.connect(_template_started, app)
+template_rendered.connect(_template_finished, app)
+
+# Templates build commander image tags (srcset, modal URL) from the variant manifest
+app.jinja_env.globals['commander_image'] = commander_image
+
+@app.after_request
+def cache_hashed_assets(response):
+    """Content-hashed image variants never change, so browsers may keep them for good"""
+    if request.endpoint == 'static' and response.status_code == 200 and is_hashed_asset(request.path):
+        response.cache_control.public = True
+        response.cache_control.max_age = IMMUTABLE_MAX_AGE
+        response.cache_control.immutable = True
+        response.cache_control.no_cache = None
+    return response
+
+@app.route('/metrics')
+def metrics_endpoint():
+    """Prometheus scrape endpoint: route, template and SQL timings plus query cache counters"""
+    cache_lines = []
+    for key, value in query_cache.stats().items():
+        cache_lines.append(f"# TYPE mtg_query_cache_{key} gauge")
+        cache_lines.append(f"mtg_query_cache_{key} {value}")
+    if write_queue:
+        for key, value in write_queue.stats().items():
+            cache_lines.append(f"# TYPE mtg_write_queue_{key} gauge")
+            cache_lines.append(f"mtg_write_queue_{key} {value}")
+    return Response(metrics.render(cache_lines), mimetype='text/plain; version=0.0.4')
+
 def sanitize_input(text):
     """Sanitize user input by removing HTML tags and trimming whitespace"""
     if not text:
@@ -34,6 +131,52 @@ def get_current_group_id():
     """Helper function to get the current user's group ID from session"""
     return session.get('group_id')
 
+def _render_token():
+    """Fingerprint of the code and templates pages are rendered from, so a deploy changes every ETag"""
+    digest = hashlib.sha1()
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    paths = [os.path.join(base_dir, name) for name in ('app.py', 'queries.py', 'images.py')]
+    template_dir = os.path.join(base_dir, 'templates')
+    paths += sorted(os.path.join(template_dir, name) for name in os.listdir(template_dir))
+    for path in paths:
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:12]
+
+RENDER_TOKEN = _render_token()
+
+def conditional_on_data_version(f):
+    """
+    Answer If-None-Match for a group page from the group's data version alone.
+
+    The ETag covers the page, the group, its data version (bumped by every
+    write), the route arguments (player name), the query string (date range),
+    the render token and the image manifest version (pages link the variant
+    files a build or prune writes), so a matching request gets a 304 after
+    one primary-key lookup and the page's queries never run.
+    Apply below login_required.
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        group_id = get_current_group_id()
+        parts = [RENDER_TOKEN, image_manifest_version(), request.endpoint, str(group_id), str(get_group_data_version(group_id))]
+        parts += [f"{key}={value}" for key, value in sorted(kwargs.items())]
+        parts += [f"?{key}={value}" for key, value in sorted(request.args.items(multi=True))]
+        etag = hashlib.sha1("\0".join(parts).encode('utf-8')).hexdigest()[:20]
+
+        if request.if_none_match.contains_weak(etag):
+            response = Response(status=304)
+        else:
+            response = make_response(f(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+        response.set_etag(etag, weak=True)
+        # Group data: browsers may keep it but must revalidate, shared caches must not
+        response.cache_control.private = True
+        response.cache_control.no_cache = True
+        return response
+    return decorated_function
+
 # Login routes
 @app.route('/login', methods=['GET', 'POST'])
 def login():
@@ -60,37 +203,17 @@ def logout():
 # Home page
 @app.route("/")
 @login_required
+@conditional_on_data_version
 def index():
     group_id = get_current_group_id()
-    king = get_top_win_rate(group_id=group_id)
-    king_imgs = get_recent_commanders(king["player_name"], group_id=group_id) if king else []
-    villains_raw = get_longest_win_streak(group_id=group_id)
-    villains = []
-    for v in villains_raw:
-        commanders = []
-        for c in v["commanders"][:3]:  # limit to 3
-            if c:  # skip empty
-                commanders.append({
-                    "name": c["name"],  # Extract the name from the commander object
-                    "img": f"/static/assets/commanders/{to_kebab_case(c['name'])}.jpg"
-                })
-        villains.append({
-            "player_name": v["player_name"],
-            "streak_count": v["streak_count"],
-            "commanders": commanders
-        })
-    return render_template(
-        "index.html.j2",
-        king=king,
-        king_imgs=king_imgs,
-        villains=villains
-    )
+    dashboard = get_dashboard_data(group_id=group_id)
+    return render_template("index.html.j2", **dashboard)
 
 # Add Game Form
 @app.route("/add-game-form")
 @login_required
 def add_game_form():
-    return render_template("/add_game.html.j2")
+    return render_template("/add_game.html.j2", queued_ticket=request.args.get('queued'))
 
 # Add Game to SQL DB, form submit
 @app.route("/add-game", methods=["POST"])
@@ -112,21 +235,33 @@ def add_game():
     # Validate required fields
     if not date or not player_names or len(player_names) != num_players:
         return redirect("/add-game-form?error=invalid_data")
+    try:
+        date = normalize_date(date)
+    except ValueError:
+        return redirect("/add-game-form?error=invalid_date")
 
-    # Insert Game with group association
-    game_id = insert_game_with_group(date, num_players, turns, win_con, group_id)
-
-    winner_id = None
+    players = []
     for i, name in enumerate(player_names):
-        commander_name = commander_names[i] if i < len(commander_names) else ""
-        turn_order = turn_orders[i] if i < len(turn_orders) and turn_orders[i] else None
-        
-        pid = insert_player_with_game(game_id, name, commander_name, group_id, turn_order)
-        if name == winner_name:
-            winner_id = pid
+        players.append({
+            "player_name": name,
+            "commander_name": commander_names[i] if i < len(commander_names) else "",
+            "turn_order": turn_orders[i] if i < len(turn_orders) and turn_orders[i] else None
+        })
+
+    try:
+        validate_game(players, turns or None)
+    except ValueError:
+        return redirect("/add-game-form?error=invalid_data")
 
-    if winner_id:
-        update_game_winner(game_id, winner_id)
+    # Game, players and winner are written in one transaction
+    game = {"date": date, "num_players": num_players, "turns": turns, "win_con": win_con}
+    if write_queue:
+        try:
+            ticket = write_queue.submit(group_id, [(game, players, winner_name)])
+        except RuntimeError:
+            return redirect("/add-game-form?error=queue_full")
+        return redirect(url_for('add_game_form', queued=ticket))
+    record_game(game, players, winner_name, group_id)
 
     return redirect("/add-game-form")
 
@@ -143,107 +278,197 @@ def commander_suggestions():
     suggestions = get_commander_suggestions(query, group_id, limit=8)
     return jsonify(suggestions)
 
-def process_csv_games(csv_content, group_id):
-    """Process CSV content and insert games into database"""
-    games_processed = 0
-    errors = []
-    
+CSV_REQUIRED_COLUMNS = ['Date', 'NumPlayers', 'WinnerName', 'PlayerName']
+CSV_OPTIONAL_COLUMNS = ['Turns', 'WinCon', 'CommanderName', 'TurnOrder', 'ColorIdentity']
+VALID_WIN_CONS = ['Combat', 'Combo', 'Commander Damage', 'Ping/Burn', 'Scoops']
+# Older spellings still stored in some groups, by case-folded spelling
+LEGACY_WIN_CONS = {'burn': 'Ping/Burn', 'scoop': 'Scoops'}
+
+def canonical_win_con(win_con):
+    """
+    Map a win condition to its VALID_WIN_CONS spelling.
+
+    Case is ignored and legacy spellings keep their meaning; anything else,
+    or no win condition, counts as Combat.
+    """
+    key = ' '.join((win_con or '').split()).casefold()
+    for valid in VALID_WIN_CONS:
+        if key == valid.casefold():
+            return valid
+    return LEGACY_WIN_CONS.get(key, 'Combat')
+
+# Bulk import tuning: games committed per transaction, how many partially
+# read games may be held at once, and how many row errors are kept verbatim
+IMPORT_BATCH_SIZE = 500
+IMPORT_MAX_OPEN_GAMES = 1000
+IMPORT_MAX_ERRORS = 100
+
+def validate_game(players, turns=None):
+    """
+    Check what the database would only reject at write time, so a queued
+    submission fails in the request rather than later in the writer.
+
+    Raises:
+        ValueError: If a player has no name, a player is seated twice or
+                    turns is not a whole number
+    """
+    seen = set()
+    for player in players:
+        if not player['player_name']:
+            raise ValueError("Player name is required")
+        key = player_key(player['player_name'])
+        if key in seen:
+            raise ValueError(f"Player '{player['player_name']}' is listed twice")
+        seen.add(key)
+    if turns is not None and not str(turns).isdigit():
+        raise ValueError(f"Invalid Turns '{turns}', expected a whole number")
+
+def parse_csv_row(row):
+    """Sanitize one CSV row into its game key and player entry"""
+    date = normalize_date(sanitize_input(row['Date'].strip()))
+    num_players = int(row['NumPlayers'].strip())
+    winner_name = sanitize_input(row['WinnerName'].strip())
+    player_name = sanitize_input(row['PlayerName'].strip())
+
+    # Optional fields
+    turns = sanitize_input((row.get('Turns') or '').strip()) or None
+    win_con = canonical_win_con(sanitize_input((row.get('WinCon') or '').strip()))
+    commander_name = sanitize_input((row.get('CommanderName') or '').strip())
+    turn_order = (row.get('TurnOrder') or '').strip()
+    turn_order = int(turn_order) if turn_order else None
+    color_identity = (row.get('ColorIdentity') or '').strip().upper()
+
+    if color_identity.strip('WUBRGC'):
+        raise ValueError(f"Invalid ColorIdentity '{color_identity}', expected WUBRG letters or C")
+
+    game_key = (date, num_players, winner_name, turns, win_con)
+    player = {
+        'player_name': player_name,
+        'commander_name': commander_name,
+        'turn_order': turn_order,
+        'color_identity': color_identity or None
+    }
+    return game_key, player
+
+def import_csv_stream(lines, group_id, batch_size=IMPORT_BATCH_SIZE, progress=None, write=None):
+    """
+    Stream CSV rows into the database, committing complete games in batches.
+
+    Rows are grouped into games as they are read and a game is queued as soon
+    as it has NumPlayers rows, so memory holds at most one batch plus the games
+    still being assembled, regardless of file size.
+
+    Args:
+        lines: Iterable of CSV text lines (file object, stream wrapper, list)
+        group_id: ID of the group the games belong to
+        batch_size: Number of games written per transaction
+        progress: Optional callable invoked with the result dict after each commit
+        write: Optional callable taking a batch of (game, players, winner_name)
+               tuples; defaults to record_games in the group
+
+    Returns:
+        Dict[str, Any]: rows_read, games_imported, batches_committed, errors
+                        (list of {"row", "message"}) and errors_truncated
+    """
+    result = {
+        "rows_read": 0,
+        "games_imported": 0,
+        "batches_committed": 0,
+        "errors": [],
+        "errors_truncated": 0
+    }
+
+    def add_error(row_num, message):
+        if len(result["errors"]) < IMPORT_MAX_ERRORS:
+            result["errors"].append({"row": row_num, "message": message})
+        else:
+            result["errors_truncated"] += 1
+
+    def close_game(game_key, entry):
+        date, num_players, winner_name, turns, win_con = game_key
+        players = entry["players"]
+        if len(players) != num_players:
+            add_error(entry["row"], f"Game on {date}: Expected {num_players} players, found {len(players)}")
+            return
+        try:
+            validate_game(players, turns)
+        except ValueError as e:
+            add_error(entry["row"], f"Game on {date}: {e}")
+            return
+        if not any(player_key(p['player_name']) == player_key(winner_name) for p in players):
+            add_error(entry["row"], f"Game on {date}: Winner '{winner_name}' not found in player list")
+        game = {'date': date, 'num_players': num_players, 'turns': turns, 'win_con': win_con}
+        batch.append((entry["row"], (game, players, winner_name)))
+        if len(batch) >= batch_size:
+            flush()
+
+    def flush():
+        if not batch:
+            return
+        try:
+            if write:
+                write([item for _, item in batch])
+            else:
+                record_games([item for _, item in batch], group_id)
+            result["games_imported"] += len(batch)
+            result["batches_committed"] += 1
+        except (sqlite3.Error, RuntimeError) as e:
+            for row_num, (game, _, _) in batch:
+                add_error(row_num, f"Game on {game['date']}: {e}")
+        batch.clear()
+        if progress:
+            progress(result)
+
+    batch = []
+    open_games = {}
     try:
-        # Parse CSV content
-        csv_reader = csv.DictReader(io.StringIO(csv_content))
-        
-        required_columns = ['Date', 'NumPlayers', 'WinnerName', 'PlayerName']
-        optional_columns = ['Turns', 'WinCon', 'CommanderName', 'TurnOrder']
-        
-        # Validate headers
-        if not all(col in csv_reader.fieldnames for col in required_columns):
-            missing = [col for col in required_columns if col not in csv_reader.fieldnames]
-            return 0, [f"Missing required columns: {', '.join(missing)}"]
-        
-        # Group rows by game (same date, num_players, winner)
-        games = {}
+        csv_reader = csv.DictReader(lines)
+        fieldnames = csv_reader.fieldnames or []
+        missing = [col for col in CSV_REQUIRED_COLUMNS if col not in fieldnames]
+        if missing:
+            add_error(1, f"Missing required columns: {', '.join(missing)}")
+            return result
+
         for row_num, row in enumerate(csv_reader, start=2):  # Start at 2 for header
+            result["rows_read"] += 1
             try:
-                # Sanitize input
-                date = sanitize_input(row['Date'].strip())
-                num_players = int(row['NumPlayers'].strip())
-                winner_name = sanitize_input(row['WinnerName'].strip())
-                player_name = sanitize_input(row['PlayerName'].strip())
-                
-                # Optional fields
-                turns = sanitize_input(row.get('Turns', '').strip()) or None
-                win_con = sanitize_input(row.get('WinCon', '').strip()) or 'Combat'
-                commander_name = sanitize_input(row.get('CommanderName', '').strip())
-                turn_order = row.get('TurnOrder', '').strip()
-                turn_order = int(turn_order) if turn_order else None
-                
-                # Validate win condition
-                valid_win_cons = ['Combat', 'Combo', 'Commander Damage', 'Ping/Burn', 'Scoops']
-                if win_con not in valid_win_cons:
-                    win_con = 'Combat'
-                
-                # Create game key
-                game_key = (date, num_players, winner_name, turns, win_con)
-                
-                if game_key not in games:
-                    games[game_key] = []
-                
-                games[game_key].append({
-                    'player_name': player_name,
-                    'commander_name': commander_name,
-                    'turn_order': turn_order
-                })
-                
-            except (ValueError, KeyError) as e:
-                errors.append(f"Row {row_num}: {str(e)}")
+                game_key, player = parse_csv_row(row)
+            except (ValueError, KeyError, AttributeError) as e:
+                add_error(row_num, str(e))
                 continue
-        
-        # Insert games into database
-        for (date, num_players, winner_name, turns, win_con), players in games.items():
-            try:
-                # Validate number of players matches actual players
-                if len(players) != num_players:
-                    errors.append(f"Game on {date}: Expected {num_players} players, found {len(players)}")
-                    continue
-                
-                # Insert game
-                game_id = insert_game_with_group(date, num_players, turns, win_con, group_id)
-                
-                # Insert players
-                winner_id = None
-                for player in players:
-                    pid = insert_player_with_game(
-                        game_id, 
-                        player['player_name'], 
-                        player['commander_name'], 
-                        group_id,
-                        player['turn_order']
-                    )
-                    
-                    if player['player_name'] == winner_name:
-                        winner_id = pid
-                
-                # Update winner
-                if winner_id:
-                    update_game_winner(game_id, winner_id)
-                else:
-                    errors.append(f"Game on {date}: Winner '{winner_name}' not found in player list")
-                
-                games_processed += 1
-                
-            except Exception as e:
-                errors.append(f"Game on {date}: {str(e)}")
-                continue
-        
-        return games_processed, errors
-        
-    except Exception as e:
-        return 0, [f"CSV parsing error: {str(e)}"]
+
+            entry = open_games.get(game_key)
+            if entry is None:
+                if len(open_games) >= IMPORT_MAX_OPEN_GAMES:
+                    # Oldest unfinished game is reported rather than held forever
+                    oldest_key = next(iter(open_games))
+                    close_game(oldest_key, open_games.pop(oldest_key))
+                entry = open_games[game_key] = {"row": row_num, "players": []}
+            entry["players"].append(player)
+
+            if len(entry["players"]) == game_key[1]:
+                close_game(game_key, open_games.pop(game_key))
+
+        # Anything still open never reached its NumPlayers rows
+        for game_key, entry in open_games.items():
+            close_game(game_key, entry)
+        flush()
+    except (csv.Error, UnicodeDecodeError) as e:
+        flush()
+        add_error(result["rows_read"] + 1, f"CSV parsing error: {e}")
+
+    return result
+
+def process_csv_games(csv_content, group_id):
+    """Process CSV content and insert games into database"""
+    result = import_csv_stream(io.StringIO(csv_content), group_id)
+    errors = [f"Row {e['row']}: {e['message']}" for e in result["errors"]]
+    return result["games_imported"], errors
 
 @app.route("/upload-csv", methods=["POST"])
 @login_required
 def upload_csv():
-    """Handle CSV file upload and processing"""
+    """Handle CSV file upload and stream it into the database"""
     group_id = get_current_group_id()
     
     if 'csvFile' not in request.files:
@@ -256,61 +481,417 @@ def upload_csv():
     if not file.filename.lower().endswith('.csv'):
         return redirect("/add-game-form?error=invalid_file_type")
     
-    try:
-        # Read and decode file content
-        csv_content = file.read().decode('utf-8')
-        
-        # Process CSV
-        games_processed, errors = process_csv_games(csv_content, group_id)
-        
-        # Prepare result message
-        if games_processed > 0:
-            success_msg = f"Successfully processed {games_processed} games"
-            if errors:
-                error_msg = " with some errors: " + "; ".join(errors[:5])  # Limit error display
-                return redirect(f"/add-game-form?success={success_msg}&warnings={error_msg}")
-            else:
-                return redirect(f"/add-game-form?success={success_msg}")
-        else:
-            error_msg = "No games were processed. Errors: " + "; ".join(errors[:5])
-            return redirect(f"/add-game-form?error={error_msg}")
-            
-    except Exception as e:
-        return redirect(f"/add-game-form?error=Upload failed: {str(e)}")
+    # Decode the upload incrementally instead of reading it into memory
+    lines = io.TextIOWrapper(file.stream, encoding='utf-8-sig', newline='')
+    if write_queue:
+        # Batches are queued as they are parsed; nothing is committed yet, so
+        # the counts are reported as queued and each ticket reports its commit
+        tickets = []
+        result = import_csv_stream(lines, group_id, write=lambda games: tickets.append(write_queue.submit(group_id, games)))
+        result["games_queued"] = result.pop("games_imported")
+        result["batches_queued"] = result.pop("batches_committed")
+        result["tickets"] = tickets
+        status = 202 if result["games_queued"] > 0 else 400
+    else:
+        result = import_csv_stream(lines, group_id)
+        status = 200 if result["games_imported"] > 0 else 400
+
+    if request.accept_mimetypes.best == 'application/json':
+        return jsonify(result), status
+    return render_template("add_game.html.j2", import_result=result), status
+
+@app.cli.command("import-csv")
+@click.argument("csv_path", type=click.Path(exists=True, dir_okay=False))
+@click.option("--group-id", type=int, required=True, help="Group the games belong to")
+@click.option("--batch-size", type=int, default=IMPORT_BATCH_SIZE, show_default=True, help="Games per transaction")
+def import_csv_command(csv_path, group_id, batch_size):
+    """Bulk import a CSV game history file into a group."""
+    def report(result):
+        click.echo(f"{result['rows_read']} rows read, {result['games_imported']} games imported")
+
+    with open(csv_path, encoding='utf-8-sig', newline='') as f, db.routed(group_id):
+        result = import_csv_stream(f, group_id, batch_size=batch_size, progress=report)
+
+    for error in result["errors"]:
+        click.echo(f"Row {error['row']}: {error['message']}", err=True)
+    if result["errors_truncated"]:
+        click.echo(f"...and {result['errors_truncated']} more errors", err=True)
+    click.echo(f"Done: {result['games_imported']} games in {result['batches_committed']} batches")
+
+# Export: the import's columns in order, so an export re-imports as is
+CSV_EXPORT_COLUMNS = CSV_REQUIRED_COLUMNS + CSV_OPTIONAL_COLUMNS
+# Characters of CSV buffered before a chunk is sent
+EXPORT_CHUNK_SIZE = 64 * 1024
+
+def export_rows(group_id):
+    """
+    Yield a group's history as one dict per seat keyed by CSV_EXPORT_COLUMNS.
+
+    Text is stored HTML-escaped by sanitize_input, so it is unescaped here;
+    importing the export escapes it back to the same stored value. WinCon is
+    written as the canonical value the import would store for it.
+    """
+    for row in iter_game_export(group_id):
+        row = {
+            column: html.unescape(value) if isinstance(value, str) else value
+            for column, value in zip(CSV_EXPORT_COLUMNS, row)
+        }
+        row['WinCon'] = canonical_win_con(row['WinCon'])
+        yield row
+
+def export_csv_chunks(rows):
+    """Render export rows as CSV text in chunks of about EXPORT_CHUNK_SIZE characters"""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=CSV_EXPORT_COLUMNS, lineterminator="\n")
+    writer.writeheader()
+    for row in rows:
+        writer.writerow(row)
+        if buffer.tell() >= EXPORT_CHUNK_SIZE:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+def export_jsonl_lines(rows):
+    """Render export rows as JSON Lines, one object per seat"""
+    for row in rows:
+        yield json.dumps(row, ensure_ascii=False) + "\n"
+
+def _export_response(chunks, mimetype, extension):
+    """Stream an export of the current group as a file download"""
+    filename = f"mtg-journal-group-{get_current_group_id()}.{extension}"
+    return Response(
+        stream_with_context(chunks),
+        mimetype=mimetype,
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
+
+@app.route("/export.csv")
+@login_required
+def export_csv():
+    """Download the group's whole history as CSV, in the layout the CSV upload accepts"""
+    return _export_response(export_csv_chunks(export_rows(get_current_group_id())), "text/csv", "csv")
+
+@app.route("/export.jsonl")
+@login_required
+def export_jsonl():
+    """Download the group's whole history as JSON Lines, one object per seat"""
+    return _export_response(export_jsonl_lines(export_rows(get_current_group_id())), "application/x-ndjson", "jsonl")
+
+@app.cli.command("export")
+@click.argument("output", type=click.File("w", encoding="utf-8"), default="-")
+@click.option("--group-id", type=int, required=True, help="Group to export")
+@click.option("--format", "export_format", type=click.Choice(["csv", "jsonl"]), default="csv", show_default=True)
+def export_command(output, group_id, export_format):
+    """Export a group's game history (to stdout, or OUTPUT) in the import-csv layout."""
+    render = export_csv_chunks if export_format == "csv" else export_jsonl_lines
+    with db.routed(group_id):
+        for chunk in render(export_rows(group_id)):
+            output.write(chunk)
 
 @app.route("/stats")
 @login_required
+@conditional_on_data_version
 def stats():
     group_id = get_current_group_id()
+    # Optional inclusive date range, e.g. ?from=2024-01-01&to=2024-03-31
+    filters = {key: request.args.get(key, '').strip() for key in ('from', 'to')}
+    filters = {key: value for key, value in filters.items() if value}
+    try:
+        date_from, date_to = date_range(filters.get('from'), filters.get('to'))
+    except ValueError:
+        return redirect(url_for('stats'))
+
     # PLAYER WIN RATE FILTER TOGGLE:
     # - Use get_player_win_rates_filtered() to show only players with wins > 0 (less clutter)
     # - Use get_player_win_rates() to show all players including those with 0 wins (complete data)
     # Change the function call below to toggle between filtered/unfiltered results
-    player_stats = get_player_win_rates_filtered(group_id=group_id)  # FILTERED: Only players with wins
-    # player_stats = get_player_win_rates(group_id=group_id)         # UNFILTERED: All players
+    player_stats = get_player_win_rates_filtered(group_id=group_id, date_from=date_from, date_to=date_to)  # FILTERED: Only players with wins
+    # player_stats = get_player_win_rates(group_id=group_id, date_from=date_from, date_to=date_to)         # UNFILTERED: All players
     
-    #commander_stats = get_commander_stats(group_id=group_id)
-    commander_stats = get_commander_stats_filtered(group_id=group_id)
-    color_stats = get_overall_color_stats(group_id=group_id)
+    #commander_stats = get_commander_stats(group_id=group_id, date_from=date_from, date_to=date_to)
+    commander_stats = get_commander_stats_filtered(group_id=group_id, date_from=date_from, date_to=date_to)
+    color_stats = get_overall_color_stats(group_id=group_id, date_from=date_from, date_to=date_to)
+    color_identities = get_color_identity_breakdown(group_id, date_from=date_from, date_to=date_to)
     return render_template("stats.html.j2",
+                           filters=filters,
+                           player_ratings=get_player_ratings(group_id),
                            player_stats=player_stats,
                            commander_stats=commander_stats,
-                           color_stats=color_stats)
+                           color_stats=color_stats,
+                           color_identities=color_identities)
 
 @app.route('/player/<player_name>')
 @login_required
+@conditional_on_data_version
 def player_detail(player_name):
     group_id = get_current_group_id()
-    stats = get_player_detail_stats(player_name, group_id=group_id)
-    commanders = get_player_commanders(player_name, group_id=group_id)
-    color_stats = get_player_color_stats(player_name, group_id=group_id)
-    if stats is None:
+    profile = get_player_profile(player_name, group_id=group_id)
+    if profile is None:
         # handle case where player not found
         return f"No stats found for {player_name}", 404
     return render_template(
         'player_detail.html.j2',
         player_name=player_name,
-        stats=stats,
-        commanders=commanders,
-        color_stats=color_stats
+        stats=profile["stats"],
+        commanders=profile["commanders"],
+        color_stats=profile["color_stats"],
+        seats=profile["seats"],
+        win_cons=profile["win_cons"],
+        opponents=get_player_opponents(player_name, group_id),
+        rating_history=get_player_rating_history(player_name, group_id),
+        win_rate_by_month=get_win_rate_over_time(player_name, group_id, "month")
+    )
+
+def _game_log_filters():
+    """
+    Game log filters from the query string; blank fields are dropped and dates normalized.
+
+    Raises:
+        ValueError: If from or to is not a recognizable date
+    """
+    filters = {key: request.args.get(key, '').strip() for key in ('player', 'commander', 'win_con', 'from', 'to')}
+    filters = {key: value for key, value in filters.items() if value}
+    date_from, date_to = date_range(filters.get('from'), filters.get('to'))
+    filters.update({key: value for key, value in (('from', date_from), ('to', date_to)) if value})
+    return filters
+
+def _game_log_page(filters):
+    """Fetch the game log page named by the request's cursor and limit"""
+    return get_games_page(
+        get_current_group_id(),
+        cursor=request.args.get('cursor') or None,
+        limit=request.args.get('limit', GAMES_PAGE_DEFAULT_LIMIT, type=int),
+        player_name=filters.get('player'),
+        commander_name=filters.get('commander'),
+        win_con=filters.get('win_con'),
+        date_from=filters.get('from'),
+        date_to=filters.get('to')
     )
+
+@app.route('/games')
+@login_required
+def games():
+    try:
+        filters = _game_log_filters()
+    except ValueError:
+        return redirect(url_for('games'))
+    try:
+        page = _game_log_page(filters)
+    except ValueError:
+        return redirect(url_for('games', **filters))
+    return render_template('games.html.j2', page=page, filters=filters, cursor=request.args.get('cursor'))
+
+@app.route('/api/games')
+@login_required
+def api_games():
+    """
+    API endpoint for the game log, newest first.
+
+    Query parameters: player, commander, win_con, from, to (inclusive dates),
+    limit (default 25, max 100) and cursor (next_cursor of the previous page).
+    """
+    try:
+        page = _game_log_page(_game_log_filters())
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify(page)
+
+@app.route('/api/submissions/<ticket>')
+@login_required
+def submission_status(ticket):
+    """
+    API endpoint to poll a queued submission: status is queued, committed
+    (with game_ids) or failed (with error).
+    """
+    status = write_queue.status(ticket) if write_queue else None
+    if status is None or status["group_id"] != get_current_group_id():
+        return jsonify({"error": "Unknown submission"}), 404
+    return jsonify(status)
+
+@app.route('/api/head-to-head')
+@login_required
+def head_to_head():
+    """API endpoint for the group's player x player head-to-head matrix"""
+    return jsonify(get_head_to_head_matrix(get_current_group_id()))
+
+@app.route('/api/win-rate-over-time')
+@login_required
+def win_rate_over_time():
+    """
+    API endpoint for one player's win rate per period, oldest first.
+
+    Query parameters: player (required), bucket (day, week, month or year;
+    default month), from and to (inclusive dates).
+    """
+    player_name = request.args.get('player', '').strip()
+    bucket = request.args.get('bucket', 'month')
+    if not player_name or bucket not in TIME_BUCKETS:
+        return jsonify({"error": "player and a bucket of day, week, month or year are required"}), 400
+    try:
+        date_from, date_to = date_range(request.args.get('from'), request.args.get('to'))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify(get_win_rate_over_time(player_name, get_current_group_id(), bucket, date_from, date_to))
+
+# Database schema management: flask db upgrade / status / check-plans
+db_cli = AppGroup('db', help='Manage the database schema.')
+
+@db_cli.command('upgrade')
+def db_upgrade():
+    """Apply pending schema migrations (to every shard when sharded)."""
+    for path in db.database_paths():
+        applied = schema.upgrade(path)
+        for migration in applied:
+            click.echo(f"{path}: applied {migration['version']:04d}_{migration['name']}")
+        click.echo(f"{path}: schema at version {schema.get_current_version(path)}")
+
+@db_cli.command('status')
+def db_status():
+    """Show the applied schema version and pending migrations."""
+    for path in db.database_paths():
+        click.echo(f"{path}: schema at version {schema.get_current_version(path)}")
+        for migration in schema.get_pending_migrations(path):
+            click.echo(f"{path}: pending {migration['version']:04d}_{migration['name']}")
+
+@db_cli.command('check-plans')
+@click.option('--group-id', type=int, required=True, help='Group to run the hot queries against')
+@click.option('--player', 'player_name', required=True, help='Player used by per-player queries')
+def db_check_plans(group_id, player_name):
+    """Fail if any hot query in queries.py falls back to a full table scan."""
+    failures = 0
+    with db.routed(group_id):
+        plans_by_query = explain_query_plans(group_id, player_name)
+    for name, plans in plans_by_query.items():
+        scans = [line for plan in plans for line in find_full_scans(plan)]
+        if scans:
+            failures += 1
+            click.echo(f"FAIL {name}: {'; '.join(scans)}")
+        else:
+            click.echo(f"ok   {name}")
+    if failures:
+        raise SystemExit(1)
+
+@db_cli.command('statement-stats')
+@click.option('--group-id', type=int, required=True, help='Group to run the hot queries against')
+@click.option('--player', 'player_name', required=True, help='Player used by per-player queries')
+@click.option('--rounds', type=int, default=3, show_default=True, help='Times to run every hot query')
+def db_statement_stats(group_id, player_name, rounds):
+    """Run the hot queries uncached and report statement cache hit rates."""
+    with db.routed(group_id):
+        db.statement_stats(reset=True)
+        for _ in range(rounds):
+            for call in hot_queries(group_id, player_name).values():
+                query_cache.clear()
+                call()
+        stats = db.statement_stats()
+    click.echo(f"{stats['executions']} executions, {stats['hits']} hits, {stats['misses']} misses "
+               f"({stats['hit_rate']}% hit rate, cache size {stats['cache_size']}, "
+               f"{stats['registered']} registered statements)")
+    for name, count in stats['statements'].items():
+        click.echo(f"{count:6d}  {name}")
+
+@db_cli.command('rebuild')
+@click.option('--group-id', type=int, default=None, help='Only rebuild this group')
+def db_rebuild(group_id):
+    """Recompute the derived summary tables from Games and Players."""
+    if isinstance(db, ShardedDatabase):
+        group_ids = [group_id] if group_id is not None else db.shard_group_ids()
+    else:
+        group_ids = [group_id]
+    for gid in group_ids:
+        with db.routed(gid):
+            rebuild_summary_tables(gid)
+            rebuild_streak_runs(gid)
+            rebuild_ratings(gid)
+    click.echo("Summary tables, win streaks and ratings rebuilt")
+
+app.cli.add_command(db_cli)
+
+# Player identities: flask players rename / merge
+players_cli = AppGroup('players', help='Rename and merge players.')
+
+@players_cli.command('rename')
+@click.option('--group-id', type=int, required=True, help='Group the player belongs to')
+@click.argument('old_name')
+@click.argument('new_name')
+def players_rename(group_id, old_name, new_name):
+    """Show a player under a new name; their history is kept."""
+    try:
+        with db.routed(group_id):
+            rename_player(group_id, old_name, new_name)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    click.echo(f"Renamed {old_name} to {new_name}")
+
+@players_cli.command('merge')
+@click.option('--group-id', type=int, required=True, help='Group both players belong to')
+@click.argument('source_name')
+@click.argument('target_name')
+def players_merge(group_id, source_name, target_name):
+    """Move every game of SOURCE_NAME to TARGET_NAME and remove SOURCE_NAME."""
+    try:
+        with db.routed(group_id):
+            moved = merge_players(group_id, source_name, target_name)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    click.echo(f"Moved {moved} seats from {source_name} to {target_name}")
+
+app.cli.add_command(players_cli)
+
+# Per-group shards: flask shards split / merge
+shards_cli = AppGroup('shards', help='Split the database into per-group shards and back.')
+
+@shards_cli.command('split')
+@click.argument('shard_dir', type=click.Path(file_okay=False))
+@click.option('--source', default=DB_PATH, show_default=True, type=click.Path(exists=True, dir_okay=False), help='Database to split')
+def shards_split(shard_dir, source):
+    """Copy every group of the database into its own file under SHARD_DIR."""
+    try:
+        group_ids = shards.split_database(source, shard_dir)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    click.echo(f"Wrote {len(group_ids)} group shards and the directory to {shard_dir}")
+    click.echo(f"Set MTG_SHARD_DIR={shard_dir} to serve from them")
+
+@shards_cli.command('merge')
+@click.argument('shard_dir', type=click.Path(exists=True, file_okay=False))
+@click.argument('output', type=click.Path(dir_okay=False))
+def shards_merge(shard_dir, output):
+    """Combine the shards under SHARD_DIR into one database at OUTPUT."""
+    try:
+        games = shards.merge_shards(shard_dir, output)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    click.echo(f"Merged {games} games into {output}")
+
+app.cli.add_command(shards_cli)
+
+# Card catalog: flask catalog ingest
+catalog_cli = AppGroup('catalog', help='Manage the offline commander catalog.')
+
+@catalog_cli.command('ingest')
+@click.argument('json_path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--output', default=CATALOG_PATH, show_default=True, help='Catalog file to write')
+def catalog_ingest(json_path, output):
+    """Build the commander catalog from a Scryfall bulk data JSON file."""
+    count = ingest_bulk_json(json_path, output)
+    click.echo(f"Wrote {count} commanders to {output}")
+
+app.cli.add_command(catalog_cli)
+
+# Commander images: flask images build
+images_cli = AppGroup('images', help='Manage commander images.')
+
+@images_cli.command('build')
+@click.option('--quality', type=click.IntRange(0, 100), default=WEBP_QUALITY, show_default=True, help='WebP quality')
+@click.option('--prune', is_flag=True, help='Delete variants the new manifest no longer uses')
+def images_build(quality, prune):
+    """Write resized, content-hashed WebP variants of every commander image."""
+    try:
+        manifest = build_image_variants(quality=quality, prune=prune)
+    except RuntimeError as e:
+        raise click.ClickException(str(e))
+    click.echo(f"Built variants for {len(manifest)} commander images")
+
+app.cli.add_command(images_cli)
@@ -0,0 +1,179 @@
+import re
+import threading
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# Names are split into words on anything that isn't a letter or digit, so
+# "Atraxa, Praetors' Voice" can be found from "praet" as well as "atr"
+WORD_START_RE = re.compile(r"(?:^|[^0-9a-z])([0-9a-z])")
+
+# Gram size of the substring index; two-letter queries use a bigram index
+NGRAM_SIZE = 3
+MIN_QUERY_LENGTH = 2
+
+# Typo tolerance: queries this long also match word prefixes within one edit,
+# and longer ones within two (a swap of adjacent letters counts as one edit).
+# The first letter has to be right.
+FUZZY_MIN_LENGTH = 4
+FUZZY_TWO_EDITS_LENGTH = 7
+
+# Match tiers, best first: whole-name prefix, word prefix, substring, typo
+TIER_PREFIX = 0
+TIER_WORD = 1
+TIER_SUBSTRING = 2
+TIER_FUZZY = 3
+
+def normalize(name: str) -> str:
+    """Case-fold and collapse whitespace so lookups ignore case and spacing"""
+    return " ".join(name.casefold().split())
+
+def _ngrams(text: str, size: int = NGRAM_SIZE) -> Set[str]:
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+class _TrieNode:
+    __slots__ = ("children", "names")
+
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        # Every name with a word starting with this node's prefix
+        self.names: Set[str] = set()
+
+class CommanderIndex:
+    """
+    In-memory commander name index for one group, ranked by usage count.
+
+    A trie over every word start answers prefix and word-start queries in
+    O(len(query)), and a trigram index answers substring queries by
+    intersecting the posting sets of the query's grams (two-letter queries
+    read a bigram index directly). When neither finds
+    enough names, word prefixes within a small edit distance of the query
+    are added so a typo still produces suggestions.
+    """
+
+    def __init__(self, usage: Optional[Iterable[Tuple[str, int]]] = None):
+        self._root = _TrieNode()
+        self._grams: Dict[str, Set[str]] = {}
+        self._bigrams: Dict[str, Set[str]] = {}
+        # normalized name -> display name, usage count
+        self._names: Dict[str, str] = {}
+        self._counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        for name, count in usage or ():
+            self.add(name, count)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def add(self, name: str, count: int = 1):
+        """
+        Record count more uses of a commander, indexing it on first sight.
+
+        Args:
+            name: Commander name as entered
+            count: Number of seats to add to its usage count
+        """
+        key = normalize(name or "")
+        if not key:
+            return
+        with self._lock:
+            if key not in self._names:
+                self._names[key] = name.strip()
+                self._counts[key] = 0
+                self._index(key)
+            self._counts[key] += count
+
+    def _index(self, key: str):
+        for match in WORD_START_RE.finditer(key):
+            node = self._root
+            for char in key[match.start(1):]:
+                node = node.children.setdefault(char, _TrieNode())
+                node.names.add(key)
+        for gram in _ngrams(key):
+            self._grams.setdefault(gram, set()).add(key)
+        for gram in _ngrams(key, MIN_QUERY_LENGTH):
+            self._bigrams.setdefault(gram, set()).add(key)
+
+    def _word_matches(self, query: str) -> Set[str]:
+        node = self._root
+        for char in query:
+            node = node.children.get(char)
+            if node is None:
+                return set()
+        return node.names
+
+    def _substring_matches(self, query: str) -> Set[str]:
+        if len(query) < NGRAM_SIZE:
+            return self._bigrams.get(query, set())
+        grams = sorted(_ngrams(query), key=lambda g: len(self._grams.get(g, ())))
+        if not grams:
+            return set()
+        candidates = self._grams.get(grams[0], set())
+        for gram in grams[1:]:
+            candidates = candidates & self._grams.get(gram, set())
+            if not candidates:
+                break
+        return {key for key in candidates if query in key}
+
+    def _fuzzy_matches(self, query: str) -> Set[str]:
+        # Walk the word-start trie carrying one edit-distance row per node and
+        # prune every branch whose row is already over the limit, so only the
+        # prefixes near the query are visited. The first letter is taken as
+        # typed, which keeps the walk to one subtree of the root.
+        limit = 2 if len(query) >= FUZZY_TWO_EDITS_LENGTH else 1
+        matches: Set[str] = set()
+        start = self._root.children.get(query[0])
+        if start is None:
+            return matches
+        root_row = list(range(len(query) + 1))
+        start_row = [1] + [j - 1 for j in range(1, len(query) + 1)]
+        stack = [(child, char, query[0], start_row, root_row) for char, child in start.children.items()]
+        while stack:
+            node, char, prev_char, prev_row, prev_prev_row = stack.pop()
+            row = [prev_row[0] + 1]
+            for j in range(1, len(query) + 1):
+                cost = min(row[j - 1] + 1, prev_row[j] + 1, prev_row[j - 1] + (query[j - 1] != char))
+                if (prev_prev_row is not None and j > 1
+                        and query[j - 1] == prev_char and query[j - 2] == char):
+                    cost = min(cost, prev_prev_row[j - 2] + 1)
+                row.append(cost)
+            if row[-1] <= limit:
+                # Every name below this node starts a word with this prefix
+                matches |= node.names
+            elif min(row) <= limit:
+                stack.extend(
+                    (child, child_char, char, row, prev_row)
+                    for child_char, child in node.children.items()
+                )
+        return matches
+
+    def suggest(self, query: str, limit: int = 10) -> List[str]:
+        """
+        Get commander names matching a partial query, best matches first.
+
+        Names starting with the query rank first, then names with a word
+        starting with it, then names containing it, then near misses; within
+        each tier the most played commanders come first.
+
+        Args:
+            query: Partial commander name
+            limit: Maximum number of suggestions
+
+        Returns:
+            List[str]: Commander names as first entered
+        """
+        query = normalize(query or "")
+        if not query or limit <= 0:
+            return []
+
+        with self._lock:
+            tiers: Dict[str, int] = {}
+            for key in self._word_matches(query):
+                tiers[key] = TIER_PREFIX if key.startswith(query) else TIER_WORD
+            if len(tiers) < limit and len(query) >= MIN_QUERY_LENGTH:
+                for key in self._substring_matches(query):
+                    tiers.setdefault(key, TIER_SUBSTRING)
+            if len(tiers) < limit and len(query) >= FUZZY_MIN_LENGTH:
+                for key in self._fuzzy_matches(query):
+                    tiers.setdefault(key, TIER_FUZZY)
+
+            ranked = sorted(tiers, key=lambda key: (tiers[key], -self._counts[key], key))
+            return [self._names[key] for key in ranked[:limit]]
@@ -0,0 +1 @@
+"""Synthetic datasets and timing harness for the query layer"""
@@ -0,0 +1,215 @@
+"""
+Build synthetic MTG-Journal databases for benchmarking.
+
+    python -m benchmarks.generate bench.db --games 100000 --groups 4
+
+Games are bulk inserted and the derived tables (summaries, win streaks) are
+rebuilt afterwards, so 10^6 games take minutes rather than hours.
+"""
+import argparse
+import bisect
+import itertools
+import os
+import random
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional
+
+import schema
+import queries
+
+DEFAULT_WIN_CONS = {"Combat": 45, "Combo": 20, "Commander Damage": 15, "Ping/Burn": 10, "Scoops": 10}
+DEFAULT_SEATS = {3: 20, 4: 65, 5: 15}
+
+# Rows per executemany call while bulk loading
+INSERT_CHUNK = 20000
+
+SYLLABLES = ["ka", "zu", "mor", "eth", "va", "ri", "thal", "gor", "syl", "ne", "dra", "quo", "lin", "bar", "os", "tia"]
+
+def _name(rng: random.Random, words: int) -> str:
+    return " ".join(
+        "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3))).capitalize()
+        for _ in range(words)
+    )
+
+def _cumulative(weights: List[float]) -> List[float]:
+    return list(itertools.accumulate(weights))
+
+def _pick(rng: random.Random, items: List[Any], cumulative: List[float]) -> Any:
+    return items[bisect.bisect(cumulative, rng.random() * cumulative[-1])]
+
+def parse_weights(text: str, cast=str) -> Dict[Any, float]:
+    """Parse 'a=1,b=2' into {a: 1.0, b: 2.0}"""
+    weights = {}
+    for part in text.split(","):
+        key, _, weight = part.partition("=")
+        weights[cast(key.strip())] = float(weight or 1)
+    return weights
+
+def generate_database(
+    path: str,
+    games: int,
+    groups: int = 1,
+    players: int = 12,
+    commanders: int = 500,
+    zipf_s: float = 1.1,
+    seats: Optional[Dict[int, float]] = None,
+    win_cons: Optional[Dict[str, float]] = None,
+    start_date: date = date(2022, 1, 1),
+    days: int = 1095,
+    backdated: float = 0.02,
+    seed: int = 1
+) -> Dict[str, Any]:
+    """
+    Create a database at path filled with synthetic games.
+
+    Games are spread evenly over the groups. Each group has its own player
+    pool with a skill weight per player (so win rates differ); commanders are
+    drawn from one shared pool with Zipf(s) popularity, and each commander has
+    a fixed color identity. Games are logged in date order except for a
+    backdated fraction, like a real journal.
+
+    Args:
+        path: Database file to create; must not exist
+        games: Total number of games
+        groups: Number of groups
+        players: Players per group
+        commanders: Size of the commander pool
+        zipf_s: Zipf exponent of commander popularity
+        seats: Seat count -> weight
+        win_cons: Win condition -> weight
+        start_date: Date of the first game
+        days: Number of days games are spread over
+        backdated: Fraction of games logged with an earlier date than the previous one
+        seed: Random seed; the same arguments always build the same database
+
+    Returns:
+        Dict[str, Any]: group_ids, players (name lists per group) and commanders
+    """
+    if os.path.exists(path):
+        raise FileExistsError(path)
+    rng = random.Random(seed)
+    seats = seats or DEFAULT_SEATS
+    win_cons = win_cons or DEFAULT_WIN_CONS
+
+    schema.upgrade(path)
+    database = queries.MTGDatabase(path)
+    previous_db, queries.db = queries.db, database
+    try:
+        commander_pool = sorted({_name(rng, rng.randint(1, 3)) for _ in range(commanders * 2)})[:commanders]
+        rng.shuffle(commander_pool)
+        commander_masks = {name: rng.randint(0, 31) for name in commander_pool}
+        commander_weights = _cumulative([1 / rank ** zipf_s for rank in range(1, len(commander_pool) + 1)])
+        seat_counts, seat_weights = list(seats), _cumulative(list(seats.values()))
+        win_con_names, win_con_weights = list(win_cons), _cumulative(list(win_cons.values()))
+
+        group_ids, rosters = [], {}
+        with database.transaction() as cur:
+            for index in range(groups):
+                cur.execute(
+                    "INSERT INTO Groups (group_name, passkey) VALUES (?, ?)",
+                    (f"Bench Group {index + 1}", f"bench-{index + 1}")
+                )
+                group_ids.append(cur.lastrowid)
+                rosters[cur.lastrowid] = [f"{_name(rng, 1)} {index + 1}-{n}" for n in range(players)]
+
+            profile_ids = {}
+            for group_id, roster in rosters.items():
+                for name in roster:
+                    cur.execute(
+                        "INSERT INTO PlayerProfiles (group_id, Name, NameKey) VALUES (?, ?, ?)",
+                        (group_id, name, queries.player_key(name))
+                    )
+                    profile_ids[group_id, name] = cur.lastrowid
+            commander_ids = {}
+            for name in commander_pool:
+                cur.execute("INSERT INTO Commanders (Name, NameKey) VALUES (?, ?)", (name, queries.player_key(name)))
+                commander_ids[name] = cur.lastrowid
+
+        skill = {gid: [rng.uniform(0.5, 2.0) for _ in roster] for gid, roster in rosters.items()}
+        day_step = days / max(games, 1)
+        game_rows, player_rows, winners = [], [], []
+        player_id = 0
+
+        def flush():
+            with database.transaction() as cur:
+                cur.executemany(
+                    "INSERT INTO Games (GameID, Date, NumPlayers, Turns, WinCon, group_id) VALUES (?, ?, ?, ?, ?, ?)",
+                    game_rows
+                )
+                cur.executemany(
+                    """
+                    INSERT INTO Players (PlayerID, GameID, PlayerProfileID, CommanderID, TurnOrder, ColorIdentity, ColorMask, group_id)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    player_rows
+                )
+                cur.executemany("UPDATE Games SET WinnerPlayerID = ? WHERE GameID = ?", winners)
+            game_rows.clear()
+            player_rows.clear()
+            winners.clear()
+
+        for game_id in range(1, games + 1):
+            group_id = group_ids[game_id % len(group_ids)]
+            roster = rosters[group_id]
+            day = int(game_id * day_step)
+            if rng.random() < backdated:
+                day = max(0, day - rng.randint(1, 60))
+            game_date = (start_date + timedelta(days=day)).isoformat()
+
+            seat_count = min(_pick(rng, seat_counts, seat_weights), len(roster))
+            seated = rng.sample(range(len(roster)), seat_count)
+            game_rows.append((
+                game_id, game_date, seat_count, rng.randint(5, 14),
+                _pick(rng, win_con_names, win_con_weights), group_id
+            ))
+
+            winner_seat = _pick(rng, seated, _cumulative([skill[group_id][i] for i in seated]))
+            for turn_order, roster_index in enumerate(seated, 1):
+                player_id += 1
+                commander = _pick(rng, commander_pool, commander_weights)
+                mask = commander_masks[commander]
+                player_rows.append((
+                    player_id, game_id, profile_ids[group_id, roster[roster_index]], commander_ids[commander], turn_order,
+                    queries.mask_to_color_identity(mask), mask, group_id
+                ))
+                if roster_index == winner_seat:
+                    winners.append((player_id, game_id))
+
+            if len(player_rows) >= INSERT_CHUNK:
+                flush()
+        flush()
+
+        queries.rebuild_summary_tables()
+        queries.rebuild_streak_runs()
+        queries.rebuild_ratings()
+        return {"group_ids": group_ids, "players": rosters, "commanders": commander_pool}
+    finally:
+        queries.db = previous_db
+        database.close()
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Build a synthetic MTG-Journal database.")
+    parser.add_argument("path", help="Database file to create")
+    parser.add_argument("--games", type=int, default=10000)
+    parser.add_argument("--groups", type=int, default=1)
+    parser.add_argument("--players", type=int, default=12, help="Players per group")
+    parser.add_argument("--commanders", type=int, default=500, help="Commander pool size")
+    parser.add_argument("--zipf", type=float, default=1.1, help="Zipf exponent of commander popularity")
+    parser.add_argument("--seats", default="3=20,4=65,5=15", help="Seat count weights")
+    parser.add_argument("--win-cons", default=",".join(f"{k}={v}" for k, v in DEFAULT_WIN_CONS.items()),
+                        help="Win condition weights")
+    parser.add_argument("--start", default="2022-01-01", help="Date of the first game")
+    parser.add_argument("--days", type=int, default=1095, help="Days the games are spread over")
+    parser.add_argument("--backdated", type=float, default=0.02, help="Fraction of backdated games")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    info = generate_database(
+        args.path, args.games, args.groups, args.players, args.commanders, args.zipf,
+        parse_weights(args.seats, int), parse_weights(args.win_cons),
+        date.fromisoformat(args.start), args.days, args.backdated, args.seed
+    )
+    print(f"Wrote {args.games} games in {len(info['group_ids'])} groups to {args.path}")
+
+if __name__ == "__main__":
+    main()
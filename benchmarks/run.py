@@ -0,0 +1,293 @@
+"""
+Time the public query and write functions against synthetic databases.
+
+    python -m benchmarks.run --scales 1000,10000,100000 --output results.json
+    python -m benchmarks.run --baseline baseline.json
+
+Databases are generated once per scale into benchmarks/data and reused. Every
+read runs with the result cache and commander index dropped, so the numbers
+are the cost of an uncached request. With --baseline the run exits non-zero
+when any median is slower than the baseline beyond the tolerance.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import sqlite3
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import queries
+import schema
+from benchmarks.generate import generate_database
+from ratings import replay as replay_ratings
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(BENCH_DIR, "data")
+
+DEFAULT_SCALES = "1000,10000,100000"
+DEFAULT_REPEAT = 5
+# Games written per record_games / process_csv_games call
+WRITE_BATCH = 100
+# Slowdowns smaller than this many milliseconds never count as a regression
+DEFAULT_NOISE_FLOOR_MS = 0.5
+DEFAULT_TOLERANCE = 0.25
+
+def _reset_caches():
+    queries.query_cache.clear()
+    with queries._commander_indexes_lock:
+        queries._commander_indexes.clear()
+
+def time_call(func: Callable[[], Any], repeat: int, setup: Optional[Callable[[], Any]] = None) -> Dict[str, float]:
+    """
+    Time a callable after one warm-up call.
+
+    Args:
+        func: Function to time
+        repeat: Number of timed calls
+        setup: Called untimed before every call
+
+    Returns:
+        Dict[str, float]: median, min and p95 milliseconds plus the number of runs
+    """
+    samples = []
+    for run in range(repeat + 1):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        func()
+        elapsed = (time.perf_counter() - start) * 1000
+        if run:
+            samples.append(elapsed)
+    samples.sort()
+    return {
+        "median_ms": round(statistics.median(samples), 3),
+        "min_ms": round(samples[0], 3),
+        "p95_ms": round(samples[min(len(samples) - 1, int(0.95 * len(samples)))], 3),
+        "runs": repeat
+    }
+
+def dataset_path(games: int, groups: int, seed: int) -> str:
+    return os.path.join(DATA_DIR, f"games-{games}-groups-{groups}-seed-{seed}.db")
+
+def ensure_dataset(games: int, groups: int, seed: int) -> str:
+    """Generate the database for a scale unless a previous run left it behind, migrating it if so"""
+    path = dataset_path(games, groups, seed)
+    if os.path.exists(path):
+        schema.upgrade(path)
+    else:
+        os.makedirs(DATA_DIR, exist_ok=True)
+        started = time.perf_counter()
+        generate_database(f"{path}.tmp", games, groups=groups, seed=seed)
+        os.replace(f"{path}.tmp", path)
+        print(f"  generated {path} in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+    return path
+
+def _busiest(database: queries.MTGDatabase) -> Tuple[int, str, List[str], List[str]]:
+    """Group with the most games, its most active player, roster and commanders"""
+    group_id = database.execute_single(
+        "SELECT group_id FROM Games GROUP BY group_id ORDER BY COUNT(*) DESC LIMIT 1"
+    )[0]
+    roster = [row[0] for row in database.execute_query(
+        """
+        SELECT pp.Name FROM PlayerStats s
+        JOIN PlayerProfiles pp ON pp.PlayerProfileID = s.PlayerProfileID
+        WHERE s.group_id = ? ORDER BY s.GamesPlayed DESC
+        """, (group_id,)
+    )]
+    commanders = [row[0] for row in database.execute_query(
+        """
+        SELECT c.Name FROM CommanderStats s
+        JOIN Commanders c ON c.CommanderID = s.CommanderID
+        WHERE s.group_id = ? ORDER BY s.GamesPlayed DESC LIMIT 200
+        """, (group_id,)
+    )]
+    return group_id, roster[0], roster, commanders
+
+def _synthetic_games(rng: random.Random, count: int, roster: List[str], commanders: List[str]) -> List[Tuple[Dict[str, Any], List[Dict[str, Any]], str]]:
+    games = []
+    for index in range(count):
+        seated = rng.sample(roster, min(4, len(roster)))
+        players = [
+            {"player_name": name, "commander_name": rng.choice(commanders), "turn_order": turn}
+            for turn, name in enumerate(seated, 1)
+        ]
+        game = {
+            "date": (date(2030, 1, 1) + timedelta(days=index)).isoformat(),
+            "num_players": len(players), "turns": rng.randint(5, 14), "win_con": "Combat"
+        }
+        games.append((game, players, rng.choice(seated)))
+    return games
+
+def _games_csv(games: List[Tuple[Dict[str, Any], List[Dict[str, Any]], str]]) -> str:
+    lines = ["Date,NumPlayers,WinnerName,PlayerName,Turns,WinCon,CommanderName,TurnOrder"]
+    for game, players, winner in games:
+        for player in players:
+            lines.append(",".join(str(value) for value in (
+                game["date"], game["num_players"], winner, player["player_name"], game["turns"],
+                game["win_con"], player["commander_name"], player["turn_order"]
+            )))
+    return "\n".join(lines) + "\n"
+
+def bench_reads(group_id: int, player_name: str, repeat: int) -> Dict[str, Dict[str, float]]:
+    """Time every hot read function plus the ungrouped variants, uncached"""
+    calls = queries.hot_queries(group_id, player_name)
+    calls.update({
+        "get_win_rate_stats[all]": lambda: queries.get_win_rate_stats("player"),
+        "get_win_rate_stats[commander]": lambda: queries.get_win_rate_stats("commander", group_id=group_id),
+        "get_color_stats": lambda: queries.get_color_stats(group_id=group_id),
+        "get_color_stats[all]": lambda: queries.get_color_stats(),
+        "get_longest_win_streak[all]": lambda: queries.get_longest_win_streak(),
+        "get_commander_suggestions[typo]": lambda: queries.get_commander_suggestions("kazumor", group_id),
+    })
+    return {name: time_call(call, repeat, _reset_caches) for name, call in sorted(calls.items())}
+
+def bench_writes(source: str, group_id: int, roster: List[str], commanders: List[str], repeat: int, seed: int) -> Dict[str, Dict[str, float]]:
+    """Time the insert paths on a scratch copy of a dataset"""
+    scratch = f"{source}.scratch"
+    shutil.copyfile(source, scratch)
+    database = queries.MTGDatabase(scratch)
+    previous_db, queries.db = queries.db, database
+    rng = random.Random(seed)
+    results = {}
+    try:
+        single = iter(_synthetic_games(rng, repeat + 1, roster, commanders))
+        results["record_game"] = time_call(lambda: queries.record_game(*next(single), group_id), repeat)
+
+        batches = iter([_synthetic_games(rng, WRITE_BATCH, roster, commanders) for _ in range(repeat + 1)])
+        results[f"record_games[{WRITE_BATCH}]"] = time_call(lambda: queries.record_games(next(batches), group_id), repeat)
+
+        try:
+            from app import process_csv_games
+        except ImportError as e:
+            print(f"  skipping process_csv_games: {e}", file=sys.stderr)
+        else:
+            uploads = iter([_games_csv(_synthetic_games(rng, WRITE_BATCH, roster, commanders)) for _ in range(repeat + 1)])
+            results[f"process_csv_games[{WRITE_BATCH}]"] = time_call(lambda: process_csv_games(next(uploads), group_id), repeat)
+
+        # Full rating recompute of the group, and the pure Elo replay within it
+        results["rebuild_ratings"] = time_call(lambda: queries.rebuild_ratings(group_id), repeat)
+        seats = database.execute_query(queries.RATING_SEATS_SQL, (group_id, "", 0))
+        starts = [i for i in range(len(seats)) if i == 0 or seats[i][0] != seats[i - 1][0]] + [len(seats)]
+        players = [seat[2] for seat in seats]
+        results["ratings.replay"] = time_call(lambda: replay_ratings(players, starts), repeat)
+    finally:
+        queries.db = previous_db
+        database.close()
+        _reset_caches()
+        os.remove(scratch)
+    return results
+
+def run(scales: List[int], groups: int, repeat: int, seed: int) -> Dict[str, Any]:
+    """
+    Run the benchmark at every scale.
+
+    Returns:
+        Dict[str, Any]: meta (versions, settings) and results keyed by scale
+                        then function name
+    """
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "groups": groups,
+            "repeat": repeat,
+            "seed": seed,
+        },
+        "results": {}
+    }
+    for games in scales:
+        print(f"{games} games", file=sys.stderr)
+        path = ensure_dataset(games, groups, seed)
+        database = queries.MTGDatabase(path)
+        previous_db, queries.db = queries.db, database
+        try:
+            group_id, player_name, roster, commanders = _busiest(database)
+            results = bench_reads(group_id, player_name, repeat)
+        finally:
+            queries.db = previous_db
+            database.close()
+            _reset_caches()
+        results.update(bench_writes(path, group_id, roster, commanders, repeat, seed))
+        report["results"][str(games)] = results
+    return report
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float, noise_floor_ms: float) -> List[str]:
+    """
+    List every function whose median got slower than the baseline allows.
+
+    A result regresses when it is more than tolerance (a fraction) slower and
+    at least noise_floor_ms slower. Functions or scales missing from either
+    side are ignored.
+
+    Returns:
+        List[str]: One line per regression
+    """
+    regressions = []
+    for scale, results in report["results"].items():
+        for name, timing in results.items():
+            before = baseline.get("results", {}).get(scale, {}).get(name)
+            if before is None:
+                continue
+            old, new = before["median_ms"], timing["median_ms"]
+            if new > old * (1 + tolerance) and new - old >= noise_floor_ms:
+                regressions.append(f"{scale} games {name}: {old:.3f} ms -> {new:.3f} ms (+{(new / old - 1) * 100 if old else float('inf'):.0f}%)")
+    return regressions
+
+def print_report(report: Dict[str, Any], baseline: Optional[Dict[str, Any]] = None):
+    for scale, results in report["results"].items():
+        print(f"\n{scale} games")
+        print(f"  {'function':<40} {'median':>10} {'min':>10} {'p95':>10} {'baseline':>10}")
+        for name, timing in results.items():
+            before = (baseline or {}).get("results", {}).get(scale, {}).get(name)
+            print(f"  {name:<40} {timing['median_ms']:>10.3f} {timing['min_ms']:>10.3f} {timing['p95_ms']:>10.3f}"
+                  f" {before['median_ms'] if before else '-':>10}")
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark MTG-Journal queries against synthetic data.")
+    parser.add_argument("--scales", default=DEFAULT_SCALES, help="Comma-separated game counts, e.g. 1000,1000000")
+    parser.add_argument("--groups", type=int, default=4, help="Groups per dataset")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="Timed runs per function")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="Write the results as JSON")
+    parser.add_argument("--baseline", help="Results JSON to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="Write the results to --baseline instead of comparing")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="Allowed slowdown as a fraction")
+    parser.add_argument("--noise-floor", type=float, default=DEFAULT_NOISE_FLOOR_MS, help="Ignore slowdowns below this many ms")
+    args = parser.parse_args(argv)
+
+    scales = [int(float(scale)) for scale in args.scales.split(",")]
+    report = run(scales, args.groups, args.repeat, args.seed)
+
+    baseline = None
+    if args.baseline and not args.save_baseline and os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+
+    for path in filter(None, [args.output, args.baseline if args.save_baseline else None]):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nWrote {path}")
+
+    if args.baseline and not args.save_baseline:
+        if baseline is None:
+            print(f"\nBaseline {args.baseline} not found; run with --save-baseline first", file=sys.stderr)
+            return 2
+        regressions = compare(report, baseline, args.tolerance, args.noise_floor)
+        if regressions:
+            print(f"\nREGRESSIONS ({len(regressions)}):", file=sys.stderr)
+            for line in regressions:
+                print(f"  {line}", file=sys.stderr)
+            return 1
+        print("\nNo regressions against the baseline")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
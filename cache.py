@@ -0,0 +1,124 @@
+import inspect
+import threading
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+class GroupQueryCache:
+    """
+    LRU cache of read results, partitioned by group and stamped with the
+    group's data version.
+
+    Each group gets its own LRU partition, so a write to one group (which
+    bumps its version) only drops that group's partition and never evicts or
+    invalidates another group's entries.
+    """
+
+    def __init__(self, max_entries_per_group: int = 256, max_groups: int = 64):
+        self.max_entries_per_group = max_entries_per_group
+        self.max_groups = max_groups
+        # group_id -> (data version, OrderedDict of key -> value)
+        self._partitions: "OrderedDict[int, Tuple[int, OrderedDict]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+
+    def get(self, group_id: int, version: int, key: Hashable) -> Tuple[bool, Any]:
+        """
+        Look up a cached value for a group at a given data version.
+
+        Returns:
+            Tuple[bool, Any]: (found, value)
+        """
+        with self._lock:
+            partition = self._partitions.get(group_id)
+            if partition is not None and partition[0] != version:
+                # The group was written to since these entries were cached
+                del self._partitions[group_id]
+                self.invalidations += 1
+                partition = None
+
+            if partition is not None and key in partition[1]:
+                self._partitions.move_to_end(group_id)
+                partition[1].move_to_end(key)
+                self.hits += 1
+                return True, partition[1][key]
+
+            self.misses += 1
+            return False, None
+
+    def put(self, group_id: int, version: int, key: Hashable, value: Any):
+        """Store a value computed from a group's data at the given version"""
+        with self._lock:
+            partition = self._partitions.get(group_id)
+            if partition is None or partition[0] != version:
+                partition = (version, OrderedDict())
+                self._partitions[group_id] = partition
+            self._partitions.move_to_end(group_id)
+
+            entries = partition[1]
+            entries[key] = value
+            entries.move_to_end(key)
+            while len(entries) > self.max_entries_per_group:
+                entries.popitem(last=False)
+                self.evictions += 1
+            while len(self._partitions) > self.max_groups:
+                _, (_, dropped) = self._partitions.popitem(last=False)
+                self.evictions += len(dropped)
+
+    def clear(self, group_id: Optional[int] = None):
+        """Drop cached entries for one group, or for every group when None"""
+        with self._lock:
+            if group_id is None:
+                self._partitions.clear()
+            else:
+                self._partitions.pop(group_id, None)
+
+    def stats(self) -> Dict[str, int]:
+        """Get hit/miss counters and current size"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+                "evictions": self.evictions,
+                "groups": len(self._partitions),
+                "entries": sum(len(entries) for _, entries in self._partitions.values()),
+            }
+
+    def cached(self, version_of: Callable[[int], int]) -> Callable:
+        """
+        Decorate a read function so group-scoped calls are served from the cache.
+
+        The function must take a group_id argument; calls where it is None
+        bypass the cache. Cached results are shared between callers and must
+        be treated as read-only.
+
+        Args:
+            version_of: Callable returning the current data version of a group
+        """
+        def decorator(func: Callable) -> Callable:
+            signature = inspect.signature(func)
+
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                bound = signature.bind(*args, **kwargs)
+                bound.apply_defaults()
+                group_id = bound.arguments.get("group_id")
+                if group_id is None:
+                    return func(*args, **kwargs)
+
+                key = (func.__name__, tuple(bound.arguments.items()))
+                version = version_of(group_id)
+                found, value = self.get(group_id, version, key)
+                if found:
+                    return value
+
+                value = func(*args, **kwargs)
+                self.put(group_id, version, key, value)
+                return value
+
+            return wrapper
+        return decorator
@@ -0,0 +1,276 @@
+import html
+import json
+import mmap
+import os
+import re
+import struct
+import threading
+from typing import IO, Any, Dict, Iterator, List, Optional, Tuple
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CATALOG_PATH = os.path.join(BASE_DIR, "commanders.catalog")
+
+# Catalog file layout, all little-endian:
+#   header      magic, name count, full-name key count, word key count
+#   names       one (blob offset, length, color mask) record per card
+#   full keys   (blob offset, length, name index) per whole card name, plus the
+#               front face of double-faced cards, sorted by key bytes
+#   word keys   the same for the tail of each name from its second word on,
+#               so "praet" finds "Atraxa, Praetors' Voice"
+#   blob        UTF-8 card names and keys
+# Both key tables are sorted, so lookups and prefix scans are binary searches.
+CATALOG_MAGIC = b"MTGCAT01"
+HEADER = struct.Struct("<8sIII")
+NAME_RECORD = struct.Struct("<IHBx")
+KEY_RECORD = struct.Struct("<IHxxI")
+
+# Color identity letters as Scryfall lists them, mapped to the ColorMask bits
+COLOR_BITS = {"W": 1, "U": 2, "B": 4, "R": 8, "G": 16}
+
+# Scryfall layouts that aren't real cards
+NON_CARD_LAYOUTS = {"token", "double_faced_token", "emblem", "art_series", "vanguard", "planar", "scheme"}
+
+JSON_CHUNK_SIZE = 1 << 20
+ARRAY_SEPARATOR_RE = re.compile(r"[\s,]*")
+
+def catalog_key(name: str) -> str:
+    """
+    Case-fold a card name and drop punctuation so "atraxa praetors voice" finds "Atraxa, Praetors' Voice".
+
+    Names arrive HTML-escaped from the app's input sanitizing, so entities are
+    decoded first; otherwise "Praetors&#x27; Voice" would keep a stray "x27".
+    """
+    return " ".join(re.sub(r"[^\w\s]", "", html.unescape(name).casefold()).split())
+
+def iter_json_array(fp: IO[str], chunk_size: int = JSON_CHUNK_SIZE) -> Iterator[Any]:
+    """
+    Yield the elements of a top-level JSON array one at a time.
+
+    Only the current chunk and the element being decoded are held in memory,
+    so multi-hundred-MB bulk files stream in constant space.
+
+    Args:
+        fp: Text file positioned at the start of a JSON array
+        chunk_size: Characters read per refill
+
+    Returns:
+        Iterator[Any]: Decoded array elements
+    """
+    decoder = json.JSONDecoder()
+    buffer = fp.read(chunk_size).lstrip()
+    if not buffer.startswith("["):
+        raise ValueError("Expected a JSON array")
+    position = 1
+    eof = False
+
+    while True:
+        position = ARRAY_SEPARATOR_RE.match(buffer, position).end()
+        if position < len(buffer) and buffer[position] == "]":
+            return
+        try:
+            if position == len(buffer):
+                raise json.JSONDecodeError("Unterminated JSON array", buffer, position)
+            element, position = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            # The element runs past the end of the buffer, unless the file is done
+            if eof:
+                raise
+            chunk = fp.read(chunk_size)
+            eof = not chunk
+            buffer = buffer[position:] + chunk
+            position = 0
+            continue
+        yield element
+
+def _front_face(card: Dict[str, Any]) -> Dict[str, Any]:
+    faces = card.get("card_faces") or []
+    return faces[0] if faces and "type_line" in faces[0] else card
+
+def is_commander(card: Dict[str, Any]) -> bool:
+    """Whether a Scryfall card object can lead a Commander deck"""
+    if card.get("layout") in NON_CARD_LAYOUTS:
+        return False
+    if (card.get("legalities") or {}).get("commander") != "legal":
+        return False
+    face = _front_face(card)
+    type_line = face.get("type_line", "")
+    if "Legendary" in type_line and "Creature" in type_line:
+        return True
+    return "can be your commander" in (face.get("oracle_text") or card.get("oracle_text") or "")
+
+def color_mask(color_identity: List[str]) -> int:
+    """Convert Scryfall's color_identity list to a ColorMask value"""
+    mask = 0
+    for color in color_identity:
+        mask |= COLOR_BITS.get(color, 0)
+    return mask
+
+def ingest_bulk_json(json_path: str, output_path: str = CATALOG_PATH) -> int:
+    """
+    Build a commander catalog from a Scryfall bulk data file.
+
+    Any bulk export works (oracle_cards is smallest); reprints are collapsed
+    by name. The catalog is written next to the target and moved into place,
+    so a running app never sees a partial file.
+
+    Args:
+        json_path: Path to the bulk JSON file
+        output_path: Where to write the catalog
+
+    Returns:
+        int: Number of commanders in the catalog
+    """
+    commanders: Dict[str, int] = {}
+    with open(json_path, encoding="utf-8") as fp:
+        for card in iter_json_array(fp):
+            if is_commander(card):
+                commanders[card["name"]] = color_mask(card.get("color_identity") or [])
+
+    names = sorted(commanders)
+    full_keys: Dict[str, int] = {}
+    word_keys: Dict[str, int] = {}
+    for name_index, name in enumerate(names):
+        key = catalog_key(name)
+        full_keys.setdefault(key, name_index)
+        if " // " in name:
+            full_keys.setdefault(catalog_key(name.split(" // ")[0]), name_index)
+        words = key.split(" ")
+        for start in range(1, len(words)):
+            word_keys.setdefault(" ".join(words[start:]), name_index)
+
+    tables = [
+        [(name.encode("utf-8"), commanders[name]) for name in names],
+        sorted((key.encode("utf-8"), index) for key, index in full_keys.items()),
+        sorted((key.encode("utf-8"), index) for key, index in word_keys.items()),
+    ]
+    offset = HEADER.size + NAME_RECORD.size * len(names) + KEY_RECORD.size * (len(full_keys) + len(word_keys))
+
+    tmp_path = f"{output_path}.tmp"
+    with open(tmp_path, "wb") as out:
+        out.write(HEADER.pack(CATALOG_MAGIC, len(names), len(full_keys), len(word_keys)))
+        for table_index, table in enumerate(tables):
+            record = NAME_RECORD if table_index == 0 else KEY_RECORD
+            for encoded, value in table:
+                out.write(record.pack(offset, len(encoded), value))
+                offset += len(encoded)
+        for table in tables:
+            out.writelines(encoded for encoded, _ in table)
+    os.replace(tmp_path, output_path)
+    return len(names)
+
+class CardCatalog:
+    """
+    Read-only, memory-mapped commander catalog written by ingest_bulk_json.
+
+    Nothing is parsed up front: each lookup binary-searches a sorted key
+    table in the mapping, so opening is O(1) and pages are read on demand.
+    """
+
+    def __init__(self, path: str = CATALOG_PATH):
+        self.path = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.name_count, self.full_key_count, self.word_key_count = HEADER.unpack_from(self._map, 0)
+        if magic != CATALOG_MAGIC:
+            self._map.close()
+            raise ValueError(f"{path} is not a commander catalog")
+        self._full_keys = (HEADER.size + NAME_RECORD.size * self.name_count, self.full_key_count)
+        self._word_keys = (self._full_keys[0] + KEY_RECORD.size * self.full_key_count, self.word_key_count)
+
+    def __len__(self) -> int:
+        return self.name_count
+
+    def close(self):
+        self._map.close()
+
+    def _key(self, table: Tuple[int, int], index: int) -> Tuple[bytes, int]:
+        offset, length, name_index = KEY_RECORD.unpack_from(self._map, table[0] + KEY_RECORD.size * index)
+        return self._map[offset:offset + length], name_index
+
+    def _name(self, name_index: int) -> Tuple[str, int]:
+        offset, length, mask = NAME_RECORD.unpack_from(self._map, HEADER.size + NAME_RECORD.size * name_index)
+        return self._map[offset:offset + length].decode("utf-8"), mask
+
+    def _lower_bound(self, table: Tuple[int, int], target: bytes) -> int:
+        low, high = 0, table[1]
+        while low < high:
+            mid = (low + high) // 2
+            if self._key(table, mid)[0] < target:
+                low = mid + 1
+            else:
+                high = mid
+        return low
+
+    def _prefix_matches(self, table: Tuple[int, int], target: bytes) -> Iterator[int]:
+        index = self._lower_bound(table, target)
+        while index < table[1]:
+            key, name_index = self._key(table, index)
+            if not key.startswith(target):
+                return
+            yield name_index
+            index += 1
+
+    def lookup(self, name: str) -> Optional[Tuple[str, int]]:
+        """
+        Find a commander by name, ignoring case and punctuation.
+
+        Args:
+            name: Commander name as entered
+
+        Returns:
+            Optional[Tuple[str, int]]: (canonical name, color mask), or None if unknown
+        """
+        target = catalog_key(name).encode("utf-8")
+        if not target:
+            return None
+        index = self._lower_bound(self._full_keys, target)
+        if index < self.full_key_count:
+            key, name_index = self._key(self._full_keys, index)
+            if key == target:
+                return self._name(name_index)
+        return None
+
+    def search(self, query: str, limit: int = 10) -> List[str]:
+        """
+        Get commander names starting with the query, then names with a later word starting with it.
+
+        Args:
+            query: Partial commander name
+            limit: Maximum number of names
+
+        Returns:
+            List[str]: Canonical commander names
+        """
+        target = catalog_key(query).encode("utf-8")
+        if not target or limit <= 0:
+            return []
+        found: List[int] = []
+        for table in (self._full_keys, self._word_keys):
+            for name_index in self._prefix_matches(table, target):
+                if len(found) >= limit:
+                    break
+                if name_index not in found:
+                    found.append(name_index)
+        return [self._name(name_index)[0] for name_index in found]
+
+_catalog: Optional[Tuple[float, CardCatalog]] = None
+_catalog_lock = threading.Lock()
+
+def get_card_catalog(path: str = CATALOG_PATH) -> Optional[CardCatalog]:
+    """
+    Get the commander catalog, opening it on first use.
+
+    The app runs without a catalog; it is reopened when ingest replaces the file.
+
+    Returns:
+        Optional[CardCatalog]: The catalog, or None if none has been ingested
+    """
+    global _catalog
+    try:
+        mtime = os.stat(path).st_mtime
+    except OSError:
+        return None
+    with _catalog_lock:
+        if _catalog is None or _catalog[0] != mtime or _catalog[1].path != path:
+            _catalog = (mtime, CardCatalog(path))
+        return _catalog[1]
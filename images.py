@@ -0,0 +1,170 @@
+import hashlib
+import io
+import json
+import os
+import re
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+COMMANDER_IMAGE_DIR = os.path.join(BASE_DIR, "static", "assets", "commanders")
+COMMANDER_IMAGE_URL = "/static/assets/commanders"
+
+# Resized copies live beside the originals, named <slug>.<variant>.<hash>.webp.
+# The hash covers the file's bytes, so a URL never changes content and can be
+# cached forever; a new source image gets a new URL.
+VARIANT_DIR = os.path.join(COMMANDER_IMAGE_DIR, "variants")
+VARIANT_URL = f"{COMMANDER_IMAGE_URL}/variants"
+MANIFEST_PATH = os.path.join(VARIANT_DIR, "manifest.json")
+
+# Variant name -> width in pixels, smallest first. Gallery images display at
+# 120px (90px on phones): thumb serves 1x screens and small 2x ones; medium
+# is the modal size.
+VARIANTS = (("thumb", 120), ("small", 240), ("medium", 488))
+WEBP_QUALITY = 75
+SOURCE_EXTENSIONS = (".jpg", ".jpeg", ".png")
+
+HASHED_ASSET_RE = re.compile(r"\.[0-9a-f]{10}\.webp$")
+# One year, the longest max-age browsers honour
+IMMUTABLE_MAX_AGE = 31536000
+
+def to_kebab_case(input_data) -> str:
+    """
+    Convert a string or dict with 'name' key to kebab-case format.
+    Used for generating consistent filenames from commander names.
+
+    Args:
+        input_data: String or dictionary with 'name' key
+
+    Returns:
+        str: Kebab-case formatted string
+
+    Raises:
+        ValueError: If input is not a string or dict with 'name' key
+    """
+    # Handle different input types
+    if isinstance(input_data, str):
+        name = input_data
+    elif isinstance(input_data, dict) and 'name' in input_data:
+        name = input_data['name']
+    else:
+        raise ValueError(f"Invalid input type. Expected str or dict with 'name' key, got {type(input_data)}")
+
+    # Convert to kebab-case
+    name = name.lower()
+    name = re.sub(r'[^a-z0-9\s-]', '', name)
+    name = name.strip()
+    name = re.sub(r'\s+', '-', name)
+    return name
+
+def build_image_variants(source_dir: str = COMMANDER_IMAGE_DIR, output_dir: str = VARIANT_DIR, quality: int = WEBP_QUALITY, prune: bool = False) -> Dict[str, Dict[str, Any]]:
+    """
+    Write the WebP variants of every commander image and the manifest naming them.
+
+    Source images are named by commander slug (to_kebab_case of the name).
+    Variants whose bytes did not change keep their file. Superseded files are
+    kept unless pruned, since pages cached before the build still link them.
+    Needs Pillow.
+
+    Args:
+        source_dir: Directory of full-size commander images
+        output_dir: Directory for the variants and manifest.json
+        quality: WebP quality, 0-100
+        prune: Delete variant files the new manifest no longer names
+
+    Returns:
+        Dict[str, Dict[str, Any]]: The manifest: slug -> variant name ->
+                                   file, width and height
+    """
+    try:
+        from PIL import Image
+    except ImportError:
+        raise RuntimeError("Building image variants needs Pillow: pip install pillow")
+
+    os.makedirs(output_dir, exist_ok=True)
+    manifest: Dict[str, Dict[str, Any]] = {}
+    for filename in sorted(os.listdir(source_dir)):
+        slug, extension = os.path.splitext(filename)
+        if extension.lower() not in SOURCE_EXTENSIONS:
+            continue
+        with Image.open(os.path.join(source_dir, filename)) as source:
+            source = source.convert("RGB")
+            entry = manifest[slug] = {}
+            for variant, width in VARIANTS:
+                width = min(width, source.width)
+                height = round(source.height * width / source.width)
+                buffer = io.BytesIO()
+                source.resize((width, height), Image.LANCZOS).save(buffer, "WEBP", quality=quality, method=6)
+                data = buffer.getvalue()
+                name = f"{slug}.{variant}.{hashlib.sha256(data).hexdigest()[:10]}.webp"
+                path = os.path.join(output_dir, name)
+                if not os.path.exists(path):
+                    with open(path, "wb") as out:
+                        out.write(data)
+                entry[variant] = {"file": name, "width": width, "height": height}
+
+    if prune:
+        keep = {variant["file"] for entry in manifest.values() for variant in entry.values()}
+        for filename in os.listdir(output_dir):
+            if HASHED_ASSET_RE.search(filename) and filename not in keep:
+                os.remove(os.path.join(output_dir, filename))
+
+    manifest_path = os.path.join(output_dir, os.path.basename(MANIFEST_PATH))
+    with open(f"{manifest_path}.tmp", "w", encoding="utf-8") as out:
+        json.dump(manifest, out, indent=2, sort_keys=True)
+    os.replace(f"{manifest_path}.tmp", manifest_path)
+    return manifest
+
+_manifest: Optional[Tuple[float, Dict[str, Dict[str, Any]]]] = None
+_manifest_lock = threading.Lock()
+
+def image_manifest_version(path: str = MANIFEST_PATH) -> str:
+    """Modification time of the variant manifest, which every build rewrites; empty if never built"""
+    try:
+        return str(os.stat(path).st_mtime_ns)
+    except OSError:
+        return ""
+
+def get_image_manifest(path: str = MANIFEST_PATH) -> Dict[str, Dict[str, Any]]:
+    """Get the variant manifest, reloading it when a build replaces the file; empty if never built"""
+    global _manifest
+    try:
+        mtime = os.stat(path).st_mtime
+    except OSError:
+        return {}
+    with _manifest_lock:
+        if _manifest is None or _manifest[0] != mtime:
+            with open(path, encoding="utf-8") as f:
+                _manifest = (mtime, json.load(f))
+        return _manifest[1]
+
+def commander_image(name: str) -> Dict[str, Any]:
+    """
+    Get the image URLs for a commander.
+
+    Args:
+        name: Commander name
+
+    Returns:
+        Dict[str, Any]: name, slug, img (thumbnail src), srcset (empty when no
+                        variants were built), full (modal image), width and height
+    """
+    slug = to_kebab_case(name)
+    entry = get_image_manifest().get(slug)
+    original = f"{COMMANDER_IMAGE_URL}/{slug}.jpg"
+    if not entry:
+        return {"name": name, "slug": slug, "img": original, "srcset": "", "full": original, "width": None, "height": None}
+    thumb, medium = entry["thumb"], entry["medium"]
+    return {
+        "name": name,
+        "slug": slug,
+        "img": f"{VARIANT_URL}/{thumb['file']}",
+        "srcset": ", ".join(f"{VARIANT_URL}/{entry[v]['file']} {entry[v]['width']}w" for v, _ in VARIANTS if v in entry),
+        "full": f"{VARIANT_URL}/{medium['file']}",
+        "width": thumb["width"],
+        "height": thumb["height"],
+    }
+
+def is_hashed_asset(path: str) -> bool:
+    """Whether a URL path names a content-hashed file that may be cached forever"""
+    return bool(HASHED_ASSET_RE.search(path))
@@ -0,0 +1,195 @@
+import bisect
+import logging
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+# Histogram bucket upper bounds, in seconds for timings
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5, 1.0)
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 250)
+
+DEFAULT_SLOW_QUERY_MS = 100.0
+
+slow_query_log = logging.getLogger("mtg.slow_query")
+
+Labels = Tuple[Tuple[str, str], ...]
+
+class Histogram:
+    """Cumulative-bucket histogram in the shape Prometheus expects, one series per label set"""
+
+    def __init__(self, name: str, help_text: str, buckets: Tuple[float, ...]):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        # labels -> (per-bucket counts plus +Inf, sum)
+        self._series: Dict[Labels, List] = {}
+
+    def observe(self, labels: Labels, value: float):
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+        series[0][bisect.bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for labels, (counts, total) in sorted(self._series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f"{self.name}_bucket{_format_labels(labels + (('le', le),))} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {total}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {cumulative}")
+        return lines
+
+class Counter:
+    """Monotonic counter, one series per label set"""
+
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help_text = help_text
+        self._series: Dict[Labels, float] = {}
+
+    def inc(self, labels: Labels, amount: float = 1):
+        self._series[labels] = self._series.get(labels, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        lines.extend(f"{self.name}{_format_labels(labels)} {value}" for labels, value in sorted(self._series.items()))
+        return lines
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels) + "}"
+
+class MetricsRegistry:
+    """
+    Request, template and SQL timings for the /metrics endpoint.
+
+    Disabled by default: callers check enabled before timing anything, so the
+    only cost left in the query path is one attribute read. Per-request
+    figures (query count, SQL time, template time) are kept per thread, the
+    same way MTGDatabase pools connections.
+    """
+
+    def __init__(self, enabled: bool = False, slow_query_ms: float = DEFAULT_SLOW_QUERY_MS):
+        self.enabled = enabled
+        self.slow_query_ms = slow_query_ms
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._reset()
+
+    def configure(self, enabled: bool, slow_query_ms: Optional[float] = None):
+        """Turn collection on or off and optionally change the slow query threshold"""
+        self.enabled = enabled
+        if slow_query_ms is not None:
+            self.slow_query_ms = slow_query_ms
+
+    def _reset(self):
+        self.request_seconds = Histogram(
+            "mtg_request_duration_seconds", "Request latency by route", REQUEST_BUCKETS
+        )
+        self.request_queries = Histogram(
+            "mtg_request_queries", "SQL statements issued per request by route", QUERY_COUNT_BUCKETS
+        )
+        self.template_seconds = Histogram(
+            "mtg_template_render_seconds", "Template render time", REQUEST_BUCKETS
+        )
+        self.statement_seconds = Histogram(
+            "mtg_sql_statement_duration_seconds", "SQL execution time by statement name", STATEMENT_BUCKETS
+        )
+        self.statement_rows = Counter("mtg_sql_rows_total", "Rows returned (reads) or changed (writes) by statement name")
+        self.slow_queries = Counter("mtg_sql_slow_queries_total", "Statements slower than the slow query threshold")
+
+    def reset(self):
+        """Drop every collected series"""
+        with self._lock:
+            self._reset()
+
+    # Per-request state
+    def start_request(self):
+        self._local.request = {"started": time.perf_counter(), "queries": 0, "sql_seconds": 0.0, "template_seconds": 0.0}
+
+    def current_request(self) -> Optional[Dict[str, float]]:
+        return getattr(self._local, "request", None)
+
+    def finish_request(self, route: str, method: str, status: int) -> Optional[Dict[str, float]]:
+        """
+        Record the latency and query count of the calling thread's request.
+
+        Returns:
+            Optional[Dict[str, float]]: The request's figures (seconds, queries,
+                                        sql_seconds, template_seconds), or None if
+                                        start_request was not called
+        """
+        stats = self.current_request()
+        if stats is None:
+            return None
+        self._local.request = None
+        stats["seconds"] = time.perf_counter() - stats["started"]
+        with self._lock:
+            self.request_seconds.observe((("route", route), ("method", method), ("status", str(status))), stats["seconds"])
+            self.request_queries.observe((("route", route),), stats["queries"])
+        return stats
+
+    def record_template(self, template: str, seconds: float):
+        stats = self.current_request()
+        if stats is not None:
+            stats["template_seconds"] += seconds
+        with self._lock:
+            self.template_seconds.observe((("template", template),), seconds)
+
+    def record_statement(self, name: str, seconds: float, rows: int):
+        """
+        Record one SQL statement or write transaction.
+
+        Statements over the slow query threshold are also logged, by name only:
+        bound values can hold passkeys.
+
+        Args:
+            name: Registered statement name, transaction name or "<raw sql>"
+            seconds: Time spent executing and fetching
+            rows: Rows returned, or rows changed for writes
+        """
+        stats = self.current_request()
+        if stats is not None:
+            stats["queries"] += 1
+            stats["sql_seconds"] += seconds
+        slow = seconds * 1000 >= self.slow_query_ms
+        labels = (("statement", name),)
+        with self._lock:
+            self.statement_seconds.observe(labels, seconds)
+            self.statement_rows.inc(labels, rows)
+            if slow:
+                self.slow_queries.inc(labels)
+        if slow:
+            slow_query_log.warning("slow query %s: %.1f ms, %d rows", name, seconds * 1000, rows)
+
+    def render(self, extra: Optional[List[str]] = None) -> str:
+        """
+        Render every series in the Prometheus text exposition format.
+
+        Args:
+            extra: Already formatted lines to append (gauges owned elsewhere)
+
+        Returns:
+            str: The exposition text
+        """
+        with self._lock:
+            lines = ["# HELP mtg_metrics_enabled Whether timings are being collected",
+                     "# TYPE mtg_metrics_enabled gauge",
+                     f"mtg_metrics_enabled {int(self.enabled)}"]
+            for metric in (self.request_seconds, self.request_queries, self.template_seconds,
+                           self.statement_seconds, self.statement_rows, self.slow_queries):
+                lines.extend(metric.render())
+        lines.extend(extra or [])
+        return "\n".join(lines) + "\n"
+
+# Process-wide registry; app.py switches it on from the environment
+registry = MetricsRegistry()
@@ -0,0 +1,29 @@
+-- Baseline schema as originally shipped in mtg.db. Every statement is
+-- IF NOT EXISTS so existing databases are left untouched and fresh ones
+-- (tests, benchmarks, new installs) get the same starting point.
+
+CREATE TABLE IF NOT EXISTS Groups (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    group_name TEXT UNIQUE,
+    passkey TEXT -- could be hashed
+);
+
+CREATE TABLE IF NOT EXISTS Games (
+    GameID INTEGER PRIMARY KEY,
+    Date TEXT,
+    NumPlayers INTEGER,
+    WinnerPlayerID INTEGER REFERENCES Players (PlayerID),
+    Turns INTEGER,
+    WinCon TEXT,
+    group_id INTEGER REFERENCES Groups(id)
+);
+
+CREATE TABLE IF NOT EXISTS Players (
+    PlayerID INTEGER PRIMARY KEY,
+    GameID REFERENCES Games (GameID),
+    PlayerName TEXT NOT NULL,
+    CommanderName TEXT,
+    TurnOrder INTEGER,
+    ColorIdentity TEXT,
+    group_id INTEGER REFERENCES Groups(id)
+);
@@ -0,0 +1,17 @@
+-- Indexes backing the group-scoped reads in queries.py. Without these every
+-- stats, history and suggestion query full-scans Players and Games.
+
+-- Group lookups and per-player filters (player stats, recent commanders)
+CREATE INDEX IF NOT EXISTS idx_players_group_player ON Players (group_id, PlayerName);
+
+-- Players -> Games join and winner lookups by game
+CREATE INDEX IF NOT EXISTS idx_players_game ON Players (GameID);
+
+-- Commander stats and commander-name suggestions
+CREATE INDEX IF NOT EXISTS idx_players_group_commander ON Players (group_id, CommanderName);
+
+-- Group-filtered game history in chronological order
+CREATE INDEX IF NOT EXISTS idx_games_group_date ON Games (group_id, Date, GameID);
+
+-- Login by passkey
+CREATE INDEX IF NOT EXISTS idx_groups_passkey ON Groups (passkey);
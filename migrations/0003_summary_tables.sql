@@ -0,0 +1,52 @@
+-- Per-group aggregate tables for the stats page. They are kept up to date in
+-- the same transaction as every game insert and winner update (see
+-- queries.py), and can be recomputed with 'flask db rebuild'.
+
+CREATE TABLE IF NOT EXISTS PlayerStats (
+    group_id INTEGER NOT NULL REFERENCES Groups(id),
+    PlayerName TEXT NOT NULL,
+    GamesPlayed INTEGER NOT NULL DEFAULT 0,
+    Wins INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (group_id, PlayerName)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS CommanderStats (
+    group_id INTEGER NOT NULL REFERENCES Groups(id),
+    CommanderName TEXT NOT NULL,
+    GamesPlayed INTEGER NOT NULL DEFAULT 0,
+    Wins INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (group_id, CommanderName)
+) WITHOUT ROWID;
+
+-- Seats played with each WUBRG color in their identity
+CREATE TABLE IF NOT EXISTS ColorStats (
+    group_id INTEGER NOT NULL REFERENCES Groups(id),
+    Color TEXT NOT NULL,
+    Seats INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (group_id, Color)
+) WITHOUT ROWID;
+
+INSERT INTO PlayerStats (group_id, PlayerName, GamesPlayed, Wins)
+SELECT p.group_id, p.PlayerName, COUNT(*),
+       SUM(CASE WHEN g.WinnerPlayerID = p.PlayerID THEN 1 ELSE 0 END)
+FROM Players p
+JOIN Games g ON p.GameID = g.GameID
+WHERE p.group_id IS NOT NULL
+GROUP BY p.group_id, p.PlayerName;
+
+INSERT INTO CommanderStats (group_id, CommanderName, GamesPlayed, Wins)
+SELECT p.group_id, COALESCE(p.CommanderName, ''), COUNT(*),
+       SUM(CASE WHEN g.WinnerPlayerID = p.PlayerID THEN 1 ELSE 0 END)
+FROM Players p
+JOIN Games g ON p.GameID = g.GameID
+WHERE p.group_id IS NOT NULL
+GROUP BY p.group_id, COALESCE(p.CommanderName, '');
+
+WITH colors(Color) AS (VALUES ('W'), ('U'), ('B'), ('R'), ('G'))
+INSERT INTO ColorStats (group_id, Color, Seats)
+SELECT p.group_id, c.Color, SUM(instr(COALESCE(p.ColorIdentity, ''), c.Color) > 0)
+FROM Players p
+JOIN Games g ON p.GameID = g.GameID
+CROSS JOIN colors c
+WHERE p.group_id IS NOT NULL
+GROUP BY p.group_id, c.Color;
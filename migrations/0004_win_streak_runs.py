@@ -0,0 +1,47 @@
+"""
+Persist win streaks as runs of consecutive wins by the same player.
+
+Every maximal run in a group's (Date, GameID) history is stored once, so the
+home page reads the longest and current streaks instead of replaying the
+whole game history. queries.py extends the last run in O(1) per new game and
+re-replays only the neighbouring runs for backdated games.
+"""
+from migrations.replay import streak_runs
+
+CREATE_SQL = [
+    """
+    CREATE TABLE IF NOT EXISTS StreakRuns (
+        RunID INTEGER PRIMARY KEY,
+        group_id INTEGER NOT NULL REFERENCES Groups(id),
+        PlayerName TEXT NOT NULL,
+        Length INTEGER NOT NULL,
+        StartDate TEXT NOT NULL,
+        StartGameID INTEGER NOT NULL,
+        EndDate TEXT NOT NULL,
+        EndGameID INTEGER NOT NULL,
+        Commanders TEXT NOT NULL DEFAULT '[]'  -- JSON list in first-use order
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_streak_runs_group_end ON StreakRuns (group_id, EndDate, EndGameID)",
+    "CREATE INDEX IF NOT EXISTS idx_streak_runs_group_length ON StreakRuns (group_id, Length)",
+]
+
+def upgrade(conn):
+    for sql in CREATE_SQL:
+        conn.execute(sql)
+
+    games = conn.execute("""
+        SELECT g.group_id, g.GameID, COALESCE(g.Date, ''), p.PlayerName, p.CommanderName
+        FROM Games g
+        JOIN Players p ON p.PlayerID = g.WinnerPlayerID
+        WHERE g.group_id IS NOT NULL
+        ORDER BY g.group_id, g.Date, g.GameID
+    """)
+
+    conn.executemany(
+        """
+        INSERT INTO StreakRuns (group_id, PlayerName, Length, StartDate, StartGameID, EndDate, EndGameID, Commanders)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        streak_runs(games)
+    )
@@ -0,0 +1,4 @@
+-- Write generation per group. Bumped in the same transaction as every game
+-- insert or update so cached reads can tell when a group's data changed.
+
+ALTER TABLE Groups ADD COLUMN data_version INTEGER NOT NULL DEFAULT 0;
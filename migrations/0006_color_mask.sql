@@ -0,0 +1,24 @@
+-- Color identity as a 5-bit WUBRG mask (W=1, U=2, B=4, R=8, G=16; 0 is
+-- colorless, NULL is unknown) so color aggregates run as bitwise SUMs in SQL.
+
+ALTER TABLE Players ADD COLUMN ColorMask INTEGER;
+
+UPDATE Players
+SET ColorMask = (instr(upper(ColorIdentity), 'W') > 0) * 1
+              + (instr(upper(ColorIdentity), 'U') > 0) * 2
+              + (instr(upper(ColorIdentity), 'B') > 0) * 4
+              + (instr(upper(ColorIdentity), 'R') > 0) * 8
+              + (instr(upper(ColorIdentity), 'G') > 0) * 16
+WHERE ColorIdentity IS NOT NULL AND ColorIdentity != '';
+
+-- Seat counts per color now come from the mask
+DELETE FROM ColorStats;
+
+WITH colors(Color, Bit) AS (VALUES ('W', 1), ('U', 2), ('B', 4), ('R', 8), ('G', 16))
+INSERT INTO ColorStats (group_id, Color, Seats)
+SELECT p.group_id, c.Color, COALESCE(SUM((p.ColorMask & c.Bit) != 0), 0)
+FROM Players p
+JOIN Games g ON p.GameID = g.GameID
+CROSS JOIN colors c
+WHERE p.group_id IS NOT NULL
+GROUP BY p.group_id, c.Color;
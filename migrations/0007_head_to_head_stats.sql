@@ -0,0 +1,21 @@
+-- Per-group player x opponent record, maintained with the other summary
+-- tables. Each ordered pair holds the games both players sat in and how many
+-- of those PlayerName won; the opponent's wins are on the mirrored row.
+
+CREATE TABLE IF NOT EXISTS HeadToHeadStats (
+    group_id INTEGER NOT NULL REFERENCES Groups(id),
+    PlayerName TEXT NOT NULL,
+    OpponentName TEXT NOT NULL,
+    Games INTEGER NOT NULL DEFAULT 0,
+    Wins INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (group_id, PlayerName, OpponentName)
+) WITHOUT ROWID;
+
+INSERT INTO HeadToHeadStats (group_id, PlayerName, OpponentName, Games, Wins)
+SELECT a.group_id, a.PlayerName, b.PlayerName, COUNT(*),
+       SUM(CASE WHEN g.WinnerPlayerID = a.PlayerID THEN 1 ELSE 0 END)
+FROM Players a
+JOIN Players b ON b.GameID = a.GameID AND b.PlayerName != a.PlayerName
+JOIN Games g ON g.GameID = a.GameID
+WHERE a.group_id IS NOT NULL
+GROUP BY a.group_id, a.PlayerName, b.PlayerName;
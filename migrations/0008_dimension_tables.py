@@ -0,0 +1,183 @@
+"""
+Move player and commander names into dimension tables keyed by integer ids.
+
+Players rows now reference a PlayerProfiles row (one per player per group)
+and a Commanders row (one per commander, shared by every group) instead of
+repeating the name text on every seat. Names are matched on a normalized key
+(case-folded, whitespace collapsed), so "Alex" and "alex " become the same
+player; the first spelling seen is kept for display. The summary tables and
+win streak runs are keyed by the ids and rebuilt here, since merging
+spellings changes their rows.
+
+Run VACUUM afterwards to hand the space freed by the dropped name columns
+back to the file system.
+"""
+from migrations.replay import streak_runs
+
+def name_key(name):
+    # Same normalization as autocomplete.normalize
+    return " ".join((name or "").casefold().split())
+
+def display_name(name):
+    return " ".join((name or "").split())
+
+CREATE_SQL = [
+    """
+    CREATE TABLE IF NOT EXISTS PlayerProfiles (
+        PlayerProfileID INTEGER PRIMARY KEY,
+        group_id INTEGER REFERENCES Groups(id),
+        Name TEXT NOT NULL,
+        NameKey TEXT NOT NULL,
+        UNIQUE (group_id, NameKey)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS Commanders (
+        CommanderID INTEGER PRIMARY KEY,
+        Name TEXT NOT NULL,
+        NameKey TEXT NOT NULL UNIQUE
+    )
+    """,
+]
+
+# First spelling (lowest PlayerID) of every key becomes the display name
+FILL_SQL = [
+    """
+    INSERT INTO PlayerProfiles (group_id, Name, NameKey)
+    SELECT group_id, display_name(PlayerName), name_key(PlayerName)
+    FROM Players
+    WHERE PlayerID IN (
+        SELECT MIN(PlayerID) FROM Players GROUP BY group_id, name_key(PlayerName)
+    )
+    ORDER BY PlayerID
+    """,
+    """
+    INSERT INTO Commanders (Name, NameKey)
+    SELECT display_name(CommanderName), name_key(CommanderName)
+    FROM Players
+    WHERE PlayerID IN (
+        SELECT MIN(PlayerID) FROM Players GROUP BY name_key(CommanderName)
+    )
+    ORDER BY PlayerID
+    """,
+    "ALTER TABLE Players ADD COLUMN PlayerProfileID INTEGER REFERENCES PlayerProfiles(PlayerProfileID)",
+    "ALTER TABLE Players ADD COLUMN CommanderID INTEGER REFERENCES Commanders(CommanderID)",
+    """
+    UPDATE Players SET
+        PlayerProfileID = (
+            SELECT pp.PlayerProfileID FROM PlayerProfiles pp
+            WHERE pp.group_id IS Players.group_id AND pp.NameKey = name_key(Players.PlayerName)
+        ),
+        CommanderID = (
+            SELECT c.CommanderID FROM Commanders c WHERE c.NameKey = name_key(Players.CommanderName)
+        )
+    """,
+    # The name columns can only be dropped once nothing indexes them
+    "DROP INDEX IF EXISTS idx_players_group_player",
+    "DROP INDEX IF EXISTS idx_players_group_commander",
+    "ALTER TABLE Players DROP COLUMN PlayerName",
+    "ALTER TABLE Players DROP COLUMN CommanderName",
+    "CREATE INDEX IF NOT EXISTS idx_players_group_profile ON Players (group_id, PlayerProfileID)",
+    "CREATE INDEX IF NOT EXISTS idx_players_group_commander_id ON Players (group_id, CommanderID)",
+]
+
+SUMMARY_SQL = [
+    "DROP TABLE PlayerStats",
+    "DROP TABLE CommanderStats",
+    "DROP TABLE HeadToHeadStats",
+    "DROP TABLE StreakRuns",
+    """
+    CREATE TABLE PlayerStats (
+        group_id INTEGER NOT NULL REFERENCES Groups(id),
+        PlayerProfileID INTEGER NOT NULL REFERENCES PlayerProfiles(PlayerProfileID),
+        GamesPlayed INTEGER NOT NULL DEFAULT 0,
+        Wins INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (group_id, PlayerProfileID)
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE CommanderStats (
+        group_id INTEGER NOT NULL REFERENCES Groups(id),
+        CommanderID INTEGER NOT NULL REFERENCES Commanders(CommanderID),
+        GamesPlayed INTEGER NOT NULL DEFAULT 0,
+        Wins INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (group_id, CommanderID)
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE HeadToHeadStats (
+        group_id INTEGER NOT NULL REFERENCES Groups(id),
+        PlayerProfileID INTEGER NOT NULL REFERENCES PlayerProfiles(PlayerProfileID),
+        OpponentProfileID INTEGER NOT NULL REFERENCES PlayerProfiles(PlayerProfileID),
+        Games INTEGER NOT NULL DEFAULT 0,
+        Wins INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (group_id, PlayerProfileID, OpponentProfileID)
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE StreakRuns (
+        RunID INTEGER PRIMARY KEY,
+        group_id INTEGER NOT NULL REFERENCES Groups(id),
+        PlayerProfileID INTEGER NOT NULL REFERENCES PlayerProfiles(PlayerProfileID),
+        Length INTEGER NOT NULL,
+        StartDate TEXT NOT NULL,
+        StartGameID INTEGER NOT NULL,
+        EndDate TEXT NOT NULL,
+        EndGameID INTEGER NOT NULL,
+        Commanders TEXT NOT NULL DEFAULT '[]'  -- JSON list of names in first-use order
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_streak_runs_group_end ON StreakRuns (group_id, EndDate, EndGameID)",
+    "CREATE INDEX IF NOT EXISTS idx_streak_runs_group_length ON StreakRuns (group_id, Length)",
+    """
+    INSERT INTO PlayerStats (group_id, PlayerProfileID, GamesPlayed, Wins)
+    SELECT p.group_id, p.PlayerProfileID, COUNT(*),
+           SUM(CASE WHEN g.WinnerPlayerID = p.PlayerID THEN 1 ELSE 0 END)
+    FROM Players p
+    JOIN Games g ON p.GameID = g.GameID
+    WHERE p.group_id IS NOT NULL
+    GROUP BY p.group_id, p.PlayerProfileID
+    """,
+    """
+    INSERT INTO CommanderStats (group_id, CommanderID, GamesPlayed, Wins)
+    SELECT p.group_id, p.CommanderID, COUNT(*),
+           SUM(CASE WHEN g.WinnerPlayerID = p.PlayerID THEN 1 ELSE 0 END)
+    FROM Players p
+    JOIN Games g ON p.GameID = g.GameID
+    WHERE p.group_id IS NOT NULL
+    GROUP BY p.group_id, p.CommanderID
+    """,
+    """
+    INSERT INTO HeadToHeadStats (group_id, PlayerProfileID, OpponentProfileID, Games, Wins)
+    SELECT a.group_id, a.PlayerProfileID, b.PlayerProfileID, COUNT(*),
+           SUM(CASE WHEN g.WinnerPlayerID = a.PlayerID THEN 1 ELSE 0 END)
+    FROM Players a
+    JOIN Players b ON b.GameID = a.GameID AND b.PlayerProfileID != a.PlayerProfileID
+    JOIN Games g ON g.GameID = a.GameID
+    WHERE a.group_id IS NOT NULL
+    GROUP BY a.group_id, a.PlayerProfileID, b.PlayerProfileID
+    """,
+]
+
+def upgrade(conn):
+    conn.create_function("name_key", 1, name_key, deterministic=True)
+    conn.create_function("display_name", 1, display_name, deterministic=True)
+    for sql in CREATE_SQL + FILL_SQL + SUMMARY_SQL:
+        conn.execute(sql)
+
+    games = conn.execute("""
+        SELECT g.group_id, g.GameID, COALESCE(g.Date, ''), p.PlayerProfileID, c.Name
+        FROM Games g
+        JOIN Players p ON p.PlayerID = g.WinnerPlayerID
+        JOIN Commanders c ON c.CommanderID = p.CommanderID
+        WHERE g.group_id IS NOT NULL
+        ORDER BY g.group_id, g.Date, g.GameID
+    """)
+
+    conn.executemany(
+        """
+        INSERT INTO StreakRuns (group_id, PlayerProfileID, Length, StartDate, StartGameID, EndDate, EndGameID, Commanders)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        streak_runs(games)
+    )
@@ -0,0 +1,54 @@
+"""
+Add multiplayer Elo ratings: the current rating of every player per group and
+the rating history, one row per rated seat.
+
+Every decided, dated game is replayed in (Date, GameID) order. The winner
+beats each other seat and each pairing moves at most 32 / (players - 1)
+points (see migrations/replay.py).
+"""
+from migrations.replay import ratings
+
+CREATE_SQL = [
+    """
+    CREATE TABLE IF NOT EXISTS PlayerRatings (
+        group_id INTEGER NOT NULL REFERENCES Groups(id),
+        PlayerProfileID INTEGER NOT NULL REFERENCES PlayerProfiles(PlayerProfileID),
+        Rating REAL NOT NULL,
+        Games INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (group_id, PlayerProfileID)
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS RatingHistory (
+        group_id INTEGER NOT NULL REFERENCES Groups(id),
+        PlayerProfileID INTEGER NOT NULL REFERENCES PlayerProfiles(PlayerProfileID),
+        Date TEXT NOT NULL,
+        GameID INTEGER NOT NULL,
+        Rating REAL NOT NULL,  -- after the game
+        Delta REAL NOT NULL,
+        PRIMARY KEY (group_id, PlayerProfileID, Date, GameID)
+    ) WITHOUT ROWID
+    """,
+]
+
+def upgrade(conn):
+    for sql in CREATE_SQL:
+        conn.execute(sql)
+
+    seats = conn.execute("""
+        SELECT g.group_id, g.GameID, g.Date, p.PlayerProfileID
+        FROM Games g
+        JOIN Players p ON p.GameID = +g.GameID
+        WHERE g.group_id IS NOT NULL AND g.Date IS NOT NULL AND g.WinnerPlayerID IS NOT NULL
+        ORDER BY g.group_id, g.Date, g.GameID, p.PlayerID != g.WinnerPlayerID, p.PlayerID
+    """).fetchall()
+
+    history, current = ratings(seats)
+    conn.executemany(
+        "INSERT INTO RatingHistory (group_id, PlayerProfileID, Date, GameID, Rating, Delta) VALUES (?, ?, ?, ?, ?, ?)",
+        history
+    )
+    conn.executemany(
+        "INSERT INTO PlayerRatings (group_id, PlayerProfileID, Rating, Games) VALUES (?, ?, ?, ?)",
+        current
+    )
@@ -0,0 +1,163 @@
+"""
+Store game dates as ISO YYYY-MM-DD text and add per-group daily rollups.
+
+Dates written before validation existed may be in other spellings
+(2024/03/05, 3/5/2024, 2024-03-05T19:30). They are rewritten to ISO so they
+sort and compare as dates; anything that cannot be read as a date is left
+as it is. A rewritten date can move a game in (Date, GameID) play order, so
+the win streaks and ratings of every group with a rewritten date are
+replayed here (see migrations/replay.py).
+
+The rollups hold one row per group and day (and player, commander or color)
+so stats over a date range add up the days in the range instead of reading
+every game in it. Games without a date are left out of them.
+"""
+from datetime import datetime
+
+from migrations.replay import ratings, streak_runs
+
+# Same formats as queries.DATE_FORMATS
+DATE_FORMATS = ("%Y-%m-%d", "%Y/%m/%d", "%m/%d/%Y", "%m/%d/%y", "%m-%d-%Y")
+
+def iso_date(value):
+    text = str(value or "").strip().replace("T", " ").split(" ")[0]
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.strptime(text, date_format).date().isoformat()
+        except ValueError:
+            pass
+    return value
+
+CREATE_SQL = [
+    """
+    CREATE TABLE IF NOT EXISTS DailyGames (
+        group_id INTEGER NOT NULL REFERENCES Groups(id),
+        Day TEXT NOT NULL,
+        Games INTEGER NOT NULL DEFAULT 0,
+        Seats INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (group_id, Day)
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS DailyPlayerStats (
+        group_id INTEGER NOT NULL REFERENCES Groups(id),
+        Day TEXT NOT NULL,
+        PlayerProfileID INTEGER NOT NULL REFERENCES PlayerProfiles(PlayerProfileID),
+        GamesPlayed INTEGER NOT NULL DEFAULT 0,
+        Wins INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (group_id, Day, PlayerProfileID)
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS DailyCommanderStats (
+        group_id INTEGER NOT NULL REFERENCES Groups(id),
+        Day TEXT NOT NULL,
+        CommanderID INTEGER NOT NULL REFERENCES Commanders(CommanderID),
+        GamesPlayed INTEGER NOT NULL DEFAULT 0,
+        Wins INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (group_id, Day, CommanderID)
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS DailyColorStats (
+        group_id INTEGER NOT NULL REFERENCES Groups(id),
+        Day TEXT NOT NULL,
+        Color TEXT NOT NULL,
+        Seats INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (group_id, Day, Color)
+    ) WITHOUT ROWID
+    """,
+]
+
+CHANGED_GROUPS_SQL = """
+    SELECT DISTINCT group_id FROM Games
+    WHERE group_id IS NOT NULL AND Date IS NOT NULL AND Date != iso_date(Date)
+"""
+
+BACKFILL_SQL = "UPDATE Games SET Date = iso_date(Date) WHERE Date IS NOT NULL AND Date != iso_date(Date)"
+
+FILL_SQL = [
+    """
+    INSERT INTO DailyGames (group_id, Day, Games, Seats)
+    SELECT g.group_id, g.Date, COUNT(*), SUM((SELECT COUNT(*) FROM Players p WHERE p.GameID = +g.GameID))
+    FROM Games g
+    WHERE g.group_id IS NOT NULL AND g.Date IS NOT NULL
+    GROUP BY g.group_id, g.Date
+    """,
+    """
+    INSERT INTO DailyPlayerStats (group_id, Day, PlayerProfileID, GamesPlayed, Wins)
+    SELECT p.group_id, g.Date, p.PlayerProfileID, COUNT(*),
+           SUM(CASE WHEN g.WinnerPlayerID = p.PlayerID THEN 1 ELSE 0 END)
+    FROM Players p
+    JOIN Games g ON p.GameID = g.GameID
+    WHERE p.group_id IS NOT NULL AND g.Date IS NOT NULL
+    GROUP BY p.group_id, g.Date, p.PlayerProfileID
+    """,
+    """
+    INSERT INTO DailyCommanderStats (group_id, Day, CommanderID, GamesPlayed, Wins)
+    SELECT p.group_id, g.Date, p.CommanderID, COUNT(*),
+           SUM(CASE WHEN g.WinnerPlayerID = p.PlayerID THEN 1 ELSE 0 END)
+    FROM Players p
+    JOIN Games g ON p.GameID = g.GameID
+    WHERE p.group_id IS NOT NULL AND g.Date IS NOT NULL
+    GROUP BY p.group_id, g.Date, p.CommanderID
+    """,
+    """
+    WITH colors(Color, Bit) AS (VALUES ('W', 1), ('U', 2), ('B', 4), ('R', 8), ('G', 16))
+    INSERT INTO DailyColorStats (group_id, Day, Color, Seats)
+    SELECT p.group_id, g.Date, c.Color, COALESCE(SUM((p.ColorMask & c.Bit) != 0), 0)
+    FROM Players p
+    JOIN Games g ON p.GameID = g.GameID
+    CROSS JOIN colors c
+    WHERE p.group_id IS NOT NULL AND g.Date IS NOT NULL
+    GROUP BY p.group_id, g.Date, c.Color
+    """,
+]
+
+def replay_streaks(conn, group_id):
+    conn.execute("DELETE FROM StreakRuns WHERE group_id = ?", (group_id,))
+    games = conn.execute("""
+        SELECT g.group_id, g.GameID, g.Date, p.PlayerProfileID, c.Name
+        FROM Games g
+        JOIN Players p ON p.PlayerID = g.WinnerPlayerID
+        JOIN Commanders c ON c.CommanderID = p.CommanderID
+        WHERE g.group_id = ? AND g.Date IS NOT NULL
+        ORDER BY g.Date, g.GameID
+    """, (group_id,))
+    conn.executemany(
+        """
+        INSERT INTO StreakRuns (group_id, PlayerProfileID, Length, StartDate, StartGameID, EndDate, EndGameID, Commanders)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        streak_runs(games)
+    )
+
+def replay_ratings(conn, group_id):
+    conn.execute("DELETE FROM RatingHistory WHERE group_id = ?", (group_id,))
+    conn.execute("DELETE FROM PlayerRatings WHERE group_id = ?", (group_id,))
+    seats = conn.execute("""
+        SELECT g.group_id, g.GameID, g.Date, p.PlayerProfileID
+        FROM Games g
+        JOIN Players p ON p.GameID = +g.GameID
+        WHERE g.group_id = ? AND g.Date IS NOT NULL AND g.WinnerPlayerID IS NOT NULL
+        ORDER BY g.Date, g.GameID, p.PlayerID != g.WinnerPlayerID, p.PlayerID
+    """, (group_id,)).fetchall()
+    history, current = ratings(seats)
+    conn.executemany(
+        "INSERT INTO RatingHistory (group_id, PlayerProfileID, Date, GameID, Rating, Delta) VALUES (?, ?, ?, ?, ?, ?)",
+        history
+    )
+    conn.executemany(
+        "INSERT INTO PlayerRatings (group_id, PlayerProfileID, Rating, Games) VALUES (?, ?, ?, ?)",
+        current
+    )
+
+def upgrade(conn):
+    conn.create_function("iso_date", 1, iso_date, deterministic=True)
+    changed_groups = [row[0] for row in conn.execute(CHANGED_GROUPS_SQL)]
+    conn.execute(BACKFILL_SQL)
+    for group_id in changed_groups:
+        replay_streaks(conn, group_id)
+        replay_ratings(conn, group_id)
+    for sql in CREATE_SQL + FILL_SQL:
+        conn.execute(sql)
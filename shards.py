@@ -0,0 +1,202 @@
+"""
+Split a database into per-group shard files and merge shards back.
+
+A shard directory holds directory.db (every Groups row, plus any games that
+predate groups) and one group-<id>.db per group with that group's games,
+players and summary rows. Point MTG_SHARD_DIR at the directory to serve from
+it. Every file carries the full schema, so `flask db upgrade` migrates them
+one by one.
+"""
+import os
+import sqlite3
+from typing import Dict, List, Optional
+
+import queries
+import schema
+
+def _columns(conn: sqlite3.Connection, table: str, schema_name: str = "main") -> List[str]:
+    return [row[1] for row in conn.execute(f"PRAGMA {schema_name}.table_info({table})")]
+
+def _tables(conn: sqlite3.Connection) -> List[str]:
+    """User tables of the main database, parents before children"""
+    names = [row[0] for row in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%' AND name != 'schema_version'"
+    )]
+    # Foreign keys are not enforced, but parents first keeps the copies readable
+    order = ["Groups", "PlayerProfiles", "Commanders", "Games", "Players"]
+    return sorted(names, key=lambda name: order.index(name) if name in order else len(order))
+
+def _copy_rows(conn: sqlite3.Connection, table: str, where: str = "", params: tuple = (), overrides: Optional[Dict[str, str]] = None) -> int:
+    """
+    Copy rows of a table from the attached src database into main.
+
+    Args:
+        conn: Connection to the destination with the source attached as src
+        table: Table present in both databases
+        where: Optional filter on the source rows
+        params: Parameters of the filter
+        overrides: Column -> SQL expression to write instead of the source value
+
+    Returns:
+        int: Number of rows copied
+    """
+    overrides = overrides or {}
+    columns = [c for c in _columns(conn, table) if c in set(_columns(conn, table, "src"))]
+    select = ", ".join(overrides.get(c, f"s.{c}") for c in columns)
+    cur = conn.execute(
+        f"INSERT INTO main.{table} ({', '.join(columns)}) SELECT {select} FROM src.{table} s {where}",
+        params
+    )
+    return cur.rowcount
+
+def split_database(source_path: str, shard_dir: str) -> List[int]:
+    """
+    Copy every group of a database into its own shard file.
+
+    The source is left untouched. Existing shard files are refused rather
+    than overwritten.
+
+    Args:
+        source_path: Database to split; must be fully migrated
+        shard_dir: Directory to write directory.db and group-<id>.db into
+
+    Returns:
+        List[int]: IDs of the groups that were written
+
+    Raises:
+        ValueError: If the source has pending migrations or a shard already exists
+    """
+    if schema.get_pending_migrations(source_path):
+        raise ValueError(f"{source_path} has pending migrations; run flask db upgrade first")
+    os.makedirs(shard_dir, exist_ok=True)
+    directory_path = os.path.join(shard_dir, queries.SHARD_DIRECTORY_FILE)
+    if os.path.exists(directory_path):
+        raise ValueError(f"{directory_path} already exists")
+
+    source = sqlite3.connect(source_path)
+    try:
+        group_ids = [row[0] for row in source.execute("SELECT id FROM Groups ORDER BY id")]
+    finally:
+        source.close()
+
+    # Directory: every group, plus rows that belong to no group
+    _write_shard(source_path, directory_path, None)
+    for group_id in group_ids:
+        _write_shard(source_path, os.path.join(shard_dir, f"group-{group_id}.db"), group_id)
+    return group_ids
+
+def _write_shard(source_path: str, path: str, group_id: Optional[int]):
+    """Create one shard from the source: a group's rows, or the directory when group_id is None"""
+    if os.path.exists(path):
+        raise ValueError(f"{path} already exists")
+    schema.upgrade(f"{path}.tmp")
+    conn = sqlite3.connect(f"{path}.tmp")
+    try:
+        conn.execute("ATTACH DATABASE ? AS src", (source_path,))
+        with conn:
+            for table in _tables(conn):
+                columns = _columns(conn, table)
+                if table == "Groups":
+                    if group_id is None:
+                        _copy_rows(conn, table)
+                    else:
+                        _copy_rows(conn, table, "WHERE s.id = ?", (group_id,))
+                elif table == "Commanders":
+                    # Shared across groups; each shard keeps the ones its seats use
+                    _copy_rows(conn, table, """
+                        WHERE s.CommanderID IN (SELECT CommanderID FROM src.Players WHERE group_id IS ?)
+                           OR s.NameKey = ''
+                    """, (group_id,))
+                elif "group_id" in columns:
+                    _copy_rows(conn, table, "WHERE s.group_id IS ?", (group_id,))
+                else:
+                    _copy_rows(conn, table)
+        conn.execute("DETACH DATABASE src")
+    finally:
+        conn.close()
+    os.replace(f"{path}.tmp", path)
+
+def merge_shards(shard_dir: str, output_path: str) -> int:
+    """
+    Combine a shard directory back into a single database.
+
+    Games, players and profiles get fresh ids in the output; commanders are
+    matched by name across shards. Summary tables, win streaks and ratings are rebuilt
+    from the merged games.
+
+    Args:
+        shard_dir: Directory written by split_database (or served with MTG_SHARD_DIR)
+        output_path: Database file to create
+
+    Returns:
+        int: Number of games in the merged database
+
+    Raises:
+        ValueError: If the output exists or a shard has pending migrations
+    """
+    if os.path.exists(output_path):
+        raise ValueError(f"{output_path} already exists")
+    directory_path = os.path.join(shard_dir, queries.SHARD_DIRECTORY_FILE)
+    shard_paths = [directory_path] + [
+        os.path.join(shard_dir, name)
+        for name in sorted(os.listdir(shard_dir), key=lambda n: (len(n), n))
+        if queries.SHARD_FILE_RE.match(name)
+    ]
+    for path in shard_paths:
+        if schema.get_pending_migrations(path):
+            raise ValueError(f"{path} has pending migrations; run flask db upgrade first")
+
+    schema.upgrade(f"{output_path}.tmp")
+    conn = sqlite3.connect(f"{output_path}.tmp")
+    try:
+        with conn:
+            for path in shard_paths:
+                conn.execute("ATTACH DATABASE ? AS src", (path,))
+                _merge_shard(conn, is_directory=path == directory_path)
+                conn.commit()
+                conn.execute("DETACH DATABASE src")
+            cur = conn.cursor()
+            queries._rebuild_summary_tables(cur, None)
+            queries._rebuild_streak_runs(cur, None)
+            queries._rebuild_ratings(cur, None)
+        games = conn.execute("SELECT COUNT(*) FROM Games").fetchone()[0]
+    finally:
+        conn.close()
+    os.replace(f"{output_path}.tmp", output_path)
+    return games
+
+def _merge_shard(conn: sqlite3.Connection, is_directory: bool):
+    """Append the attached src shard's games to main, renumbering their ids"""
+    def offset(table, column):
+        return conn.execute(f"SELECT COALESCE(MAX({column}), 0) FROM main.{table}").fetchone()[0]
+
+    if is_directory:
+        _copy_rows(conn, "Groups")
+    else:
+        # Shards carry their own data_version; keep the higher so caches stay valid
+        conn.execute("""
+            UPDATE main.Groups SET data_version = MAX(data_version, (SELECT s.data_version FROM src.Groups s WHERE s.id = Groups.id))
+            WHERE id IN (SELECT id FROM src.Groups)
+        """)
+
+    conn.execute("""
+        INSERT INTO main.Commanders (Name, NameKey)
+        SELECT Name, NameKey FROM src.Commanders WHERE true
+        ON CONFLICT (NameKey) DO NOTHING
+    """)
+    profiles, games, players = offset("PlayerProfiles", "PlayerProfileID"), offset("Games", "GameID"), offset("Players", "PlayerID")
+    _copy_rows(conn, "PlayerProfiles", overrides={"PlayerProfileID": f"s.PlayerProfileID + {profiles}"})
+    _copy_rows(conn, "Games", overrides={
+        "GameID": f"s.GameID + {games}",
+        "WinnerPlayerID": f"s.WinnerPlayerID + {players}",
+    })
+    _copy_rows(conn, "Players", overrides={
+        "PlayerID": f"s.PlayerID + {players}",
+        "GameID": f"s.GameID + {games}",
+        "PlayerProfileID": f"s.PlayerProfileID + {profiles}",
+        "CommanderID": """(
+            SELECT m.CommanderID FROM main.Commanders m
+            JOIN src.Commanders c ON c.NameKey = m.NameKey
+            WHERE c.CommanderID = s.CommanderID
+        )""",
+    })
@@ -14,55 +14,37 @@ function initCommanderModal(modalId = 'imageModal') {
     return;
   }
 
+  // Image URL and EDHREC slug come from the page (data-image, data-slug), so
+  // the hashed variant filenames are only ever built on the server
+  function openModal(element) {
+    const commanderName = element.dataset.commander;
+    modalImage.src = element.dataset.image;
+
+    // Set Scryfall link
+    const scryfallUrl = `https://scryfall.com/search?q=${encodeURIComponent(commanderName)}`;
+    modalLinkScryfall.href = scryfallUrl;
+    modalLinkScryfall.textContent = `View ${commanderName} on Scryfall`;
+
+    // Set EDHREC link
+    const edhrecUrl = `https://edhrec.com/commanders/${element.dataset.slug}`;
+    modalLinkEdhrec.href = edhrecUrl;
+    modalLinkEdhrec.textContent = `View ${commanderName} on EDHREC`;
+
+    // Show modal
+    modal.classList.add('modal--active');
+  }
+
   // Attach click listeners to all commander links
   document.querySelectorAll('.link[data-commander]').forEach(link => {
     link.addEventListener('click', (e) => {
       e.preventDefault();
-      const commanderName = link.dataset.commander;
-      const kebabName = toKebabCase(commanderName);
-
-      // Build image URL
-      const imageUrl = `/static/assets/commanders/${kebabName}.jpg`;
-      modalImage.src = imageUrl;
-
-      // Set Scryfall link
-      const scryfallUrl = `https://scryfall.com/search?q=${encodeURIComponent(commanderName)}`;
-      modalLinkScryfall.href = scryfallUrl;
-      modalLinkScryfall.textContent = `View ${commanderName} on Scryfall`;
-
-      // Set EDHREC link
-      const edhrecUrl = `https://edhrec.com/commanders/${kebabName}`;
-      modalLinkEdhrec.href = edhrecUrl;
-      modalLinkEdhrec.textContent = `View ${commanderName} on EDHREC`;
-
-      // Show modal
-      modal.classList.add('modal--active');
+      openModal(link);
     });
   });
 
   // Also handle commander gallery images (for index.html.j2)
   document.querySelectorAll('.commander-gallery__image[data-commander]').forEach(img => {
-    img.addEventListener('click', (e) => {
-      const commanderName = img.dataset.commander;
-      const kebabName = toKebabCase(commanderName);
-
-      // Build image URL
-      const imageUrl = `/static/assets/commanders/${kebabName}.jpg`;
-      modalImage.src = imageUrl;
-
-      // Set Scryfall link
-      const scryfallUrl = `https://scryfall.com/search?q=${encodeURIComponent(commanderName)}`;
-      modalLinkScryfall.href = scryfallUrl;
-      modalLinkScryfall.textContent = `View ${commanderName} on Scryfall`;
-
-      // Set EDHREC link
-      const edhrecUrl = `https://edhrec.com/commanders/${kebabName}`;
-      modalLinkEdhrec.href = edhrecUrl;
-      modalLinkEdhrec.textContent = `View ${commanderName} on EDHREC`;
-
-      // Show modal
-      modal.classList.add('modal--active');
-    });
+    img.addEventListener('click', () => openModal(img));
   });
 
   // Close modal function
@@ -93,14 +75,6 @@ function initCommanderModal(modalId = 'imageModal') {
   });
 }
 
-function toKebabCase(name) {
-  return name
-    .toLowerCase()
-    .replace(/[^a-z0-9\s-]/g, '')   // remove commas, apostrophes, etc.
-    .trim()
-    .replace(/\s+/g, '-');         // replace spaces with hyphens
-}
-
 // Initialize default modal on page load
 document.addEventListener('DOMContentLoaded', () => {
   initCommanderModal();
@@ -0,0 +1,64 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import queries
+import schema
+
+GROUP_ID = 1
+
+def make_game(date, seats, winner, turns=8, win_con="Combat"):
+    """A (game, players, winner_name) tuple for record_games; seats are (player, commander, colors)"""
+    game = {"date": date, "num_players": len(seats), "turns": turns, "win_con": win_con}
+    players = [
+        {"player_name": player, "commander_name": commander, "turn_order": turn_order, "color_identity": colors}
+        for turn_order, (player, commander, colors) in enumerate(seats, 1)
+    ]
+    return game, players, winner
+
+@pytest.fixture
+def database(tmp_path):
+    """A migrated database with one empty group, installed as queries.db"""
+    path = str(tmp_path / "mtg.db")
+    schema.upgrade(path)
+    previous = queries.db
+    queries.db = queries.MTGDatabase(path)
+    queries.db.get_connection().execute(
+        "INSERT INTO Groups (id, group_name, passkey) VALUES (?, 'Test Group', 'test-passkey')", (GROUP_ID,)
+    )
+    queries.db.get_connection().commit()
+    queries.query_cache.clear()
+    queries._commander_indexes.clear()
+    try:
+        yield queries.db
+    finally:
+        queries.db.close()
+        queries.db = previous
+        queries.query_cache.clear()
+        queries._commander_indexes.clear()
+
+@pytest.fixture
+def seeded(database):
+    """The database fixture with a few games in the group"""
+    queries.record_games([
+        make_game("2025-01-04", [("Alice", "Atraxa", "WUBG"), ("Bob", "Krenko", "R"), ("Cara", "Edgar Markov", "WBR")], "Alice"),
+        make_game("2025-01-11", [("Alice", "Atraxa", "WUBG"), ("Bob", "Kaalia", "WBR"), ("Dan", "Zur", "WUB")], "Bob", win_con="Combo"),
+        make_game("2025-01-18", [("Alice", "Muldrotha", "UBG"), ("Cara", "Edgar Markov", "WBR"), ("Dan", "Zur", "WUB")], "Alice"),
+        make_game("2025-01-02", [("Bob", "Krenko", "R"), ("Cara", "Yuriko", "UB"), ("Dan", "Zur", "WUB")], "Dan"),
+        make_game("2025-02-01", [("Alice", "Atraxa", "WUBG"), ("Bob", "Krenko", "R"), ("Cara", "Yuriko", "UB"), ("Dan", "Zur", "WUB")], "Cara"),
+    ], GROUP_ID)
+    return database
+
+@pytest.fixture
+def client(seeded, monkeypatch):
+    """A Flask test client logged in to the seeded group"""
+    import app
+
+    monkeypatch.setattr(app, "db", seeded)
+    client = app.app.test_client()
+    with client.session_transaction() as session:
+        session.update(logged_in=True, group_id=GROUP_ID, group_name="Test Group")
+    return client
@@ -0,0 +1,48 @@
+from autocomplete import CommanderIndex
+
+USAGE = [
+    ("Atraxa, Praetors' Voice", 12),
+    ("Kenrith, the Returned King", 3),
+    ("Krenko, Mob Boss", 9),
+    ("Kaalia of the Vast", 5),
+    ("Korvold, Fae-Cursed King", 7),
+    ("Edgar Markov", 4),
+    ("Marath, Will of the Wild", 1),
+]
+
+def test_prefix_then_word_then_substring():
+    index = CommanderIndex(USAGE)
+    # Marath starts with "ma" and Edgar Markov has a word starting with it
+    assert index.suggest("ma") == ["Marath, Will of the Wild", "Edgar Markov"]
+    assert index.suggest("the") == ["Kaalia of the Vast", "Kenrith, the Returned King", "Marath, Will of the Wild"]
+    assert index.suggest("ast") == ["Kaalia of the Vast"]
+
+def test_ties_within_a_tier_rank_by_usage_then_name():
+    index = CommanderIndex(USAGE)
+    assert index.suggest("k") == [
+        "Krenko, Mob Boss", "Korvold, Fae-Cursed King", "Kaalia of the Vast", "Kenrith, the Returned King",
+    ]
+    index.add("Kenrith, the Returned King", 10)
+    assert index.suggest("k")[0] == "Kenrith, the Returned King"
+    # Case and spacing are ignored, and the first spelling is kept
+    index.add("  kenrith,   the returned king ", 1)
+    assert len(index) == len(USAGE)
+    assert index.suggest("KEN") == ["Kenrith, the Returned King"]
+
+def test_limit():
+    index = CommanderIndex(USAGE)
+    assert index.suggest("k", limit=2) == ["Krenko, Mob Boss", "Korvold, Fae-Cursed King"]
+    assert index.suggest("k", limit=0) == []
+    assert index.suggest("", limit=5) == []
+
+def test_typos_match_within_the_edit_limit():
+    index = CommanderIndex(USAGE)
+    # Adjacent letters swapped counts as one edit
+    assert index.suggest("kernko") == ["Krenko, Mob Boss"]
+    assert index.suggest("atrxa") == ["Atraxa, Praetors' Voice"]
+    # Shorter queries allow one edit, seven letters or more allow two
+    assert index.suggest("kernok") == []
+    assert index.suggest("reutrned kng") == ["Kenrith, the Returned King"]
+    # The first letter has to be right, and short queries are never fuzzy
+    assert index.suggest("trxa") == []
+    assert index.suggest("krn") == []
@@ -0,0 +1,48 @@
+import json
+
+import pytest
+
+import catalog
+import queries
+
+from conftest import GROUP_ID, make_game
+
+CARDS = [
+    {"name": "Atraxa, Praetors' Voice", "layout": "normal", "legalities": {"commander": "legal"},
+     "type_line": "Legendary Creature — Phyrexian Angel Horror", "color_identity": ["W", "U", "B", "G"]},
+    {"name": "Yuna's Whistle", "layout": "normal", "legalities": {"commander": "legal"},
+     "type_line": "Legendary Creature — Human", "color_identity": ["W"]},
+]
+
+@pytest.fixture
+def card_catalog(tmp_path, monkeypatch):
+    """A two-card catalog that queries reads in place of the ingested one"""
+    bulk_path = tmp_path / "cards.json"
+    bulk_path.write_text(json.dumps(CARDS), encoding="utf-8")
+    catalog.ingest_bulk_json(str(bulk_path), str(tmp_path / "commanders.catalog"))
+    card_catalog = catalog.CardCatalog(str(tmp_path / "commanders.catalog"))
+    monkeypatch.setattr(queries, "get_card_catalog", lambda: card_catalog)
+    yield card_catalog
+    card_catalog.close()
+
+def test_catalog_reads_escaped_names(card_catalog):
+    assert card_catalog.lookup("Atraxa, Praetors&#x27; Voice") == ("Atraxa, Praetors' Voice", 23)
+    assert card_catalog.search("yuna&#x27;s") == ["Yuna's Whistle"]
+
+def test_escaped_and_plain_spellings_share_one_commander(database, card_catalog):
+    queries.record_games([
+        make_game("2025-03-01", [("Alice", "Atraxa, Praetors&#x27; Voice", ""), ("Bob", "Yuna's Whistle", "")], "Alice"),
+        make_game("2025-03-02", [("Alice", "atraxa praetors voice", ""), ("Bob", "Yuna&#x27;s Whistle", "")], "Bob"),
+    ], GROUP_ID)
+
+    commanders = database.get_connection().execute("SELECT Name FROM Commanders ORDER BY Name").fetchall()
+    assert commanders == [("Atraxa, Praetors&#x27; Voice",), ("Yuna&#x27;s Whistle",)]
+
+def test_suggestions_are_plain_text_without_duplicates(database, card_catalog):
+    queries.record_game(
+        *make_game("2025-03-01", [("Alice", "Atraxa, Praetors&#x27; Voice", ""), ("Bob", "Krenko", "R")], "Alice"),
+        GROUP_ID
+    )
+
+    assert queries.get_commander_suggestions("atr", GROUP_ID) == ["Atraxa, Praetors' Voice"]
+    assert queries.get_commander_suggestions("yuna&#x27;s", GROUP_ID) == ["Yuna's Whistle"]
@@ -0,0 +1,18 @@
+import app
+import images
+
+def test_repeat_visit_gets_not_modified(client):
+    etag = client.get("/").headers["ETag"]
+
+    assert client.get("/", headers={"If-None-Match": etag}).status_code == 304
+
+def test_image_build_changes_the_etag(client, tmp_path, monkeypatch):
+    manifest_path = tmp_path / "manifest.json"
+    monkeypatch.setattr(app, "image_manifest_version", lambda: images.image_manifest_version(str(manifest_path)))
+    etag = client.get("/").headers["ETag"]
+
+    manifest_path.write_text("{}", encoding="utf-8")
+
+    response = client.get("/", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
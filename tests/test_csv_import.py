@@ -0,0 +1,63 @@
+import io
+import sqlite3
+
+import app
+import queries
+
+from conftest import GROUP_ID
+
+HEADER = "Date,NumPlayers,WinnerName,PlayerName,Turns,WinCon,CommanderName,TurnOrder\n"
+
+def games_csv(days, bad_after=None):
+    """Two-seat games on the given days of March, plus one unreadable row after the game on bad_after"""
+    lines = [HEADER]
+    for day in days:
+        lines.append(f"2025-03-{day:02d},2,Alice,Alice,{day},Combat,Atraxa,1\n")
+        lines.append(f"2025-03-{day:02d},2,Alice,Bob,{day},Combat,Krenko,2\n")
+        if day == bad_after:
+            lines.append("03/40/2025,2,Alice,Alice,7,Combat,Atraxa,1\n")
+    return io.StringIO("".join(lines))
+
+def test_multi_batch_import_reports_the_bad_row(database):
+    progress = []
+    result = app.import_csv_stream(games_csv(range(1, 8), bad_after=3), GROUP_ID, batch_size=2,
+                                   progress=lambda r: progress.append(r["games_imported"]))
+
+    assert result == {
+        "rows_read": 15,
+        "games_imported": 7,
+        "batches_committed": 4,
+        "errors": [{"row": 8, "message": "Invalid date: '03/40/2025', expected YYYY-MM-DD"}],
+        "errors_truncated": 0,
+    }
+    assert progress == [2, 4, 6, 7]
+    turns = [row[0] for row in database.execute_query("SELECT Turns FROM Games ORDER BY Date")]
+    assert turns == [1, 2, 3, 4, 5, 6, 7]
+
+def test_failed_batch_reports_its_rows_and_keeps_the_others(database):
+    calls = []
+
+    def write(games):
+        calls.append(len(games))
+        if len(calls) == 2:
+            raise sqlite3.OperationalError("database is locked")
+        queries.record_games(games, GROUP_ID)
+
+    result = app.import_csv_stream(games_csv(range(1, 6)), GROUP_ID, batch_size=2, write=write)
+
+    assert calls == [2, 2, 1]
+    assert (result["games_imported"], result["batches_committed"]) == (3, 2)
+    assert result["errors"] == [
+        {"row": 6, "message": "Game on 2025-03-03: database is locked"},
+        {"row": 8, "message": "Game on 2025-03-04: database is locked"},
+    ]
+    assert [row[0] for row in database.execute_query("SELECT Date FROM Games ORDER BY Date")] == ["2025-03-01", "2025-03-02", "2025-03-05"]
+
+def test_incomplete_games_and_missing_columns(database):
+    partial = io.StringIO(HEADER + "2025-03-01,3,Alice,Alice,5,Combat,Atraxa,1\n2025-03-01,3,Alice,Bob,5,Combat,Krenko,2\n")
+    result = app.import_csv_stream(partial, GROUP_ID)
+    assert result["games_imported"] == 0
+    assert result["errors"] == [{"row": 2, "message": "Game on 2025-03-01: Expected 3 players, found 2"}]
+
+    result = app.import_csv_stream(io.StringIO("Date,PlayerName\n2025-03-01,Alice\n"), GROUP_ID)
+    assert result["errors"] == [{"row": 1, "message": "Missing required columns: NumPlayers, WinnerName"}]
@@ -0,0 +1,33 @@
+import app
+import queries
+
+from conftest import GROUP_ID, make_game
+
+IMPORT_GROUP_ID = 2
+
+def export_csv(group_id):
+    return "".join(app.export_csv_chunks(app.export_rows(group_id)))
+
+def test_export_reimports_to_the_same_export(seeded):
+    conn = seeded.get_connection()
+    queries.record_game(
+        *make_game("2025-02-08", [("O&#x27;Brien", "Yuna&#x27;s Whistle", "W"), ("Tom &amp; Jerry", "Krenko", "R")], "O&#x27;Brien"),
+        GROUP_ID
+    )
+    conn.executemany("UPDATE Games SET WinCon = ? WHERE Date = ?", [("Burn", "2025-01-04"), ("Scoop", "2025-01-11"), (None, "2025-01-18")])
+    conn.execute("INSERT INTO Groups (id, group_name, passkey) VALUES (?, 'Import Group', 'import-passkey')", (IMPORT_GROUP_ID,))
+    conn.commit()
+
+    exported = export_csv(GROUP_ID)
+    assert "Ping/Burn" in exported and "Scoops" in exported and "O'Brien" in exported and "Tom & Jerry" in exported
+
+    imported, errors = app.process_csv_games(exported, IMPORT_GROUP_ID)
+    assert (imported, errors) == (6, [])
+    assert export_csv(IMPORT_GROUP_ID) == exported
+
+def test_canonical_win_con():
+    assert app.canonical_win_con("Burn") == "Ping/Burn"
+    assert app.canonical_win_con(" scoop ") == "Scoops"
+    assert app.canonical_win_con("commander  damage") == "Commander Damage"
+    assert app.canonical_win_con("Alt Win") == "Combat"
+    assert app.canonical_win_con(None) == "Combat"
@@ -0,0 +1,76 @@
+import base64
+import json
+
+import pytest
+
+import queries
+
+from conftest import GROUP_ID, make_game
+
+SEATS = [("Alice", "Atraxa", "WUBG"), ("Bob", "Krenko", "R")]
+
+def cursor_of(value):
+    return base64.urlsafe_b64encode(json.dumps(value).encode("utf-8")).decode("ascii").rstrip("=")
+
+def walk(limit, **filters):
+    """Every page of the game log as lists of GameIDs"""
+    pages, cursor = [], None
+    while True:
+        page = queries.get_games_page(GROUP_ID, cursor=cursor, limit=limit, **filters)
+        pages.append([game["game_id"] for game in page["games"]])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return pages
+
+@pytest.fixture
+def same_day_games(database):
+    """Seven games over three days, five of them on one day and recorded out of order"""
+    dates = ["2025-05-02", "2025-05-02", "2025-05-01", "2025-05-02", "2025-05-03", "2025-05-02", "2025-05-02"]
+    return queries.record_games([make_game(date, SEATS, "Alice") for date in dates], GROUP_ID)
+
+def test_pages_straddling_equal_dates(same_day_games):
+    by_date = dict(zip(same_day_games, ["2025-05-02", "2025-05-02", "2025-05-01", "2025-05-02", "2025-05-03", "2025-05-02", "2025-05-02"]))
+    newest_first = sorted(same_day_games, key=lambda game_id: (by_date[game_id], game_id), reverse=True)
+
+    for limit in (1, 2, 3, 4):
+        pages = walk(limit)
+        assert [game_id for page in pages for game_id in page] == newest_first
+        assert all(len(page) == limit for page in pages[:-1])
+
+    # A cursor in the middle of a day continues with that day's older games
+    assert walk(2, date_from="2025-05-02", date_to="2025-05-02") == [newest_first[1:3], newest_first[3:5], newest_first[5:6]]
+
+def test_games_added_between_pages_do_not_shift_later_pages(same_day_games):
+    first = queries.get_games_page(GROUP_ID, limit=3)
+    queries.record_game(*make_game("2025-05-02", SEATS, "Bob"), GROUP_ID)
+    rest = queries.get_games_page(GROUP_ID, cursor=first["next_cursor"], limit=10)
+
+    seen = [game["game_id"] for game in first["games"] + rest["games"]]
+    assert len(seen) == len(set(seen)) == 7
+
+@pytest.mark.parametrize("cursor", [
+    "!!!",
+    "abc",
+    cursor_of({"date": "2025-05-02"}),
+    cursor_of(["2025-05-02"]),
+    cursor_of(["2025-05-02", 1, 2]),
+    cursor_of([20250502, 1]),
+    cursor_of(["2025-05-02", "1"]),
+    cursor_of(["2025-05-02", 1.5]),
+    cursor_of(["2025-05-02", True]),
+    cursor_of(["2025-05-02", 10 ** 20]),
+    cursor_of(["2025-05-02", -10 ** 20]),
+    base64.urlsafe_b64encode(b"\xff\xfe").decode("ascii"),
+])
+def test_tampered_cursor_is_a_bad_request(client, cursor):
+    response = client.get("/api/games", query_string={"cursor": cursor})
+    assert response.status_code == 400
+    assert response.get_json()["error"].startswith("Invalid cursor")
+
+    assert client.get("/games", query_string={"cursor": cursor}).status_code == 302
+
+def test_next_cursor_round_trips_through_the_api(client):
+    first = client.get("/api/games", query_string={"limit": 2}).get_json()
+    second = client.get("/api/games", query_string={"limit": 2, "cursor": first["next_cursor"]}).get_json()
+    assert len(first["games"]) == len(second["games"]) == 2
+    assert first["games"][-1]["date"] >= second["games"][0]["date"]
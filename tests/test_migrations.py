@@ -0,0 +1,40 @@
+import queries
+import schema
+
+from conftest import GROUP_ID
+
+LEGACY_DATES = {
+    "2025-01-04": "1/4/2025",
+    "2025-01-11": "1/11/2025",
+    "2025-01-18": "2025/01/18",
+    "2025-01-02": "1/2/2025",
+    "2025-02-01": "2025-02-01T19:30",
+}
+
+DERIVED_SQL = {
+    "StreakRuns": "SELECT PlayerProfileID, Length, StartDate, StartGameID, EndDate, EndGameID, Commanders FROM StreakRuns ORDER BY StartDate, StartGameID",
+    "RatingHistory": "SELECT * FROM RatingHistory ORDER BY Date, GameID, PlayerProfileID",
+    "PlayerRatings": "SELECT * FROM PlayerRatings ORDER BY PlayerProfileID",
+}
+
+def derived_tables(conn):
+    return {table: conn.execute(sql).fetchall() for table, sql in DERIVED_SQL.items()}
+
+def test_date_rewrite_replays_streaks_and_ratings(seeded):
+    conn = seeded.get_connection()
+    expected = derived_tables(conn)
+
+    # Put the database back to before 0010, with streaks and ratings replayed in the legacy string order
+    conn.executemany("UPDATE Games SET Date = ? WHERE Date = ?", [(legacy, iso) for iso, legacy in LEGACY_DATES.items()])
+    for table in ("DailyGames", "DailyPlayerStats", "DailyCommanderStats", "DailyColorStats"):
+        conn.execute(f"DROP TABLE {table}")
+    conn.execute("DELETE FROM schema_version WHERE version >= 10")
+    conn.commit()
+    queries.rebuild_streak_runs(GROUP_ID)
+    queries.rebuild_ratings(GROUP_ID)
+    assert derived_tables(conn) != expected
+
+    applied = schema.upgrade(seeded.db_path)
+    assert [migration["version"] for migration in applied] == [10]
+    assert sorted(date for (date,) in conn.execute("SELECT Date FROM Games")) == sorted(LEGACY_DATES)
+    assert derived_tables(conn) == expected
@@ -0,0 +1,22 @@
+import queries
+
+from conftest import GROUP_ID
+
+def test_hot_queries_use_indexes(seeded):
+    plans = queries.explain_query_plans(GROUP_ID, "Alice")
+    assert set(plans) == set(queries.hot_queries(GROUP_ID, "Alice"))
+
+    scans = {
+        name: [line for plan in statement_plans for line in queries.find_full_scans(plan)]
+        for name, statement_plans in plans.items()
+    }
+    assert {name: lines for name, lines in scans.items() if lines} == {}
+
+def test_every_hot_query_issues_a_statement(seeded):
+    plans = queries.explain_query_plans(GROUP_ID, "Alice")
+    assert all(plans.values())
+
+def test_find_full_scans_flags_bare_table_scans():
+    assert queries.find_full_scans(["SCAN Players"]) == ["SCAN Players"]
+    assert queries.find_full_scans(["SEARCH p USING INDEX idx_players_group_profile (group_id=?)"]) == []
+    assert queries.find_full_scans(["MATERIALIZE s", "SCAN s"]) == []
@@ -0,0 +1,34 @@
+import queries
+
+from conftest import GROUP_ID, make_game
+
+SEATS = [("Alice", "Atraxa", "WUBG"), ("Bob", "Krenko", "R"), ("Cara", "Yuriko", "UB"), ("Dan", "Zur", "WUB")]
+
+def rating_tables(conn):
+    return (
+        conn.execute("SELECT * FROM RatingHistory ORDER BY group_id, PlayerProfileID, Date, GameID").fetchall(),
+        conn.execute("SELECT * FROM PlayerRatings ORDER BY group_id, PlayerProfileID").fetchall(),
+    )
+
+def test_incremental_ratings_match_a_rebuild(database):
+    conn = database.get_connection()
+    queries.record_game(*make_game("2025-03-01", SEATS, "Alice"), GROUP_ID)
+    queries.record_game(*make_game("2025-03-08", SEATS[:3], "Bob"), GROUP_ID)
+    queries.record_game(*make_game("2025-03-15", SEATS[1:], "Dan"), GROUP_ID)
+    # Backdated into the middle, on the same day as an existing game, and before everything
+    queries.record_game(*make_game("2025-03-08", SEATS, "Cara"), GROUP_ID)
+    queries.record_game(*make_game("2025-02-20", SEATS[::2], "Cara"), GROUP_ID)
+    # A batch mixing an appended game with a backdated one
+    queries.record_games([
+        make_game("2025-03-20", SEATS, "Alice"),
+        make_game("2025-03-02", [("Eve", "Kaalia", "WBR")] + SEATS[:2], "Eve"),
+    ], GROUP_ID)
+
+    incremental = rating_tables(conn)
+    assert len(incremental[0]) == 23
+    queries.rebuild_ratings(GROUP_ID)
+    assert rating_tables(conn) == incremental
+
+def test_ratings_are_zero_sum(seeded):
+    ratings = [row["rating"] for row in queries.get_player_ratings(GROUP_ID)]
+    assert abs(sum(ratings) - queries.INITIAL_RATING * len(ratings)) < 1e-6
@@ -0,0 +1,30 @@
+import queries
+
+from conftest import GROUP_ID, make_game
+
+def recent(player_name, limit=3):
+    return [commander["name"] for commander in queries.get_recent_commanders(player_name, limit, GROUP_ID)]
+
+def test_repeated_commander_ranks_by_its_latest_game(database):
+    queries.record_games([
+        make_game("2025-03-01", [("Alice", "A", "W"), ("Bob", "X", "U")], "Alice"),
+        make_game("2025-03-02", [("Alice", "B", "U"), ("Bob", "X", "U")], "Bob"),
+        make_game("2025-03-03", [("Alice", "C", "B"), ("Bob", "X", "U")], "Alice"),
+        make_game("2025-03-04", [("Alice", "D", "R"), ("Bob", "X", "U")], "Alice"),
+        make_game("2025-03-05", [("Alice", "A", "W"), ("Bob", "X", "U")], "Bob"),
+    ], GROUP_ID)
+
+    assert recent("Alice") == ["A", "D", "C"]
+    assert recent("Alice", limit=5) == ["A", "D", "C", "B"]
+    assert recent("Bob") == ["X"]
+
+def test_same_day_games_break_ties_by_game_order(database):
+    queries.record_games([
+        make_game("2025-03-01", [("Alice", "A", "W"), ("Bob", "X", "U")], "Alice"),
+        make_game("2025-03-01", [("Alice", "B", "U"), ("Bob", "X", "U")], "Alice"),
+    ], GROUP_ID)
+
+    assert recent("Alice") == ["B", "A"]
+
+def test_unknown_player_has_no_recent_commanders(seeded):
+    assert recent("Nobody") == []
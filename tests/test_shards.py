@@ -0,0 +1,126 @@
+import sqlite3
+import threading
+
+import pytest
+
+import queries
+import shards
+
+from conftest import GROUP_ID, make_game
+
+OTHER_GROUP_ID = 2
+
+# Id columns are compared by what they point at, since merging renumbers them
+PROFILE_COLUMNS = {"PlayerProfileID", "OpponentProfileID"}
+GAME_COLUMNS = {"GameID", "StartGameID", "EndGameID"}
+PLAYER_COLUMNS = {"PlayerID", "WinnerPlayerID"}
+
+def group_snapshot(path, group_id):
+    """Every row of a group, with ids replaced by names or by position in the group's history"""
+    conn = sqlite3.connect(path)
+    try:
+        profiles = dict(conn.execute("SELECT PlayerProfileID, Name FROM PlayerProfiles WHERE group_id = ?", (group_id,)))
+        commanders = dict(conn.execute("SELECT CommanderID, Name FROM Commanders"))
+        games = {game_id: rank for rank, (game_id,) in enumerate(conn.execute("SELECT GameID FROM Games WHERE group_id = ? ORDER BY GameID", (group_id,)))}
+        players = {player_id: rank for rank, (player_id,) in enumerate(conn.execute("SELECT PlayerID FROM Players WHERE group_id = ? ORDER BY PlayerID", (group_id,)))}
+
+        def value(column, v):
+            if column in PROFILE_COLUMNS:
+                return profiles[v]
+            if column == "CommanderID":
+                return commanders[v]
+            if column in GAME_COLUMNS:
+                return games[v]
+            if column in PLAYER_COLUMNS:
+                return players.get(v)
+            return v
+
+        snapshot = {"Groups": conn.execute("SELECT * FROM Groups WHERE id = ?", (group_id,)).fetchall()}
+        tables = [row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table' ORDER BY name")]
+        for table in tables:
+            columns = [row[1] for row in conn.execute(f"PRAGMA table_info({table})") if row[1] != "RunID"]
+            if "group_id" not in columns:
+                continue
+            rows = conn.execute(f"SELECT {', '.join(columns)} FROM {table} WHERE group_id = ?", (group_id,))
+            snapshot[table] = sorted(
+                (tuple(value(column, v) for column, v in zip(columns, row)) for row in rows),
+                key=repr
+            )
+        return snapshot
+    finally:
+        conn.close()
+
+@pytest.fixture
+def two_groups(seeded):
+    """The seeded database with a second group sharing some player and commander names"""
+    seeded.get_connection().execute(
+        "INSERT INTO Groups (id, group_name, passkey) VALUES (?, 'Other Group', 'other-passkey')", (OTHER_GROUP_ID,)
+    )
+    seeded.get_connection().commit()
+    queries.record_games([
+        make_game("2025-01-05", [("Alice", "Krenko", "R"), ("Erin", "Atraxa", "WUBG")], "Erin"),
+        make_game("2025-01-06", [("Alice", "Krenko", "R"), ("Erin", "Sisay", "W"), ("Finn", "Zur", "WUB")], "Erin"),
+        make_game("2025-01-03", [("Erin", "Sisay", "W"), ("Finn", "Zur", "WUB")], "Finn"),
+    ], OTHER_GROUP_ID)
+    return seeded
+
+def test_split_and_merge_round_trip(two_groups, tmp_path):
+    source = two_groups.db_path
+    shard_dir = str(tmp_path / "shards")
+    assert shards.split_database(source, shard_dir) == [GROUP_ID, OTHER_GROUP_ID]
+
+    directory = sqlite3.connect(str(tmp_path / "shards" / "directory.db"))
+    assert [row[0] for row in directory.execute("SELECT id FROM Groups ORDER BY id")] == [GROUP_ID, OTHER_GROUP_ID]
+    assert directory.execute("SELECT COUNT(*) FROM Games").fetchone()[0] == 0
+    directory.close()
+
+    for group_id, games in ((GROUP_ID, 5), (OTHER_GROUP_ID, 3)):
+        shard_path = str(tmp_path / "shards" / f"group-{group_id}.db")
+        snapshot = group_snapshot(shard_path, group_id)
+        assert len(snapshot["Games"]) == games
+        assert snapshot == group_snapshot(source, group_id)
+        # The shard holds nothing of the other group
+        conn = sqlite3.connect(shard_path)
+        assert [row[0] for row in conn.execute("SELECT id FROM Groups")] == [group_id]
+        assert conn.execute("SELECT COUNT(*) FROM Players WHERE group_id != ?", (group_id,)).fetchone()[0] == 0
+        conn.close()
+
+    merged = str(tmp_path / "merged.db")
+    assert shards.merge_shards(shard_dir, merged) == 8
+    for group_id in (GROUP_ID, OTHER_GROUP_ID):
+        assert group_snapshot(merged, group_id) == group_snapshot(source, group_id)
+
+def test_split_refuses_existing_shards(two_groups, tmp_path):
+    shards.split_database(two_groups.db_path, str(tmp_path))
+    with pytest.raises(ValueError, match="already exists"):
+        shards.split_database(two_groups.db_path, str(tmp_path))
+
+def test_sharded_database_routes_by_thread(two_groups, tmp_path):
+    shards.split_database(two_groups.db_path, str(tmp_path))
+    sharded = queries.ShardedDatabase(str(tmp_path))
+    count_sql = "SELECT COUNT(*) FROM Games"
+    try:
+        assert sharded.execute_single(count_sql)[0] == 0
+        counts = {}
+        ready = threading.Barrier(2)
+
+        def count_games(group_id):
+            sharded.route(group_id)
+            ready.wait(5)
+            counts[group_id] = sharded.execute_single(count_sql)[0]
+
+        threads = [threading.Thread(target=count_games, args=(group_id,)) for group_id in (GROUP_ID, OTHER_GROUP_ID)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+        assert counts == {GROUP_ID: 5, OTHER_GROUP_ID: 3}
+
+        with sharded.routed(OTHER_GROUP_ID):
+            assert sharded.execute_single(count_sql)[0] == 3
+            # Passkey logins are answered by the directory whichever group is routed
+            assert sharded.query_single("group_by_passkey", ("test-passkey",))[0] == GROUP_ID
+        # This thread was never routed, so it is back on the directory
+        assert sharded.execute_single(count_sql)[0] == 0
+    finally:
+        sharded.close()
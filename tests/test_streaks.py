@@ -0,0 +1,74 @@
+import queries
+
+from conftest import GROUP_ID, make_game
+
+PODS = {
+    "Alice": ("Alice", "Atraxa", "WUBG"),
+    "Bob": ("Bob", "Krenko", "R"),
+    "Cara": ("Cara", "Yuriko", "UB"),
+}
+
+def game(date, winner, commander=None):
+    seats = [PODS[name] if name != winner or commander is None else (name, commander, "") for name in PODS]
+    return make_game(date, seats, winner)
+
+def streak_runs(conn):
+    return conn.execute(
+        """
+        SELECT pp.Name, s.Length, s.StartDate, s.StartGameID, s.EndDate, s.EndGameID, s.Commanders
+        FROM StreakRuns s JOIN PlayerProfiles pp ON pp.PlayerProfileID = s.PlayerProfileID
+        WHERE s.group_id = ?
+        ORDER BY s.StartDate, s.StartGameID
+        """,
+        (GROUP_ID,)
+    ).fetchall()
+
+def assert_matches_rebuild(conn):
+    incremental = streak_runs(conn)
+    queries.rebuild_streak_runs(GROUP_ID)
+    assert streak_runs(conn) == incremental
+    return incremental
+
+def test_backdated_game_splits_a_streak(database):
+    conn = database.get_connection()
+    for date in ("2025-04-01", "2025-04-02", "2025-04-03", "2025-04-04"):
+        queries.record_game(*game(date, "Alice"), GROUP_ID)
+    assert [run[:2] for run in streak_runs(conn)] == [("Alice", 4)]
+
+    # Bob's game lands between Alice's second and third wins
+    queries.record_game(*game("2025-04-02", "Bob"), GROUP_ID)
+    runs = assert_matches_rebuild(conn)
+    assert [run[:2] for run in runs] == [("Alice", 2), ("Bob", 1), ("Alice", 2)]
+    assert [streak["player_name"] for streak in queries.get_longest_win_streak(group_id=GROUP_ID)] == ["Alice"]
+
+def test_backdated_games_extend_and_join_streaks(database):
+    conn = database.get_connection()
+    queries.record_games([game("2025-04-01", "Alice"), game("2025-04-03", "Bob"), game("2025-04-05", "Alice")], GROUP_ID)
+    # Same day as an existing game, before everything, and a batch of both
+    queries.record_game(*game("2025-04-03", "Bob", commander="Kaalia"), GROUP_ID)
+    queries.record_game(*game("2025-03-30", "Alice"), GROUP_ID)
+    queries.record_games([game("2025-04-04", "Alice"), game("2025-03-31", "Cara")], GROUP_ID)
+
+    runs = assert_matches_rebuild(conn)
+    assert [run[:2] for run in runs] == [("Alice", 1), ("Cara", 1), ("Alice", 1), ("Bob", 2), ("Alice", 2)]
+    assert runs[3][6] == '["Krenko", "Kaalia"]'
+
+def test_winner_change_repairs_neighbouring_runs(database):
+    conn = database.get_connection()
+    game_ids = queries.record_games([game(f"2025-04-0{day}", winner) for day, winner in
+                                     ((1, "Alice"), (2, "Alice"), (3, "Bob"), (4, "Alice"), (5, "Alice"))], GROUP_ID)
+
+    def seat(game_id, name):
+        return conn.execute(
+            "SELECT p.PlayerID FROM Players p JOIN PlayerProfiles pp ON pp.PlayerProfileID = p.PlayerProfileID WHERE p.GameID = ? AND pp.Name = ?",
+            (game_id, name)
+        ).fetchone()[0]
+
+    # Bob's win in the middle becomes Alice's: the two streaks join into one
+    queries.update_game_winner(game_ids[2], seat(game_ids[2], "Alice"))
+    assert [run[:2] for run in assert_matches_rebuild(conn)] == [("Alice", 5)]
+
+    # And the last game goes to Cara
+    queries.update_game_winner(game_ids[4], seat(game_ids[4], "Cara"))
+    assert [run[:2] for run in assert_matches_rebuild(conn)] == [("Alice", 4), ("Cara", 1)]
+    assert queries.get_current_win_streak(GROUP_ID)["player_name"] == "Cara"
@@ -0,0 +1,49 @@
+import queries
+
+from conftest import GROUP_ID, make_game
+
+SUMMARY_TABLES = ("PlayerStats", "CommanderStats", "ColorStats", "HeadToHeadStats",
+                  "DailyGames", "DailyPlayerStats", "DailyCommanderStats", "DailyColorStats")
+
+def summaries(conn):
+    return {
+        table: sorted(conn.execute(f"SELECT * FROM {table} WHERE group_id = ?", (GROUP_ID,)).fetchall())
+        for table in SUMMARY_TABLES
+    }
+
+def assert_matches_rebuild(conn):
+    incremental = summaries(conn)
+    matrix = queries.get_head_to_head_matrix(GROUP_ID)
+    queries.rebuild_summary_tables(GROUP_ID)
+    assert summaries(conn) == incremental
+    assert queries.get_head_to_head_matrix(GROUP_ID) == matrix
+    return matrix
+
+def seat(conn, game_id, name):
+    return conn.execute(
+        "SELECT p.PlayerID FROM Players p JOIN PlayerProfiles pp ON pp.PlayerProfileID = p.PlayerProfileID WHERE p.GameID = ? AND pp.Name = ?",
+        (game_id, name)
+    ).fetchone()[0]
+
+def test_backdated_games_match_rebuild(seeded):
+    conn = seeded.get_connection()
+    queries.record_game(*make_game("2025-01-11", [("Bob", "Krenko", "R"), ("Eve", "Zur", "WUB")], "Eve"), GROUP_ID)
+    queries.record_game(*make_game("2024-12-28", [("Alice", "Atraxa", "WUBG"), ("Cara", "Yuriko", "UB")], "Cara"), GROUP_ID)
+    assert_matches_rebuild(conn)
+
+def test_head_to_head_follows_winner_changes(seeded):
+    conn = seeded.get_connection()
+    matrix = assert_matches_rebuild(conn)
+    alice, dan = matrix["players"].index("Alice"), matrix["players"].index("Dan")
+    assert (matrix["games"][alice][dan], matrix["wins"][alice][dan], matrix["wins"][dan][alice]) == (3, 1, 0)
+
+    # Dan takes the 2025-01-18 game from Alice
+    game_id = conn.execute("SELECT GameID FROM Games WHERE group_id = ? AND Date = '2025-01-18'", (GROUP_ID,)).fetchone()[0]
+    queries.update_game_winner(game_id, seat(conn, game_id, "Dan"))
+    matrix = assert_matches_rebuild(conn)
+    assert (matrix["games"][alice][dan], matrix["wins"][alice][dan], matrix["wins"][dan][alice]) == (3, 0, 1)
+
+    # And back again, so the pair's record returns to where it started
+    queries.update_game_winner(game_id, seat(conn, game_id, "Alice"))
+    matrix = assert_matches_rebuild(conn)
+    assert (matrix["games"][alice][dan], matrix["wins"][alice][dan], matrix["wins"][dan][alice]) == (3, 1, 0)
@@ -0,0 +1,22 @@
+import queries
+
+from conftest import GROUP_ID, make_game
+
+OTHER_GROUP_ID = 2
+
+def test_ungrouped_player_rows_fold_groups(seeded):
+    conn = seeded.get_connection()
+    conn.execute("INSERT INTO Groups (id, group_name, passkey) VALUES (?, 'Other Group', 'other-passkey')", (OTHER_GROUP_ID,))
+    conn.commit()
+    # Alice has her own profile in the second group, spelled differently
+    queries.record_games([
+        make_game("2025-03-01", [("alice ", "Atraxa", "WUBG"), ("Eve", "Zur", "WUB")], "alice "),
+        make_game("2025-03-08", [("alice ", "Atraxa", "WUBG"), ("Eve", "Zur", "WUB")], "Eve"),
+    ], OTHER_GROUP_ID)
+
+    rows = {r["name"]: r for r in queries.get_win_rate_stats("player")}
+    assert sorted(rows) == ["Alice", "Bob", "Cara", "Dan", "Eve"]
+    assert (rows["Alice"]["games_played"], rows["Alice"]["wins"], rows["Alice"]["win_rate"]) == (6, 3, 50.0)
+    assert queries.get_player_detail_stats("ALICE")["games_played"] == 6
+    assert queries.get_player_detail_stats("Alice", group_id=GROUP_ID)["games_played"] == 4
+    assert [r["name"] for r in queries.get_win_rate_stats("player", group_id=OTHER_GROUP_ID)] == ["alice", "Eve"]
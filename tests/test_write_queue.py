@@ -0,0 +1,135 @@
+import io
+import threading
+
+import pytest
+
+import app
+import queries
+from write_queue import WriteQueue
+
+from conftest import GROUP_ID
+
+class RecordingWriter:
+    """A write callable that records its calls, can be held on its first call and fails games named 'bad'"""
+
+    def __init__(self, hold=False):
+        self.calls = []
+        self.next_id = 1
+        self.entered = threading.Event()
+        self.release = threading.Event()
+        if not hold:
+            self.release.set()
+
+    def __call__(self, group_id, games):
+        self.entered.set()
+        self.release.wait(5)
+        if "bad" in games:
+            raise ValueError("bad game")
+        self.calls.append((group_id, list(games)))
+        game_ids = list(range(self.next_id, self.next_id + len(games)))
+        self.next_id += len(games)
+        return game_ids
+
+@pytest.fixture
+def held_queue():
+    """A queue whose writer is held inside its first write until writer.release is set"""
+    writer = RecordingWriter(hold=True)
+    write_queue = WriteQueue(writer)
+    yield write_queue, writer
+    writer.release.set()
+    write_queue.close()
+
+def test_queued_submissions_batch_per_group_in_order(held_queue):
+    write_queue, writer = held_queue
+    first = write_queue.submit(1, ["a1"])
+    assert writer.entered.wait(5)
+    # Everything submitted while the writer is busy goes into its next pass
+    second = write_queue.submit(1, ["b1", "b2"])
+    other_group = write_queue.submit(2, ["c1"])
+    third = write_queue.submit(1, ["d1"])
+    assert write_queue.status(second)["status"] == "queued"
+
+    writer.release.set()
+    write_queue.flush()
+
+    assert writer.calls == [(1, ["a1"]), (1, ["b1", "b2", "d1"]), (2, ["c1"])]
+    assert [write_queue.status(t)["game_ids"] for t in (first, second, third, other_group)] == [[1], [2, 3], [4], [5]]
+    assert {write_queue.status(t)["status"] for t in (first, second, third, other_group)} == {"committed"}
+    assert write_queue.stats() == {"pending": 0, "batches": 3, "games_committed": 5, "failures": 0}
+
+def test_failed_submission_fails_only_its_ticket(held_queue):
+    write_queue, writer = held_queue
+    write_queue.submit(1, ["first"])
+    assert writer.entered.wait(5)
+    good = write_queue.submit(1, ["good"])
+    bad = write_queue.submit(1, ["bad"])
+    later = write_queue.submit(1, ["later"])
+
+    writer.release.set()
+    write_queue.flush()
+
+    assert write_queue.status(bad)["status"] == "failed"
+    assert write_queue.status(bad)["error"] == "bad game"
+    assert write_queue.status(good)["status"] == write_queue.status(later)["status"] == "committed"
+    assert write_queue.stats()["failures"] == 1
+    assert write_queue.status("unknown") is None
+
+def test_full_queue_refuses_submissions():
+    writer = RecordingWriter(hold=True)
+    write_queue = WriteQueue(writer, max_pending=1)
+    try:
+        write_queue.submit(1, ["a"])
+        assert writer.entered.wait(5)
+        write_queue.submit(1, ["b"])
+        with pytest.raises(RuntimeError, match="full"):
+            write_queue.submit(1, ["c"])
+    finally:
+        writer.release.set()
+        write_queue.close()
+
+def test_close_writes_everything_queued():
+    writer = RecordingWriter(hold=True)
+    write_queue = WriteQueue(writer, max_batch_games=2)
+    tickets = [write_queue.submit(1, [f"g{i}"]) for i in range(5)]
+    assert writer.entered.wait(5)
+
+    closer = threading.Thread(target=write_queue.close)
+    closer.start()
+    writer.release.set()
+    closer.join(5)
+
+    assert not closer.is_alive()
+    assert [game for _, games in writer.calls for game in games] == [f"g{i}" for i in range(5)]
+    assert all(write_queue.status(t)["status"] == "committed" for t in tickets)
+    with pytest.raises(RuntimeError, match="closed"):
+        write_queue.submit(1, ["late"])
+
+def test_queued_csv_upload_is_accepted_not_imported(client, monkeypatch):
+    write_queue = WriteQueue(app.write_queued_games)
+    monkeypatch.setattr(app, "write_queue", write_queue)
+    csv_text = (
+        "Date,NumPlayers,WinnerName,PlayerName,CommanderName\n"
+        "2025-03-01,2,Alice,Alice,Atraxa\n"
+        "2025-03-01,2,Alice,Bob,Krenko\n"
+        "2025-03-02,2,Bob,Bob,Krenko\n"
+        "2025-03-02,2,Bob,bob,Kaalia\n"
+    )
+    try:
+        response = client.post(
+            "/upload-csv",
+            data={"csvFile": (io.BytesIO(csv_text.encode()), "games.csv")},
+            content_type="multipart/form-data",
+            headers={"Accept": "application/json"},
+        )
+        result = response.get_json()
+        assert response.status_code == 202
+        assert (result["games_queued"], result["batches_queued"], len(result["tickets"])) == (1, 1, 1)
+        assert "games_imported" not in result
+        assert result["errors"] == [{"row": 4, "message": "Game on 2025-03-02: Player 'bob' is listed twice"}]
+
+        write_queue.flush()
+        status = client.get(f"/api/submissions/{result['tickets'][0]}").get_json()
+        assert status["status"] == "committed"
+        assert queries.db.execute_single("SELECT COUNT(*) FROM Games WHERE group_id = ?", (GROUP_ID,))[0] == 6
+    finally:
+        write_queue.close()
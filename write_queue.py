@@ -0,0 +1,194 @@
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# (game, players, winner_name) tuples, as accepted by queries.record_games
+Games = List[Tuple[Dict[str, Any], List[Dict[str, Any]], str]]
+
+class WriteQueue:
+    """
+    Write-behind queue for game submissions with a single writer thread.
+
+    Requests validate their games and submit() them, getting a ticket id back
+    at once. The writer thread drains whatever has been submitted, up to
+    max_batch_games, and writes each group's share in one transaction, so a
+    burst of submissions becomes a few commits by one writer instead of many
+    requests contending for the SQLite write lock. When a combined batch
+    fails, its submissions are retried one by one so a bad submission only
+    fails its own ticket.
+    """
+
+    def __init__(self, write: Callable[[int, Games], List[int]], max_batch_games: int = 500,
+                 max_pending: int = 10000, max_tickets: int = 10000):
+        """
+        Args:
+            write: Callable(group_id, games) writing games in one transaction
+                   and returning their GameIDs in order
+            max_batch_games: Most games combined into one writer pass
+            max_pending: Most submissions waiting at once; submit() refuses more
+            max_tickets: Finished tickets kept for polling, oldest dropped first
+        """
+        self.write = write
+        self.max_batch_games = max_batch_games
+        self.max_tickets = max_tickets
+        self._queue: "queue.Queue[Optional[str]]" = queue.Queue(max_pending)
+        self._tickets: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._submissions: Dict[str, Tuple[int, Games]] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self.batches = 0
+        self.games_committed = 0
+        self.failures = 0
+
+    def submit(self, group_id: int, games: Games) -> str:
+        """
+        Queue already validated games for writing.
+
+        Args:
+            group_id: ID of the group the games belong to
+            games: List of (game, players, winner_name) tuples
+
+        Returns:
+            str: Ticket id to poll with status()
+
+        Raises:
+            RuntimeError: If the queue is full or closed
+        """
+        ticket = uuid.uuid4().hex
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="write-queue", daemon=True)
+                self._thread.start()
+            elif not self._thread.is_alive():
+                raise RuntimeError("Write queue is closed")
+            self._tickets[ticket] = {
+                "ticket": ticket,
+                "group_id": group_id,
+                "status": "queued",
+                "games": len(games),
+                "game_ids": [],
+                "error": None,
+                "queued_at": time.time(),
+                "committed_at": None,
+            }
+            self._submissions[ticket] = (group_id, games)
+            self._prune_tickets()
+        try:
+            self._queue.put_nowait(ticket)
+        except queue.Full:
+            with self._lock:
+                del self._tickets[ticket]
+                del self._submissions[ticket]
+            raise RuntimeError("Write queue is full, try again shortly")
+        return ticket
+
+    def status(self, ticket: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a submission's state: queued, committed (with its GameIDs) or failed
+        (with the error). None for an unknown or expired ticket.
+        """
+        with self._lock:
+            entry = self._tickets.get(ticket)
+            return dict(entry, game_ids=list(entry["game_ids"])) if entry else None
+
+    def flush(self):
+        """Block until every submission made so far has been written"""
+        if self._thread is not None:
+            self._queue.join()
+
+    def close(self):
+        """Write what is queued, then stop the writer thread"""
+        with self._lock:
+            thread = self._thread
+        if thread is not None and thread.is_alive():
+            self._queue.put(None)
+            thread.join()
+
+    def stats(self) -> Dict[str, int]:
+        """Get queue depth and writer counters"""
+        return {
+            "pending": self._queue.qsize(),
+            "batches": self.batches,
+            "games_committed": self.games_committed,
+            "failures": self.failures,
+        }
+
+    def _prune_tickets(self):
+        while len(self._tickets) > self.max_tickets:
+            oldest = next(iter(self._tickets.values()))
+            if oldest["status"] == "queued":
+                break
+            self._tickets.popitem(last=False)
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            ticket = self._queue.get()
+            if ticket is None:
+                self._queue.task_done()
+                break
+            batch = [ticket]
+            games = len(self._submissions[ticket][1])
+            # Take whatever else is already waiting, up to the batch size
+            while games < self.max_batch_games:
+                try:
+                    ticket = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if ticket is None:
+                    self._queue.task_done()
+                    stopping = True
+                    break
+                batch.append(ticket)
+                games += len(self._submissions[ticket][1])
+            self._write_batch(batch)
+            for _ in batch:
+                self._queue.task_done()
+
+    def _write_batch(self, batch: List[str]):
+        """Write a batch's submissions, one transaction per group"""
+        by_group: "OrderedDict[int, List[str]]" = OrderedDict()
+        for ticket in batch:
+            by_group.setdefault(self._submissions[ticket][0], []).append(ticket)
+
+        for group_id, tickets in by_group.items():
+            try:
+                self._write_tickets(group_id, tickets)
+            except Exception as e:
+                if len(tickets) == 1:
+                    self._fail(tickets[0], e)
+                    continue
+                for ticket in tickets:
+                    try:
+                        self._write_tickets(group_id, [ticket])
+                    except Exception as e:
+                        self._fail(ticket, e)
+
+    def _write_tickets(self, group_id: int, tickets: List[str]):
+        games = [game for ticket in tickets for game in self._submissions[ticket][1]]
+        game_ids = self.write(group_id, games)
+        committed_at = time.time()
+        with self._lock:
+            self.batches += 1
+            self.games_committed += len(game_ids)
+            start = 0
+            for ticket in tickets:
+                count = len(self._submissions.pop(ticket)[1])
+                entry = self._tickets.get(ticket)
+                if entry is not None:
+                    entry["status"] = "committed"
+                    entry["game_ids"] = game_ids[start:start + count]
+                    entry["committed_at"] = committed_at
+                start += count
+
+    def _fail(self, ticket: str, error: Exception):
+        with self._lock:
+            self.failures += 1
+            self._submissions.pop(ticket, None)
+            entry = self._tickets.get(ticket)
+            if entry is not None:
+                entry["status"] = "failed"
+                entry["error"] = str(error)